@@ -1,5 +1,10 @@
-"""Entry point for python -m personalparakeet."""
+"""Entry point for python -m personalparakeet.
+
+    python -m personalparakeet                      # live dictation UI
+    python -m personalparakeet transcribe FILES...  # offline file transcription
+"""
 import os
+import sys
 import json
 from pathlib import Path
 
@@ -24,7 +29,10 @@ def setup_cache_directories():
 
 setup_cache_directories()
 
-from personalparakeet.main import main
-
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "transcribe":
+        from personalparakeet.offline_transcribe import main as transcribe_main
+        sys.exit(transcribe_main(sys.argv[2:]))
+
+    from personalparakeet.main import main
     main()
@@ -6,34 +6,26 @@ Replaces WebSocket architecture with direct function calls
 
 import asyncio
 import logging
-import queue
-import sys
 import threading
 import time
-from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional
 
 import numpy as np
 
-# Import dependency validation
-sys.path.append(str(Path(__file__).parent.parent / "src"))
-from personalparakeet.utils.dependency_validation import get_validator
-
-# Check dependencies on initialization
-_validator = get_validator()
-AUDIO_DEPS_AVAILABLE = _validator.check_audio_dependencies()
-SOUNDDDEVICE_AVAILABLE = AUDIO_DEPS_AVAILABLE.get("sounddevice", False)
-
-# Optional imports for hardware dependencies
-if SOUNDDDEVICE_AVAILABLE:
-    import sounddevice as sd
-else:
-    sd = None
-
 from personalparakeet.core.stt_factory import STTFactory
 from personalparakeet.core.clarity_engine import ClarityEngine
-from personalparakeet.core.vad_engine import VoiceActivityDetector
+from personalparakeet.core.vad_engine import create_vad
 from personalparakeet.core.audio_resampler import AudioResampler, ResamplerConfig
+from personalparakeet.core.audio_block_pool import AudioBlockPool
+from personalparakeet.core.audio_sources import AudioSource, create_audio_source
+from personalparakeet.core.backpressure import BackpressureController, BackpressureLevel
+from personalparakeet.core.audio_conditioner import create_conditioner
+from personalparakeet.core.audio_features import AudioFeatures, FrameHistory
+from personalparakeet.core.noise_suppressor import SpectralNoiseSuppressor
+from personalparakeet.core.segment_backlog import SegmentBacklog
+from personalparakeet.core.speech_gate import SpeechGate
+from personalparakeet.core.stt_segmentation import AudioSegment, PartialTranscription, create_segmenter, merge_segments
+from personalparakeet.core.stt_worker import STTWorker
 from personalparakeet.config import V3Config
 
 logger = logging.getLogger(__name__)
@@ -45,124 +37,275 @@ class AudioEngine:
     Manages audio capture, STT processing, and text corrections
     """
     
-    def __init__(self, config: V3Config, event_loop=None):
+    def __init__(self, config: V3Config, event_loop=None, audio_source: Optional[AudioSource] = None):
         self.config = config
         self.event_loop = event_loop
+        self.audio_source = audio_source  # None: built from config.audio.audio_source on start()
         self.is_running = False
         self.is_listening = False
         
         # Audio processing - small chunks for smooth capture
-        self.audio_queue = queue.Queue(maxsize=50)
-        self.audio_stream = None
+        # Recycled SPSC block pool: the realtime callback never allocates or locks
+        self.capture_blocksize = int(
+            config.audio.chunk_size * config.audio.capture_sample_rate / config.audio.model_sample_rate
+        )
+        self.block_pool = AudioBlockPool(num_blocks=50, block_size=self.capture_blocksize)
         self.audio_thread = None
         
-        # STT processing buffer - accumulate 4-second chunks for efficient processing
+        # STT segmentation - fixed mode accumulates 4-second chunks for efficient processing
         # Modern STT works best on multi-second segments, not micro-chunks
-        self.stt_buffer = []
         self.stt_buffer_duration = 4.0  # seconds - good balance of latency vs efficiency
-        self.stt_buffer_max_samples = int(self.stt_buffer_duration * 16000)  # Will be updated after config load
+        self.segmenter = create_segmenter(config.audio, 16000, self.stt_buffer_duration)  # Rebuilt after config load
+        # Trims VAD non-speech off segments and skips mostly-silent ones before STT
+        # Per-frame VAD flags and levels, looked up by segments instead of re-measuring audio
+        self.frame_history = FrameHistory(16000, int(16000 * config.vad.frame_duration))  # Rebuilt with the VAD
+        self.speech_gate = SpeechGate(self.frame_history)
+        
+        # Load shedding when STT can't keep up with realtime
+        self.backpressure = BackpressureController()
+        self._merge_pending: List[AudioSegment] = []  # Segments batched under backpressure
+        self._stt_profile = "accurate"  # Requested by backpressure, applied on the STT thread
         
-        # Performance monitoring
-        self.queue_overflow_count = 0
-        self.total_chunks_received = 0
+        # STT runs on its own thread while listening so VAD keeps chunk cadence;
+        # the segmenter is shared with it (push on the consumer, merge on the worker).
+        # Segments that back up in its queue are decoded together in one model call
+        self.stt_worker = STTWorker(self._transcribe_segment, self._finish_segment,
+                                    max_pending=config.audio.stt_queue_size,
+                                    transcribe_batch=self._transcribe_segments,
+                                    max_batch_size=config.audio.stt_max_batch_size,
+                                    max_batch_wait=config.audio.stt_max_batch_wait)
+        self._segmenter_lock = threading.RLock()
+        
+        # Streaming mode on cache-aware models: one encoder stream per open utterance,
+        # fed only the audio its earlier partials haven't covered (STT worker thread only)
+        self._stt_streams: Dict[int, tuple] = {}  # utterance_id -> (stream, samples consumed up to)
+        self.streams_opened = 0
+        self.stream_samples_encoded = 0   # Audio fed to streams
+        self.stream_samples_submitted = 0  # Audio in the segments they replaced (re-decoded otherwise)
+        
+        # Staged startup: capture and VAD run while the model loads on its own thread;
+        # segments finished before it is ready wait in a bounded backlog
+        self.stt_ready = threading.Event()
+        self.stt_load_error: Optional[Exception] = None
+        self._stt_loader = None
+        self.startup_backlog = SegmentBacklog(config.audio.stt_startup_buffer_duration)
+        self.startup_timings: Dict[str, float] = {}  # Phase name -> seconds
+        self._startup_time = None
+        
+        # Performance monitoring (capture counters live on the block pool)
         self.total_chunks_processed = 0
         self.total_stt_calls = 0  # Track actual STT processing calls
         self.last_chunk_time = time.time()
         self.processing_times = []
+        self.callback_status_count = 0
+        self.last_callback_status = None
+        self.capture_metrics_interval = 5.0  # seconds between capture warnings
+        self._last_capture_report_time = 0.0
+        self._reported_overflow_count = 0
+        self._reported_status_count = 0
         
         # Core components
         self.stt_processor = None
         self.clarity_engine = None
         self.vad_engine = None
         self.resampler = None
+        self.conditioner = None
+        self.noise_suppressor = None
         
         # Callbacks for UI updates (set by DictationView)
         self.on_raw_transcription = None
+        self.on_partial_transcription = None  # Streaming mode interim hypotheses
+        self.on_segment_transcribed = None  # (segment, committed text) with stream timestamps
         self.on_corrected_transcription = None
         self.on_pause_detected = None
         self.on_vad_status = None
         self.on_error = None
+        self.on_stt_ready = None  # Called (from the loader thread) once the model can transcribe
         
         # State tracking
         self.current_text = ""
         self.clarity_enabled = True
         
-    async def initialize(self):
-        """Initialize all audio processing components"""
+    async def initialize(self, background_stt: bool = False):
+        """Initialize all audio processing components
+        
+        Args:
+            background_stt: Load the STT model on a background thread and return as soon
+                as capture can start; segments wait in the startup backlog until it's ready
+        """
         try:
             logger.info("Initializing AudioEngine...")
+            self._startup_time = time.time()
             
-            # Initialize STT processor using factory
-            self.stt_processor = STTFactory.create_stt_processor(self.config)
-            await self.stt_processor.initialize()
+            # Initialize STT processor using factory (loads and warms up the model)
+            if background_stt:
+                self._stt_loader = threading.Thread(target=self._load_stt_in_background,
+                                                    name="STTLoader", daemon=True)
+                self._stt_loader.start()
+            else:
+                await self._initialize_stt()
             
             # Initialize Clarity Engine
+            phase_start = time.time()
             self.clarity_engine = ClarityEngine(enable_rule_based=True)
             await self.clarity_engine.initialize()
             self.clarity_engine.start_worker()
+            self.startup_timings['clarity'] = time.time() - phase_start
             
             # Initialize VAD Engine (using model sample rate)
-            self.vad_engine = VoiceActivityDetector(
-                sample_rate=self.config.audio.model_sample_rate,
-                silence_threshold=self.config.vad.silence_threshold,
-                pause_threshold=self.config.vad.pause_threshold
-            )
+            phase_start = time.time()
+            self.vad_engine = create_vad(self.config.vad, self.config.audio.model_sample_rate)
             self.vad_engine.on_pause_detected = self._handle_pause_detected
             
-            # Initialize resampler if needed
-            if self.config.audio.enable_resampling and \
-               self.config.audio.capture_sample_rate != self.config.audio.model_sample_rate:
-                self.resampler = AudioResampler(
-                    ResamplerConfig(
-                        input_rate=self.config.audio.capture_sample_rate,
-                        output_rate=self.config.audio.model_sample_rate,
-                        quality=self.config.audio.resample_quality
-                    )
-                )
-                logger.info(f"Resampler initialized: {self.config.audio.capture_sample_rate}Hz -> {self.config.audio.model_sample_rate}Hz")
-            
-            # Update STT buffer size based on actual model sample rate
-            self.stt_buffer_max_samples = int(self.stt_buffer_duration * self.config.audio.model_sample_rate)
-            logger.info(f"STT buffer configured: {self.stt_buffer_duration}s = {self.stt_buffer_max_samples} samples at {self.config.audio.model_sample_rate}Hz")
+            # Initialize resampler if needed and the STT segmenter at the model sample rate
+            self.reset_stream()
+            self.startup_timings['vad_pipeline'] = time.time() - phase_start
+            logger.info(f"STT segmentation configured: {self.config.audio.stt_segmentation_mode} "
+                        f"at {self.config.audio.model_sample_rate}Hz")
             
             self.is_running = True
-            logger.info("AudioEngine initialized successfully")
+            logger.info("AudioEngine initialized successfully"
+                        + (" (STT model still loading)" if not self.stt_ready.is_set() else ""))
             
         except Exception as e:
             logger.error(f"Failed to initialize AudioEngine: {e}")
             raise
     
+    async def _initialize_stt(self):
+        """Create, load and warm up the STT processor, then open the startup backlog"""
+        phase_start = time.time()
+        processor = STTFactory.create_stt_processor(self.config)
+        await processor.initialize()
+        for timing in getattr(processor, 'warmup_timings', []):
+            logger.info(f"STT warmed up for {timing['duration']:.1f}s x{timing['batch_size']}: "
+                        f"cold {timing['cold_ms']:.0f}ms -> warm {timing['warm_ms']:.0f}ms")
+        self.startup_timings['stt_model'] = time.time() - phase_start
+        
+        self.stt_processor = processor
+        self.stt_ready.set()
+        self.startup_timings['stt_ready_after'] = time.time() - self._startup_time
+        if self.startup_backlog:
+            logger.info(f"STT ready after {self.startup_timings['stt_ready_after']:.2f}s - transcribing "
+                        f"{len(self.startup_backlog)} segments ({self.startup_backlog.duration:.1f}s) "
+                        f"captured while loading")
+    
+    def _load_stt_in_background(self):
+        """STT loader thread: the model load runs on its own event loop"""
+        try:
+            asyncio.run(self._initialize_stt())
+        except Exception as e:
+            self.stt_load_error = e
+            logger.error(f"Failed to load STT model in the background: {e}", exc_info=True)
+            self._report_error(f"Speech-to-Text model failed to load: {e}")
+            return
+        if self.on_stt_ready:
+            try:
+                self.on_stt_ready()
+            except Exception as e:
+                logger.error(f"STT ready callback failed: {e}")
+    
+    @property
+    def stt_loading(self) -> bool:
+        """True while the background loader is still bringing the model up"""
+        return self._stt_loader is not None and self._stt_loader.is_alive() and not self.stt_ready.is_set()
+    
+    async def wait_for_stt(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the STT model is loaded; False on timeout or load failure"""
+        if self._stt_loader is not None:
+            await asyncio.to_thread(self._stt_loader.join, timeout)
+        return self.stt_ready.is_set()
+    
+    def reset_stream(self, capture_sample_rate: Optional[int] = None):
+        """Start a fresh audio stream: rebuild resampler and segmenter, restart sample clock
+        
+        Args:
+            capture_sample_rate: New input rate (e.g. of an audio file); defaults to config
+        """
+        if capture_sample_rate is not None:
+            self.config.audio.capture_sample_rate = capture_sample_rate
+        
+        self.resampler = None
+        if self.config.audio.enable_resampling and \
+           self.config.audio.capture_sample_rate != self.config.audio.model_sample_rate:
+            self.resampler = AudioResampler(
+                ResamplerConfig(
+                    input_rate=self.config.audio.capture_sample_rate,
+                    output_rate=self.config.audio.model_sample_rate,
+                    quality=self.config.audio.resample_quality
+                )
+            )
+            logger.info(f"Resampler initialized: {self.config.audio.capture_sample_rate}Hz -> {self.config.audio.model_sample_rate}Hz")
+        
+        self.conditioner = None
+        if self.config.audio.audio_conditioning:
+            self.conditioner = create_conditioner(self.config.audio, self.config.audio.model_sample_rate)
+        
+        self.segmenter = create_segmenter(
+            self.config.audio, self.config.audio.model_sample_rate, self.stt_buffer_duration
+        )
+        self._stt_streams.clear()  # Sample clock and utterance ids start over
+        sample_rate = self.config.audio.model_sample_rate
+        self.frame_history = FrameHistory(
+            sample_rate,
+            self.vad_engine.frame_size if self.vad_engine else int(sample_rate * self.config.vad.frame_duration),
+        )
+        self.speech_gate = SpeechGate(
+            self.frame_history,
+            pad_duration=self.config.audio.stt_trim_padding,
+            min_speech_ratio=self.config.audio.stt_min_speech_ratio,
+        )
+        self.noise_suppressor = None
+        if self.config.audio.noise_suppression:
+            if self.vad_engine:
+                self.noise_suppressor = SpectralNoiseSuppressor(
+                    sample_rate,
+                    self.vad_engine.frame_size,
+                    oversubtraction=self.config.audio.noise_suppression_oversubtraction,
+                    gain_floor_db=self.config.audio.noise_suppression_floor_db,
+                )
+            else:
+                logger.warning("Noise suppression learns from VAD frames - disabled without a VAD")
+        if self.vad_engine:
+            self.vad_engine.reset()
+    
     async def start(self):
         """Start audio processing"""
         if not self.is_running:
             raise RuntimeError("AudioEngine not initialized")
         
-        if not SOUNDDDEVICE_AVAILABLE:
-            raise RuntimeError("sounddevice library not available. Install with: pip install sounddevice")
-        
         if self.is_listening:
             logger.warning("Already listening")
             return
             
         logger.info("Starting audio processing...")
         
-        # Start audio processing thread
+        if self.audio_source is None:
+            self.audio_source = create_audio_source(self.config.audio, self.capture_blocksize)
+        source = self.audio_source
+        
+        # File and synthetic sources dictate their own rate and block size
+        if source.sample_rate != self.config.audio.capture_sample_rate:
+            self.reset_stream(capture_sample_rate=source.sample_rate)
+        if source.blocksize > self.block_pool.block_size:
+            self.block_pool = AudioBlockPool(num_blocks=self.block_pool.num_blocks, block_size=source.blocksize)
+        
+        self.stt_worker.start()
+        
+        # Listening must be set before the consumer starts, or its loop exits immediately
+        self.is_listening = True
+        self._last_capture_report_time = time.time()
         self.audio_thread = threading.Thread(target=self._audio_processing_loop, daemon=True)
         self.audio_thread.start()
         
-        # Start audio stream at capture sample rate
-        self.audio_stream = sd.InputStream(
-            device=self.config.audio.device_index,
-            samplerate=self.config.audio.capture_sample_rate,
-            channels=1,
-            dtype=np.float32,
-            callback=self._audio_callback,
-            blocksize=int(self.config.audio.chunk_size * self.config.audio.capture_sample_rate / self.config.audio.model_sample_rate)
-        )
-        self.audio_stream.start()
+        try:
+            source.start(self._audio_callback, has_space=self.block_pool.has_space)
+        except Exception:
+            self.is_listening = False
+            self.audio_thread.join(timeout=2.0)
+            self.stt_worker.stop()
+            raise
         
-        self.is_listening = True
-        logger.info("Audio processing started")
+        logger.info(f"Audio processing started ({type(source).__name__} at {source.sample_rate}Hz)")
     
     async def stop(self):
         """Stop audio processing"""
@@ -172,56 +315,76 @@ class AudioEngine:
         logger.info("Stopping audio processing...")
         self.is_listening = False
         
-        # Stop audio stream
-        if self.audio_stream:
-            self.audio_stream.stop()
-            self.audio_stream.close()
-            self.audio_stream = None
+        # Stop audio source
+        if self.audio_source:
+            self.audio_source.stop()
         
         # Wait for processing thread
         if self.audio_thread and self.audio_thread.is_alive():
             self.audio_thread.join(timeout=2.0)
         
-        # Clear audio queue and STT buffer
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        # Segments already handed to STT hold finished speech - let them complete
+        if self.stt_ready.is_set():
+            while self.startup_backlog:
+                self.stt_worker.submit(self.startup_backlog.pop())
+        elif self.startup_backlog:
+            logger.warning(f"Stopped before the STT model was ready - discarding "
+                           f"{self.startup_backlog.clear()} segments captured while loading")
+        self.stt_worker.stop()
         
-        # Clear STT buffer to prevent processing stale audio
-        self.stt_buffer.clear()
-        logger.info(f"Cleared STT buffer and audio queue")
+        # Clear pending capture blocks and STT buffer to prevent processing stale audio
+        self.block_pool.clear()
+        with self._segmenter_lock:
+            self.segmenter.reset()
+        self._stt_streams.clear()
+        self._stt_profile = "accurate"
+        self._apply_stt_profile()
+        self.backpressure.reset()
+        logger.info("Cleared STT buffer and capture block pool")
                 
         logger.info("Audio processing stopped")
     
     def _audio_callback(self, indata, frames, time, status):
-        """Audio input callback - producer side of pipeline"""
+        """Audio input callback - producer side of pipeline
+        
+        Runs on the realtime audio thread: no logging, no allocation, no locks.
+        Status flags and overflows are counted and reported by the consumer.
+        """
         if status:
-            logger.warning(f"Audio status: {status}")
+            self.callback_status_count += 1
+            self.last_callback_status = status
         
         if self.is_listening:
-            try:
-                # Convert to float32 and add to queue
-                audio_chunk = indata[:, 0].astype(np.float32)
-                self.total_chunks_received += 1
-                
-                if not self.audio_queue.full():
-                    self.audio_queue.put(audio_chunk.copy())
-                    
-                    # Log queue usage metrics
-                    current_queue_size = self.audio_queue.qsize()
-                    if current_queue_size > 40:  # 80% capacity
-                        logger.warning(f"High queue usage: {current_queue_size}/50 chunks ({current_queue_size/50*100:.1f}%)")
-                else:
-                    self.queue_overflow_count += 1
-                    logger.warning(f"Audio queue full, dropping chunk (overflow #{self.queue_overflow_count}, total received: {self.total_chunks_received})")
-                    
-                    # Log detailed queue statistics
-                    logger.info(f"Queue stats - Size: {self.audio_queue.qsize()}/50, Overflow rate: {self.queue_overflow_count/self.total_chunks_received*100:.2f}%")
-                    
-            except Exception as e:
-                logger.error(f"Audio callback error: {e}")
+            self.block_pool.write(indata[:, 0])
+    
+    @property
+    def total_chunks_received(self) -> int:
+        return self.block_pool.blocks_written + self.block_pool.overflow_count
+    
+    @property
+    def queue_overflow_count(self) -> int:
+        return self.block_pool.overflow_count
+    
+    def _report_capture_metrics(self):
+        """Rate-limited capture warnings (consumer thread only)"""
+        now = time.time()
+        if now - self._last_capture_report_time < self.capture_metrics_interval:
+            return
+        
+        new_overflows = self.block_pool.overflow_count - self._reported_overflow_count
+        new_statuses = self.callback_status_count - self._reported_status_count
+        if new_overflows:
+            logger.warning(f"Capture pool overflow: dropped {new_overflows} blocks in the last "
+                           f"{now - self._last_capture_report_time:.0f}s (total {self.block_pool.overflow_count}, "
+                           f"rate {self.queue_overflow_count/max(1, self.total_chunks_received)*100:.2f}%)")
+        if new_statuses:
+            logger.warning(f"Audio status flags raised {new_statuses} times (last: {self.last_callback_status})")
+        if self.block_pool.truncated_count:
+            logger.debug(f"Oversized capture blocks truncated: {self.block_pool.truncated_count}")
+        
+        self._reported_overflow_count = self.block_pool.overflow_count
+        self._reported_status_count = self.callback_status_count
+        self._last_capture_report_time = now
     
     def _audio_processing_loop(self):
         """Background audio processing - consumer side of pipeline"""
@@ -229,48 +392,27 @@ class AudioEngine:
         
         while self.is_listening:
             try:
-                # Get audio chunk from queue (at capture sample rate)
-                audio_chunk = self.audio_queue.get(timeout=0.5)
-                chunk_start_time = time.time()
+                self._report_capture_metrics()
+                self._drain_startup_backlog()
                 
-                # Resample if needed (convert to model sample rate)
-                if self.resampler:
-                    audio_chunk = self.resampler.resample_chunk(audio_chunk)
+                # Get audio block from the capture pool (at capture sample rate)
+                audio_chunk = self.block_pool.get(timeout=0.5)
+                if audio_chunk is None:
+                    self._process_quiet_period()
+                    continue
+                chunk_start_time = time.time()
                 
-                # Process VAD on individual chunks (expects model sample rate)
-                if self.vad_engine:
-                    vad_status = self.vad_engine.process_audio_frame(audio_chunk)
-                    self._update_vad_status(vad_status)
+                if self.config.audio.backpressure_enabled:
+                    self._update_backpressure(len(audio_chunk) / self.config.audio.capture_sample_rate)
                 
-                # Add to STT buffer for efficient batch processing
-                # STT models work much better on multi-second segments than micro-chunks
-                self.stt_buffer.extend(audio_chunk)
+                try:
+                    segments = self._prepare_chunk(audio_chunk)
+                finally:
+                    # Block contents are copied out - recycle the slot for the callback
+                    self.block_pool.release()
                 
-                # Process STT when buffer reaches target duration (4 seconds)
-                if len(self.stt_buffer) >= self.stt_buffer_max_samples:
-                    # Convert buffer to numpy array for STT processing
-                    stt_chunk = np.array(self.stt_buffer[:self.stt_buffer_max_samples], dtype=np.float32)
-                    
-                    # Remove processed samples from buffer (keep remainder for next batch)
-                    self.stt_buffer = self.stt_buffer[self.stt_buffer_max_samples:]
-                    
-                    # Check if audio is loud enough for STT (on the full 4-second chunk)
-                    max_level = np.max(np.abs(stt_chunk))
-                    if max_level >= self.config.audio.silence_threshold:
-                        # Process through STT (synchronous in worker thread)
-                        # This now processes meaningful 4-second segments instead of 43ms fragments
-                        stt_start_time = time.time()
-                        text = self._process_stt_sync(stt_chunk)
-                        stt_processing_time = time.time() - stt_start_time
-                        self.total_stt_calls += 1
-                        
-                        if text and text.strip():
-                            self._handle_transcription(text)
-                        
-                        # Log STT processing performance (should be much more efficient now)
-                        logger.debug(f"STT processed {len(stt_chunk)/self.config.audio.model_sample_rate:.1f}s audio in {stt_processing_time:.3f}s")
-                        if stt_processing_time > 1.0:  # 1s threshold for 4s audio
-                            logger.warning(f"Slow STT processing: {stt_processing_time:.3f}s for {len(stt_chunk)/self.config.audio.model_sample_rate:.1f}s audio")
+                # Process STT for every segment the segmenter completed
+                self._dispatch_segments(segments)
                 
                 # Track chunk processing metrics (queue management performance)
                 processing_time = time.time() - chunk_start_time
@@ -281,56 +423,319 @@ class AudioEngine:
                 # Log periodic performance summary with STT efficiency metrics
                 if self.total_chunks_processed % 100 == 0:
                     avg_processing_time = sum(self.processing_times[-100:]) / min(100, len(self.processing_times))
-                    buffer_seconds = len(self.stt_buffer) / self.config.audio.model_sample_rate
+                    buffer_seconds = len(self.segmenter) / self.config.audio.model_sample_rate
                     logger.info(f"Performance summary - Chunks: {self.total_chunks_processed}, "
                               f"STT calls: {self.total_stt_calls}, "
+                              f"STT queue: {self.stt_worker.qsize()}/{self.stt_worker.max_pending}, "
                               f"Avg chunk time: {avg_processing_time:.3f}s, "
-                              f"Queue: {self.audio_queue.qsize()}/50, "
+                              f"Queue: {self.block_pool.qsize()}/{self.block_pool.num_blocks}, "
                               f"STT buffer: {buffer_seconds:.1f}s, "
                               f"Overflow rate: {self.queue_overflow_count/max(1, self.total_chunks_received)*100:.2f}%")
+                    if hasattr(self.segmenter, 'get_latency_stats'):
+                        stats = self.segmenter.get_latency_stats()
+                        logger.info(f"Streaming latency - First partial avg: {stats['first_partial_avg_ms']:.0f}ms, "
+                                  f"Final commit avg: {stats['final_commit_avg_ms']:.0f}ms")
+                    bp = self.backpressure.get_metrics()
+                    if bp['level'] or bp['escalations']:
+                        logger.info(f"Backpressure - Level: {bp['level_name']}, RTF: {bp['rtf']:.2f}, "
+                                  f"Silence dropped: {bp['silent_seconds_dropped']:.1f}s, "
+                                  f"Segments merged: {bp['segments_merged']} in {bp['merged_batches']} batches, "
+                                  f"Partials skipped: {bp['partials_skipped']}, "
+                                  f"Degraded STT calls: {bp['degraded_stt_calls']}")
                     
-            except queue.Empty:
-                # Process any remaining audio in buffer during quiet periods
-                # This ensures we don't lose the last bit of speech
-                if len(self.stt_buffer) > self.config.audio.model_sample_rate * 0.5:  # > 0.5 seconds
-                    stt_chunk = np.array(self.stt_buffer, dtype=np.float32)
-                    self.stt_buffer.clear()
-                    
-                    max_level = np.max(np.abs(stt_chunk))
-                    if max_level >= self.config.audio.silence_threshold:
-                        text = self._process_stt_sync(stt_chunk)
-                        self.total_stt_calls += 1
-                        if text and text.strip():
-                            self._handle_transcription(text)
-                        logger.debug(f"Processed remaining {len(stt_chunk)/self.config.audio.model_sample_rate:.1f}s audio from buffer")
-                
-                # Check for queue starvation
-                if self.audio_queue.qsize() == 0 and time.time() - self.last_chunk_time > 1.0:
-                    logger.debug("Queue starvation detected - no audio chunks for >1s")
-                continue
             except Exception as e:
                 logger.error(f"Audio processing error: {e}")
-                if self.on_error:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_error):
-                            asyncio.run_coroutine_threadsafe(
-                                self.on_error(f"Audio processing error: {e}"),
-                                asyncio.get_event_loop()
-                            )
-                        else:
-                            self.on_error(f"Audio processing error: {e}")
-                    except Exception as callback_error:
-                        logger.error(f"Error callback failed: {callback_error}")
+                self._report_error(f"Audio processing error: {e}")
         
+        # Segments batched under backpressure hold speech - transcribe them before exiting
+        self._flush_merge_pending()
         logger.info("Audio processing loop stopped")
     
-    def _process_stt_sync(self, audio_chunk: np.ndarray) -> Optional[str]:
+    def _report_error(self, message: str):
+        """Forward an error to the UI callback from a worker thread"""
+        if not self.on_error:
+            return
+        try:
+            if asyncio.iscoroutinefunction(self.on_error):
+                asyncio.run_coroutine_threadsafe(
+                    self.on_error(message),
+                    self.event_loop or asyncio.get_event_loop()
+                )
+            else:
+                self.on_error(message)
+        except Exception as callback_error:
+            logger.error(f"Error callback failed: {callback_error}")
+    
+    def _prepare_chunk(self, audio_chunk: np.ndarray) -> List[AudioSegment]:
+        """Resample, condition, run VAD and segment one capture-rate chunk"""
+        # Resample if needed (convert to model sample rate)
+        if self.resampler:
+            audio_chunk = self.resampler.resample_chunk(audio_chunk)
+        
+        # Remove DC/rumble and steady the level before VAD and STT see the audio;
+        # the VAD still counts clipping on the unconditioned input
+        input_chunk = None
+        if self.conditioner:
+            input_chunk = audio_chunk
+            audio_chunk = self.conditioner.process(audio_chunk)
+        
+        # Process VAD frame by frame (expects model sample rate); the segmenter gets the
+        # frame-aligned audio so each speech flag covers exactly one VAD frame
+        speech_flags = None
+        if self.vad_engine:
+            vad_status = self.vad_engine.process_audio_frame(audio_chunk, input_audio=input_chunk)
+            self._update_vad_status(vad_status)
+            audio_chunk = vad_status['frame_audio']
+            speech_flags = vad_status['speech_flags']
+            if not len(speech_flags):
+                # Chunk shorter than a frame - carried over by the VAD
+                return []
+            self.frame_history.record(speech_flags, vad_status['features'])
+            
+            # Denoise the frames STT will see; VAD and the frame history keep the raw levels
+            if self.noise_suppressor:
+                audio_chunk, speech_flags = self.noise_suppressor.process(audio_chunk, speech_flags)
+                if not len(speech_flags):
+                    return []
+        
+        # Under backpressure, silence never reaches the STT buffer of segmenters that
+        # don't endpoint on VAD; the gap ends the current segment so speech isn't held back
+        if self.backpressure.drop_silence and speech_flags is not None \
+                and not self.segmenter.uses_speech_flags and not np.any(speech_flags):
+            self.backpressure.record_silence_dropped(len(audio_chunk) / self.config.audio.model_sample_rate)
+            with self._segmenter_lock:
+                segment = self.segmenter.flush(force=True)  # skip() drops whatever stays buffered
+                self.segmenter.skip(len(audio_chunk))  # Keep segment positions on the VAD clock
+            return [segment] if segment is not None else []
+        
+        # Add to STT segmenter for efficient batch processing
+        # STT models work much better on multi-second segments than micro-chunks
+        with self._segmenter_lock:
+            return self.segmenter.push(audio_chunk, speech_flags)
+    
+    def process_audio_chunk(self, audio_chunk: np.ndarray):
+        """Run one capture-rate chunk through the full pipeline on the calling thread
+        
+        Used for offline/file input where there is no capture callback or consumer thread.
+        """
+        self._dispatch_segments(self._prepare_chunk(audio_chunk))
+    
+    def flush_segments(self):
+        """Transcribe whatever the segmenter still holds (end of speech or stream)"""
+        with self._segmenter_lock:
+            segment = self.segmenter.flush()
+        if segment is not None:
+            self._dispatch_segments([segment])
+            logger.debug(f"Processed remaining {segment.duration:.1f}s audio from buffer")
+        self._flush_merge_pending()
+    
+    def _update_backpressure(self, audio_seconds: float):
+        """Feed the backpressure controller and apply level changes (consumer thread)"""
+        previous = self.backpressure.level
+        backlog = max(self.block_pool.qsize() / self.block_pool.num_blocks,
+                      self.stt_worker.qsize() / self.stt_worker.max_pending)
+        level = self.backpressure.update(audio_seconds, backlog)
+        if level == previous:
+            return
+        
+        if level < BackpressureLevel.MERGE_SEGMENTS:
+            self._flush_merge_pending()
+        self._stt_profile = "fast" if level >= BackpressureLevel.DEGRADE_QUALITY else "accurate"
+        if not self.stt_worker.is_running:
+            self._apply_stt_profile()
+    
+    def _apply_stt_profile(self):
+        """Switch the STT quality profile (on the thread that runs the model)"""
+        current = getattr(self.stt_processor, 'quality_profile', "accurate")
+        if self._stt_profile == current:
+            return
+        if hasattr(self.stt_processor, 'set_quality_profile'):
+            self.stt_processor.set_quality_profile(self._stt_profile)
+        else:
+            logger.warning(f"STT processor has no quality profiles - cannot switch to '{self._stt_profile}'")
+            self._stt_profile = current
+    
+    def _dispatch_segments(self, segments: List[AudioSegment]):
+        """Transcribe segments now, or batch them while backpressure asks for merging"""
+        for segment in segments:
+            if self.config.audio.stt_speech_gate:
+                self.speech_gate.apply(segment, trim=self.segmenter.allows_trimming)
+            recorded = self.frame_history.lookup(segment.start_sample, segment.end_sample)
+            if recorded is not None:
+                segment.features = recorded[1]
+            if not self.backpressure.merge_segments:
+                self._flush_merge_pending()
+                self._process_segment(segment)
+            elif segment.is_partial:
+                # The utterance's final segment re-decodes the same audio
+                self.backpressure.record_partial_skipped()
+            elif not self.speech_gate.passes(segment):
+                # Nothing to transcribe - keep it out of the batch
+                continue
+            else:
+                # Views alias segmenter rings - copy before holding on to them
+                segment.audio = segment.audio.copy()
+                self._merge_pending.append(segment)
+                pending_seconds = sum(s.duration for s in self._merge_pending)
+                if pending_seconds >= self.config.audio.backpressure_merge_duration:
+                    self._flush_merge_pending()
+    
+    def _flush_merge_pending(self):
+        """Transcribe segments batched under backpressure as one STT call"""
+        if not self._merge_pending:
+            return
+        pending, self._merge_pending = self._merge_pending, []
+        if len(pending) > 1:
+            self.backpressure.record_merge(len(pending))
+            self._process_segment(merge_segments(pending))
+        else:
+            self._process_segment(pending[0])
+    
+    def _process_quiet_period(self):
+        """Flush buffered audio when no capture blocks arrive"""
+        # Process any remaining audio in buffer during quiet periods
+        # This ensures we don't lose the last bit of speech
+        self.flush_segments()
+        
+        # Check for capture starvation
+        if self.block_pool.qsize() == 0 and time.time() - self.last_chunk_time > 1.0:
+            logger.debug("Queue starvation detected - no audio chunks for >1s")
+    
+    def _process_segment(self, segment: AudioSegment):
+        """Hand a segment to the STT worker, or transcribe it inline when not listening"""
+        if not self.stt_ready.is_set() or self.startup_backlog:
+            # Model still loading, or older segments still waiting: keep arrival order
+            if self.speech_gate.passes(segment):
+                self.startup_backlog.push(segment)
+            self._drain_startup_backlog()
+            return
+        self._submit_segment(segment)
+    
+    def _drain_startup_backlog(self):
+        """Move segments captured during model load on to STT (consumer thread)
+        
+        Only fills free worker queue slots, so the consumer keeps chunk cadence
+        while the backlog is worked off.
+        """
+        if not self.startup_backlog or not self.stt_ready.is_set():
+            return
+        while self.startup_backlog:
+            if self.stt_worker.is_running and self.stt_worker.qsize() >= self.stt_worker.max_pending:
+                return
+            self._submit_segment(self.startup_backlog.pop())
+    
+    def _submit_segment(self, segment: AudioSegment):
+        if self.stt_worker.is_running:
+            self.stt_worker.submit(segment)
+        else:
+            self._finish_segment(segment, self._transcribe_segment(segment))
+    
+    def _transcribe_segment(self, segment: AudioSegment) -> Optional[str]:
+        """Run STT on one segment if it holds speech and is loud enough (STT worker thread)"""
+        return self._transcribe_segments([segment])[0]
+    
+    def _transcribe_segments(self, segments: List[AudioSegment]) -> List[Optional[str]]:
+        """Run STT on the segments worth decoding in one batched model call (STT worker thread)"""
+        self._apply_stt_profile()
+        
+        texts: List[Optional[str]] = [None] * len(segments)
+        batch = []
+        for i, segment in enumerate(segments):
+            # Mostly non-speech according to the VAD flags (already counted by the gate)
+            if not self.speech_gate.passes(segment):
+                if not segment.is_partial:
+                    self._stt_streams.pop(segment.utterance_id, None)
+                continue
+            
+            # Check if audio is loud enough for STT (on the whole segment, from the VAD's frame peaks)
+            features = segment.features or AudioFeatures.from_audio(segment.audio, self.frame_history.frame_size)
+            if features.peak < self.config.audio.silence_threshold:
+                if not segment.is_partial:
+                    self._stt_streams.pop(segment.utterance_id, None)
+                continue
+            batch.append((i, segment, features))
+        if not batch:
+            return texts
+        
+        stt_start_time = time.time()
+        if self._incremental_streaming():
+            results = [self._transcribe_incremental(segment, features) for _, segment, features in batch]
+        elif len(batch) == 1:
+            results = [self._process_stt_sync(batch[0][1].audio, batch[0][2])]
+        else:
+            results = self._process_stt_batch_sync([s.audio for _, s, _ in batch], [f for _, _, f in batch])
+        stt_processing_time = time.time() - stt_start_time
+        self.total_stt_calls += 1
+        self.backpressure.record_stt(stt_processing_time)
+        for (i, _, _), text in zip(batch, results):
+            texts[i] = text
+        
+        # Log STT processing performance
+        audio_seconds = sum(s.duration for _, s, _ in batch)
+        logger.debug(f"STT processed {len(batch)} segment(s) from {batch[0][1].segment_id} "
+                     f"({audio_seconds:.1f}s) in {stt_processing_time:.3f}s")
+        if stt_processing_time > audio_seconds / 4:  # 1s threshold for 4s audio
+            logger.warning(f"Slow STT processing: {stt_processing_time:.3f}s for {audio_seconds:.1f}s audio")
+        return texts
+    
+    def _incremental_streaming(self) -> bool:
+        return (self.config.audio.stt_incremental_streaming
+                and self.config.audio.stt_segmentation_mode == "streaming"
+                and getattr(self.stt_processor, 'supports_streaming', False))
+    
+    def _transcribe_incremental(self, segment: AudioSegment,
+                                features: Optional[AudioFeatures] = None) -> Optional[str]:
+        """Extend the utterance's encoder stream with the segment's unseen audio (STT worker thread)
+        
+        Partials cover the utterance from its onset, so each one only adds the
+        audio since the previous one; the final segment flushes the stream.
+        """
+        entry = self._stt_streams.get(segment.utterance_id)
+        if entry is None:
+            # Segments arrive in order - streams of older utterances will get no more audio
+            self._stt_streams.clear()
+            try:
+                entry = (self.stt_processor.create_stream(), segment.start_sample)
+            except Exception as e:
+                logger.error(f"Could not open STT stream, decoding the segment whole: {e}")
+                return self._process_stt_sync(segment.audio, features)
+            self.streams_opened += 1
+        stream, consumed = entry
+        
+        audio = segment.audio[max(0, consumed - segment.start_sample):]
+        text = self.stt_processor.transcribe_stream(stream, audio, is_final=not segment.is_partial)
+        self.stream_samples_encoded += len(audio)
+        self.stream_samples_submitted += segment.num_samples
+        if segment.is_partial:
+            self._stt_streams[segment.utterance_id] = (stream, max(consumed, segment.end_sample))
+        else:
+            self._stt_streams.pop(segment.utterance_id, None)
+        return text
+    
+    def _finish_segment(self, segment: AudioSegment, text: Optional[str]):
+        """Forward only text that is new - called in segment order"""
+        # Overlapping segmenters drop words that earlier segments already produced
+        # Streaming mode only returns the stable prefix, so injection never needs retracting
+        with self._segmenter_lock:
+            text = self.segmenter.merge_transcript(segment, text)
+            partial = self.segmenter.pop_partial()
+        
+        if text and text.strip():
+            if self.on_segment_transcribed:
+                self.on_segment_transcribed(segment, text)
+            self._handle_transcription(text)
+        
+        if partial is not None:
+            self._handle_partial_transcription(partial)
+    
+    def _process_stt_sync(self, audio_chunk: np.ndarray,
+                          features: Optional[AudioFeatures] = None) -> Optional[str]:
         """Process audio through STT model"""
         try:
             if self.stt_processor:
                 logger.debug(f"Calling STT transcribe with chunk shape: {audio_chunk.shape}")
                 start_time = time.time()
-                result = self.stt_processor.transcribe(audio_chunk)
+                result = self.stt_processor.transcribe(audio_chunk, features)
                 elapsed = time.time() - start_time
                 
                 # Log STT performance metrics
@@ -344,6 +749,22 @@ class AudioEngine:
             logger.error(f"STT processing error: {e}", exc_info=True)
             return None
     
+    def _process_stt_batch_sync(self, audio_chunks: List[np.ndarray],
+                                features: List[Optional[AudioFeatures]]) -> List[Optional[str]]:
+        """Process several segments through the STT model in one call"""
+        try:
+            if not self.stt_processor:
+                return [None] * len(audio_chunks)
+            if not hasattr(self.stt_processor, 'transcribe_batch'):
+                return [self._process_stt_sync(a, f) for a, f in zip(audio_chunks, features)]
+            start_time = time.time()
+            results = self.stt_processor.transcribe_batch(audio_chunks, features)
+            logger.debug(f"STT batch of {len(audio_chunks)} took {time.time() - start_time:.3f}s")
+            return results
+        except Exception as e:
+            logger.error(f"STT batch processing error: {e}", exc_info=True)
+            return [None] * len(audio_chunks)
+    
     def _handle_transcription(self, text: str):
         """Handle raw transcription from STT"""
         self.current_text = text
@@ -384,6 +805,26 @@ class AudioEngine:
                     self.event_loop or asyncio.get_event_loop()
                 )
     
+    def _handle_partial_transcription(self, partial: PartialTranscription):
+        """Forward an interim hypothesis (stable prefix + changing tail) to the UI"""
+        if partial.is_final and hasattr(self.segmenter, 'get_latency_stats'):
+            stats = self.segmenter.get_latency_stats()
+            logger.debug(f"Utterance {partial.utterance_id} committed - "
+                         f"first partial: {stats['first_partial_last_ms']:.0f}ms, "
+                         f"final commit: {stats['final_commit_last_ms']:.0f}ms")
+        
+        if self.on_partial_transcription:
+            try:
+                if asyncio.iscoroutinefunction(self.on_partial_transcription):
+                    asyncio.run_coroutine_threadsafe(
+                        self.on_partial_transcription(partial),
+                        self.event_loop or asyncio.get_event_loop()
+                    )
+                else:
+                    self.on_partial_transcription(partial)
+            except Exception as e:
+                logger.error(f"Partial transcription callback failed: {e}")
+    
     async def _on_correction_complete(self, result):
         """Handle completed correction from Clarity Engine"""
         # Update current text with corrected version
@@ -448,7 +889,8 @@ class AudioEngine:
         """Clear current text and context"""
         self.current_text = ""
         # Also clear STT buffer to prevent processing stale audio
-        self.stt_buffer.clear()
+        with self._segmenter_lock:
+            self.segmenter.reset()
         if self.clarity_engine:
             self.clarity_engine.clear_context()
     
@@ -456,11 +898,55 @@ class AudioEngine:
         """Get current transcribed text"""
         return self.current_text
     
+    def get_stt_worker_metrics(self) -> dict:
+        """STT queue depth, throughput and wait times"""
+        return self.stt_worker.get_metrics()
+    
+    def get_backpressure_metrics(self) -> dict:
+        """Backpressure level, real-time factor and load shedding counters"""
+        return self.backpressure.get_metrics()
+    
+    def get_conditioner_metrics(self) -> dict:
+        """AGC gain and limiter activity of the conditioning chain"""
+        return self.conditioner.get_metrics() if self.conditioner else {}
+    
+    def get_noise_suppressor_metrics(self) -> dict:
+        """Noise frames learned and mean spectral gain of the suppressor"""
+        return self.noise_suppressor.get_metrics() if self.noise_suppressor else {}
+    
+    def get_startup_metrics(self) -> dict:
+        """Startup phase timings and what the backlog held while the model loaded"""
+        return {
+            'stt_ready': self.stt_ready.is_set(),
+            'stt_load_error': str(self.stt_load_error) if self.stt_load_error else None,
+            'phases': dict(self.startup_timings),
+            **self.startup_backlog.get_metrics(),
+        }
+    
+    def get_streaming_metrics(self) -> dict:
+        """Streams opened and audio encoded incrementally vs. what re-decoding would have run"""
+        submitted = self.stream_samples_submitted
+        return {
+            'incremental': bool(self._incremental_streaming()),
+            'streams_opened': self.streams_opened,
+            'open_streams': len(self._stt_streams),
+            'seconds_encoded': self.stream_samples_encoded / self.config.audio.model_sample_rate,
+            'seconds_submitted': submitted / self.config.audio.model_sample_rate,
+            'encoded_ratio': self.stream_samples_encoded / submitted if submitted else 0.0,
+        }
+    
+    def get_speech_gate_metrics(self) -> dict:
+        """Seconds of audio trimmed or skipped before STT"""
+        return self.speech_gate.get_metrics()
+    
     # Callback setters (called by DictationView during initialization)
     
     def set_raw_transcription_callback(self, callback: Callable[[str], None]):
         self.on_raw_transcription = callback
     
+    def set_partial_transcription_callback(self, callback: Callable[[PartialTranscription], None]):
+        self.on_partial_transcription = callback
+    
     def set_corrected_transcription_callback(self, callback: Callable):
         self.on_corrected_transcription = callback
     
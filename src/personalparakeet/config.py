@@ -35,7 +35,65 @@ class AudioConfig:
     use_mock_stt: bool = False  # Use real STT if NeMo is available
     stt_device: str = "cuda"  # Device for STT: "cuda" or "cpu"
     stt_audio_threshold: float = 0.01  # Threshold for filtering silent chunks
+    stt_backend: str = "inprocess"  # "process": run the model in a supervised child process
+    stt_runtime: str = "nemo"  # "onnx": exported CTC graph on ONNX Runtime (CPU, no NeMo/PyTorch)
+    stt_onnx_model_path: Optional[str] = None  # ONNX runtime: model file (manifest beside it as .json)
+    stt_cpu_threads: int = 0  # ONNX runtime: intra-op threads, 0 = one per physical core
+    stt_cpu_inter_op_threads: int = 1  # ONNX runtime: parallel graph branches (sequential execution uses 1)
+    stt_cpu_quantization: str = "none"  # "int8": dynamic int8 encoder weights on CPU, cached under model_cache_dir
+    stt_artifact_cache: bool = True  # NeMo: unpack .nemo once, then load memory-mapped safetensors weights
+    stt_process_slots: int = 4  # Process backend: shared memory audio slots
+    stt_process_slot_duration: float = 30.0  # Process backend: seconds of audio per slot
+    stt_process_timeout: float = 60.0  # Process backend: restart the child if a request takes longer
     model_cache_dir: Optional[str] = None  # Custom cache directory for model storage
+    
+    # STT segmentation: "fixed" (back-to-back 4s blocks), "sliding" (overlapping windows)
+    # "vad" (speech onset to detected pause) or "streaming" (vad + interim partial hypotheses)
+    stt_segmentation_mode: str = "fixed"
+    stt_window_duration: float = 2.0  # seconds of audio per sliding-window STT call
+    stt_hop_duration: float = 0.5     # seconds of new audio between sliding windows
+    stt_left_context: float = 0.25    # leading seconds whose words may be cut (alignment only)
+    stt_right_context: float = 0.25   # trailing seconds whose words are held for the next window
+    stt_min_segment_duration: float = 0.3  # VAD/streaming: drop segments with less speech than this
+    stt_max_segment_duration: float = 8.0  # VAD/streaming: force a split in long monologues
+    stt_endpoint_silence: float = 0.5      # VAD/streaming: silence that closes a segment
+    stt_segment_padding: float = 0.2       # VAD/streaming: audio kept before onset / after speech
+    stt_partial_interval: float = 0.3      # Streaming mode: re-decode the open utterance this often
+    stt_incremental_streaming: bool = True  # Streaming mode: cache-aware models encode only the audio new since the last partial
+    # Capture input: "sounddevice" (live mic), "file" (replay audio_source_path) or "synthetic"
+    audio_source: str = "sounddevice"
+    audio_source_path: Optional[str] = None
+    audio_source_realtime: bool = True  # False: file/synthetic replay as fast as the pipeline keeps up
+    stt_queue_size: int = 8  # Segments waiting for the STT worker before the consumer waits
+    stt_max_batch_size: int = 4  # Queued segments decoded together in one model call (1 disables)
+    stt_max_batch_wait: float = 0.0  # Seconds the worker waits for more segments to fill a batch
+    stt_warmup: bool = True  # Decode dummy segments of each configured length before reporting ready
+    stt_warmup_runs: int = 2  # Per segment length: the first run is cold, the last one shows warm latency
+    stt_background_load: bool = True  # Open the mic, VAD and UI first; load the model on a background thread
+    stt_startup_buffer_duration: float = 60.0  # Seconds of speech held for STT while the model loads (oldest dropped)
+    backpressure_enabled: bool = True  # Shed load (silence, then batching, then quality) when STT falls behind
+    backpressure_merge_duration: float = 8.0  # Max seconds of audio merged into one STT call under load
+    stt_speech_gate: bool = True  # Trim VAD non-speech off segment edges and skip mostly-silent segments
+    stt_min_speech_ratio: float = 0.1  # Speech gate: skip segments with a smaller share of speech frames
+    stt_trim_padding: float = 0.15     # Speech gate: seconds kept around the first/last speech frame
+    # Conditioning between resampling and VAD (DC blocker, high-pass, AGC, limiter)
+    audio_conditioning: bool = True
+    condition_dc_block: bool = True
+    condition_highpass_cutoff: float = 80.0     # Hz; removes desk/fan rumble, 0 disables
+    condition_agc: bool = False                 # Off by default: VAD silence_threshold assumes raw mic levels
+    condition_agc_target_rms: float = 0.05      # AGC: speech level fed to VAD and STT
+    condition_agc_max_gain_db: float = 20.0     # AGC: most boost given to a quiet talker
+    condition_limiter_threshold: float = 0.9    # Peak ceiling for model input; 0 disables
+    # Spectral noise suppression of VAD frames before segmentation (needs the VAD; adds one frame of latency)
+    noise_suppression: bool = False
+    noise_suppression_oversubtraction: float = 1.5  # Noise estimate multiplier: higher removes more, risks speech
+    noise_suppression_floor_db: float = -15.0       # Least gain per bin; deeper floors add musical noise
+
+    def get_local_cache_dir(self) -> Path:
+        """Root for files derived from models (quantized copies, unpacked artifacts)"""
+        if self.model_cache_dir:
+            return Path(self.model_cache_dir).expanduser()
+        return Path.home() / ".cache" / "personalparakeet"
 
     def get_stt_model_path(self) -> str:
         """Get the path to the STT model using importlib.resources."""
@@ -49,6 +107,16 @@ class VADConfig:
     silence_threshold: float = 0.01
     pause_threshold: float = 1.5  # seconds before pause is detected
     frame_duration: float = 0.03
+    # Detector: "energy" (fixed RMS silence_threshold) or "adaptive" (noise floor tracking
+    # with energy, zero-crossing rate and speech band ratio, plus attack/hangover smoothing)
+    mode: str = "energy"
+    snr_threshold_db: float = 9.0        # Adaptive: frame energy above the noise floor that counts as voiced
+    noise_rise_db_per_s: float = 3.0     # Adaptive: how fast the noise floor may climb (it drops instantly)
+    min_energy: float = 0.001            # Adaptive: RMS below this is never speech
+    min_band_ratio: float = 0.6          # Adaptive: share of frame energy inside the speech band
+    max_zero_crossing_rate: float = 0.35  # Adaptive: crossings per sample above this look like noise/clicks
+    attack_duration: float = 0.06        # Adaptive: voiced run needed to start (or extend) speech
+    hangover_duration: float = 0.3       # Adaptive: speech held after the last qualifying run
 
 
 @dataclass
@@ -151,12 +219,74 @@ class V3Config:
             self.audio.use_mock_stt = audio_data.get('use_mock_stt', self.audio.use_mock_stt)
             self.audio.stt_device = audio_data.get('stt_device', self.audio.stt_device)
             self.audio.stt_audio_threshold = audio_data.get('stt_audio_threshold', self.audio.stt_audio_threshold)
+            self.audio.stt_backend = audio_data.get('stt_backend', self.audio.stt_backend)
+            self.audio.stt_process_slots = audio_data.get('stt_process_slots', self.audio.stt_process_slots)
+            self.audio.stt_process_slot_duration = audio_data.get('stt_process_slot_duration', self.audio.stt_process_slot_duration)
+            self.audio.stt_process_timeout = audio_data.get('stt_process_timeout', self.audio.stt_process_timeout)
+            self.audio.stt_runtime = audio_data.get('stt_runtime', self.audio.stt_runtime)
+            self.audio.stt_onnx_model_path = audio_data.get('stt_onnx_model_path', self.audio.stt_onnx_model_path)
+            self.audio.stt_cpu_threads = audio_data.get('stt_cpu_threads', self.audio.stt_cpu_threads)
+            self.audio.stt_cpu_inter_op_threads = audio_data.get('stt_cpu_inter_op_threads', self.audio.stt_cpu_inter_op_threads)
+            self.audio.stt_cpu_quantization = audio_data.get('stt_cpu_quantization', self.audio.stt_cpu_quantization)
+            self.audio.stt_artifact_cache = audio_data.get('stt_artifact_cache', self.audio.stt_artifact_cache)
+            
+            # STT segmentation
+            self.audio.stt_segmentation_mode = audio_data.get('stt_segmentation_mode', self.audio.stt_segmentation_mode)
+            self.audio.stt_window_duration = audio_data.get('stt_window_duration', self.audio.stt_window_duration)
+            self.audio.stt_hop_duration = audio_data.get('stt_hop_duration', self.audio.stt_hop_duration)
+            self.audio.stt_left_context = audio_data.get('stt_left_context', self.audio.stt_left_context)
+            self.audio.stt_right_context = audio_data.get('stt_right_context', self.audio.stt_right_context)
+            self.audio.stt_min_segment_duration = audio_data.get('stt_min_segment_duration', self.audio.stt_min_segment_duration)
+            self.audio.stt_max_segment_duration = audio_data.get('stt_max_segment_duration', self.audio.stt_max_segment_duration)
+            self.audio.stt_endpoint_silence = audio_data.get('stt_endpoint_silence', self.audio.stt_endpoint_silence)
+            self.audio.stt_segment_padding = audio_data.get('stt_segment_padding', self.audio.stt_segment_padding)
+            self.audio.stt_partial_interval = audio_data.get('stt_partial_interval', self.audio.stt_partial_interval)
+            self.audio.stt_incremental_streaming = audio_data.get('stt_incremental_streaming', self.audio.stt_incremental_streaming)
+            self.audio.audio_source = audio_data.get('audio_source', self.audio.audio_source)
+            self.audio.audio_source_path = audio_data.get('audio_source_path', self.audio.audio_source_path)
+            self.audio.audio_source_realtime = audio_data.get('audio_source_realtime', self.audio.audio_source_realtime)
+            self.audio.stt_queue_size = audio_data.get('stt_queue_size', self.audio.stt_queue_size)
+            self.audio.stt_max_batch_size = audio_data.get('stt_max_batch_size', self.audio.stt_max_batch_size)
+            self.audio.stt_max_batch_wait = audio_data.get('stt_max_batch_wait', self.audio.stt_max_batch_wait)
+            self.audio.stt_warmup = audio_data.get('stt_warmup', self.audio.stt_warmup)
+            self.audio.stt_warmup_runs = audio_data.get('stt_warmup_runs', self.audio.stt_warmup_runs)
+            self.audio.stt_background_load = audio_data.get('stt_background_load', self.audio.stt_background_load)
+            self.audio.stt_startup_buffer_duration = audio_data.get('stt_startup_buffer_duration', self.audio.stt_startup_buffer_duration)
+            self.audio.backpressure_enabled = audio_data.get('backpressure_enabled', self.audio.backpressure_enabled)
+            self.audio.backpressure_merge_duration = audio_data.get('backpressure_merge_duration', self.audio.backpressure_merge_duration)
+            
+            # Speech gate
+            self.audio.stt_speech_gate = audio_data.get('stt_speech_gate', self.audio.stt_speech_gate)
+            self.audio.stt_min_speech_ratio = audio_data.get('stt_min_speech_ratio', self.audio.stt_min_speech_ratio)
+            self.audio.stt_trim_padding = audio_data.get('stt_trim_padding', self.audio.stt_trim_padding)
+            
+            # Conditioning (DC blocker, high-pass, AGC, limiter)
+            self.audio.audio_conditioning = audio_data.get('audio_conditioning', self.audio.audio_conditioning)
+            self.audio.condition_dc_block = audio_data.get('condition_dc_block', self.audio.condition_dc_block)
+            self.audio.condition_highpass_cutoff = audio_data.get('condition_highpass_cutoff', self.audio.condition_highpass_cutoff)
+            self.audio.condition_agc = audio_data.get('condition_agc', self.audio.condition_agc)
+            self.audio.condition_agc_target_rms = audio_data.get('condition_agc_target_rms', self.audio.condition_agc_target_rms)
+            self.audio.condition_agc_max_gain_db = audio_data.get('condition_agc_max_gain_db', self.audio.condition_agc_max_gain_db)
+            self.audio.condition_limiter_threshold = audio_data.get('condition_limiter_threshold', self.audio.condition_limiter_threshold)
+            
+            # Spectral noise suppression
+            self.audio.noise_suppression = audio_data.get('noise_suppression', self.audio.noise_suppression)
+            self.audio.noise_suppression_oversubtraction = audio_data.get('noise_suppression_oversubtraction', self.audio.noise_suppression_oversubtraction)
+            self.audio.noise_suppression_floor_db = audio_data.get('noise_suppression_floor_db', self.audio.noise_suppression_floor_db)
         
         # Update VAD config
         if 'vad' in data:
             vad_data = data['vad']
             self.vad.silence_threshold = vad_data.get('custom_threshold', self.vad.silence_threshold)
             self.vad.pause_threshold = vad_data.get('pause_duration_ms', 1500) / 1000.0  # Convert ms to s
+            self.vad.mode = vad_data.get('mode', self.vad.mode)
+            self.vad.snr_threshold_db = vad_data.get('snr_threshold_db', self.vad.snr_threshold_db)
+            self.vad.noise_rise_db_per_s = vad_data.get('noise_rise_db_per_s', self.vad.noise_rise_db_per_s)
+            self.vad.min_energy = vad_data.get('min_energy', self.vad.min_energy)
+            self.vad.min_band_ratio = vad_data.get('min_band_ratio', self.vad.min_band_ratio)
+            self.vad.max_zero_crossing_rate = vad_data.get('max_zero_crossing_rate', self.vad.max_zero_crossing_rate)
+            self.vad.attack_duration = vad_data.get('attack_duration', self.vad.attack_duration)
+            self.vad.hangover_duration = vad_data.get('hangover_duration', self.vad.hangover_duration)
         
         # Update clarity config
         if 'clarity' in data:
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Audio Block Pool - Single-producer/single-consumer capture queue for PersonalParakeet v3
+Replaces queue.Queue between the sounddevice callback and the consumer thread
+"""
+
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AudioBlockPool:
+    """
+    Preallocated pool of fixed-size float32 blocks shared by exactly one
+    producer (the realtime audio callback) and one consumer thread.
+
+    The producer copies each block into the next free slot and then publishes
+    it by advancing the write index; the consumer reads the slot in place and
+    recycles it by advancing the read index. Each index is only ever written by
+    one side, so no lock is shared between the two threads and the callback
+    never allocates audio buffers or blocks on the consumer.
+
+    Overflow (pool full) drops the incoming block and is only counted; the
+    consumer is responsible for reporting it at a sane rate.
+    """
+
+    def __init__(self, num_blocks: int, block_size: int, poll_interval: float = 0.005):
+        if num_blocks <= 0 or block_size <= 0:
+            raise ValueError("AudioBlockPool needs a positive block count and block size")
+
+        self.num_blocks = int(num_blocks)
+        self.block_size = int(block_size)
+        self.poll_interval = poll_interval
+
+        self._blocks = np.zeros((self.num_blocks, self.block_size), dtype=np.float32)
+        self._lengths = [0] * self.num_blocks
+
+        # Monotonic indices: _write_index is owned by the producer, _read_index by the consumer
+        self._write_index = 0
+        self._read_index = 0
+
+        # Producer-side counters (read by the consumer for metrics only)
+        self.blocks_written = 0
+        self.overflow_count = 0
+        self.truncated_count = 0  # Blocks longer than block_size (tail was dropped)
+
+    # Producer side (realtime callback)
+
+    def write(self, samples: np.ndarray) -> bool:
+        """
+        Copy a block into the pool without allocating
+
+        Returns:
+            False if the pool was full and the block was dropped
+        """
+        write_index = self._write_index
+        if write_index - self._read_index >= self.num_blocks:
+            self.overflow_count += 1
+            return False
+
+        n = len(samples)
+        if n > self.block_size:
+            self.truncated_count += 1
+            n = self.block_size
+
+        slot = write_index % self.num_blocks
+        np.copyto(self._blocks[slot, :n], samples[:n], casting='same_kind')
+        self._lengths[slot] = n
+
+        # Publish only after the data is in place
+        self._write_index = write_index + 1
+        self.blocks_written += 1
+        return True
+
+    # Consumer side
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Wait for the next block and return a view into its slot
+
+        The view stays valid until release() is called. Returns None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._write_index == self._read_index:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+        slot = self._read_index % self.num_blocks
+        return self._blocks[slot, :self._lengths[slot]]
+
+    def release(self):
+        """Return the block obtained from get() to the producer"""
+        if self._read_index < self._write_index:
+            self._read_index += 1
+
+    def clear(self):
+        """Discard all pending blocks (consumer side)"""
+        self._read_index = self._write_index
+
+    def qsize(self) -> int:
+        """Number of blocks waiting for the consumer"""
+        return self._write_index - self._read_index
+
+    def has_space(self) -> bool:
+        """True if the producer can write without overflowing"""
+        return self.qsize() < self.num_blocks
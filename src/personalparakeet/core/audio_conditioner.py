@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Audio Conditioner - Streaming cleanup between resampling and VAD
+DC blocker, high-pass, slow AGC and peak limiter at the model sample rate
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import signal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConditionerConfig:
+    """Audio conditioning chain configuration (each stage can be turned off)"""
+    sample_rate: int = 16000
+    dc_block: bool = True
+    dc_pole: float = 0.995                # DC blocker pole: ~13 Hz corner at 16 kHz
+    highpass_cutoff: float = 80.0         # Hz, 2nd order Butterworth; 0 disables
+    agc: bool = False
+    agc_target_rms: float = 0.05          # Level speech is steered towards (about -26 dBFS)
+    agc_min_level: float = 0.01           # Blocks quieter than this hold the gain (no boosting room noise)
+    agc_max_gain_db: float = 20.0
+    agc_min_gain_db: float = -10.0
+    agc_rate_db_per_s: float = 6.0        # Max gain change: slow enough not to pump within words
+    agc_block_duration: float = 0.02      # Gain is updated once per block on the stream clock
+    limiter_threshold: float = 0.9        # Peak ceiling; 0 disables
+    limiter_release_db_per_s: float = 120.0
+
+
+class AudioConditioner:
+    """
+    Streaming audio conditioning chain
+
+    The DC blocker and high-pass are one cascade of second-order sections run
+    with scipy's sosfilt, carrying the filter state across chunks. The AGC
+    measures fixed blocks on the stream clock (partial blocks carry over) and
+    moves its gain by a bounded step per block, only on blocks loud enough to
+    be speech. The limiter reduces gain instantly on peaks above the threshold
+    and releases at a fixed dB rate, computed for a whole chunk with a running
+    minimum. Output depends only on the stream, not on how it is chunked, and
+    has the same length as the input (no lookahead).
+
+    Not thread-safe: owned by the audio consumer thread.
+    """
+
+    def __init__(self, config: ConditionerConfig):
+        self.config = config
+        self.sample_rate = config.sample_rate
+
+        sections = []
+        if config.dc_block:
+            # y[n] = x[n] - x[n-1] + pole * y[n-1]
+            sections.append([1.0, -1.0, 0.0, 1.0, -config.dc_pole, 0.0])
+        if config.highpass_cutoff > 0:
+            sections.extend(signal.butter(2, config.highpass_cutoff, btype='highpass',
+                                          fs=self.sample_rate, output='sos'))
+        self.sos = np.array(sections, dtype=np.float64).reshape(-1, 6)
+
+        self.agc_block_size = max(1, int(config.agc_block_duration * self.sample_rate))
+        self.agc_step_db = config.agc_rate_db_per_s * self.agc_block_size / self.sample_rate
+        self.limiter_release_db = config.limiter_release_db_per_s / self.sample_rate
+
+        self.reset()
+        logger.info(f"AudioConditioner initialized: {len(self.sos)} filter sections, "
+                    f"AGC {'on' if config.agc else 'off'}, limiter at {config.limiter_threshold}")
+
+    def reset(self):
+        """Clear filter, AGC and limiter state for a new stream"""
+        self._zi = np.zeros((len(self.sos), 2))
+        self.agc_gain_db = 0.0
+        self._block_fill = 0
+        self._block_energy = 0.0
+        self.limiter_gain_db = 0.0
+
+        # Metrics
+        self.samples_processed = 0
+        self.samples_limited = 0
+        self.max_gain_reduction_db = 0.0
+
+    @property
+    def is_active(self) -> bool:
+        config = self.config
+        return len(self.sos) > 0 or config.agc or config.limiter_threshold > 0
+
+    def process(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """
+        Condition the next chunk of the stream
+
+        Args:
+            audio_chunk: Mono float audio at the configured sample rate
+
+        Returns:
+            Conditioned float32 audio of the same length
+        """
+        if len(audio_chunk) == 0:
+            return audio_chunk.astype(np.float32, copy=False)
+
+        audio = np.asarray(audio_chunk, dtype=np.float64)
+        if len(self.sos):
+            audio, self._zi = signal.sosfilt(self.sos, audio, zi=self._zi)
+        if self.config.agc:
+            audio = audio * self._agc_gains(audio)
+        if self.config.limiter_threshold > 0:
+            audio = self._limit(audio)
+
+        self.samples_processed += len(audio)
+        return audio.astype(np.float32)
+
+    def _agc_gains(self, audio: np.ndarray) -> np.ndarray:
+        """Per-sample linear AGC gain: constant within a block, updated at block ends"""
+        config = self.config
+        block = self.agc_block_size
+        n = len(audio)
+        ends = np.arange(block - self._block_fill, n + 1, block)
+        energy = np.concatenate(([0.0], np.cumsum(audio * audio)))
+        if not len(ends):
+            self._block_fill += n
+            self._block_energy += energy[-1]
+            return np.full(n, 10 ** (self.agc_gain_db / 20))
+
+        block_energies = np.diff(energy[ends], prepend=0.0)
+        block_energies[0] += self._block_energy
+        block_rms = np.sqrt(block_energies / block)
+
+        # Gain in force before each completed block, then after the last one
+        gains_db = np.empty(len(ends) + 1)
+        gains_db[0] = gain_db = self.agc_gain_db
+        for i, rms in enumerate(block_rms):
+            if rms >= config.agc_min_level:
+                desired = np.clip(20 * np.log10(config.agc_target_rms / rms),
+                                  config.agc_min_gain_db, config.agc_max_gain_db)
+                gain_db += np.clip(desired - gain_db, -self.agc_step_db, self.agc_step_db)
+            gains_db[i + 1] = gain_db
+
+        self.agc_gain_db = float(gain_db)
+        self._block_fill = n - ends[-1]
+        self._block_energy = float(energy[n] - energy[ends[-1]])
+        lengths = np.diff(ends, prepend=0, append=n)
+        return np.repeat(10 ** (gains_db / 20), lengths)
+
+    def _limit(self, audio: np.ndarray) -> np.ndarray:
+        """Instant-attack peak limiter with a linear-in-dB release"""
+        threshold = self.config.limiter_threshold
+        magnitude = np.abs(audio)
+        over = magnitude > threshold
+        if self.limiter_gain_db >= 0.0 and not over.any():
+            return audio
+
+        # gain[n] = min(0, required[n], gain[n-1] + release), unrolled into a running minimum
+        required = np.zeros(len(audio))
+        required[over] = 20 * np.log10(threshold / magnitude[over])
+        ramp = self.limiter_release_db * np.arange(len(audio))
+        start = self.limiter_gain_db + self.limiter_release_db
+        gain_db = np.minimum(np.minimum.accumulate(np.minimum(required - ramp, start)) + ramp, 0.0)
+
+        self.limiter_gain_db = float(gain_db[-1])
+        self.samples_limited += int(np.count_nonzero(gain_db < 0))
+        self.max_gain_reduction_db = max(self.max_gain_reduction_db, float(-gain_db.min()))
+        return audio * 10 ** (gain_db / 20)
+
+    def get_metrics(self) -> dict:
+        """Current AGC gain and how much audio the limiter touched"""
+        return {
+            'agc_gain_db': self.agc_gain_db,
+            'limited_fraction': self.samples_limited / self.samples_processed if self.samples_processed else 0.0,
+            'max_gain_reduction_db': self.max_gain_reduction_db,
+        }
+
+
+def create_conditioner(audio_config, sample_rate: int) -> AudioConditioner:
+    """Build the conditioning chain described by an AudioConfig"""
+    return AudioConditioner(ConditionerConfig(
+        sample_rate=sample_rate,
+        dc_block=audio_config.condition_dc_block,
+        highpass_cutoff=audio_config.condition_highpass_cutoff,
+        agc=audio_config.condition_agc,
+        agc_target_rms=audio_config.condition_agc_target_rms,
+        agc_max_gain_db=audio_config.condition_agc_max_gain_db,
+        limiter_threshold=audio_config.condition_limiter_threshold,
+    ))
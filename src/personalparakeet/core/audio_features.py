@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Audio Features - Per-frame level measurements computed once per chunk
+RMS, peak and clipping are measured in the VAD's single pass over each
+chunk and reused by segmentation, STT gating and the UI meter
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .audio_ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+CLIP_LEVEL = 0.999  # |sample| at or above this counts as clipped (float audio is +-1.0 full scale)
+
+
+@dataclass
+class AudioFeatures:
+    """Level measurements for consecutive fixed-size frames"""
+    frame_size: int
+    frame_energies: np.ndarray  # RMS per frame
+    frame_peaks: np.ndarray     # max |sample| per frame
+    frame_clipped: np.ndarray   # Samples at or above CLIP_LEVEL per frame
+
+    @classmethod
+    def from_frames(cls, frames: np.ndarray, clip_level: float = CLIP_LEVEL) -> 'AudioFeatures':
+        """Measure a (num_frames, frame_size) block in one vectorized pass"""
+        magnitude = np.abs(frames)
+        return cls(
+            frame_size=frames.shape[1],
+            frame_energies=np.sqrt(np.einsum('ij,ij->i', frames, frames) / frames.shape[1]),
+            frame_peaks=magnitude.max(axis=1),
+            frame_clipped=np.count_nonzero(magnitude >= clip_level, axis=1),
+        )
+
+    @classmethod
+    def from_audio(cls, audio: np.ndarray, frame_size: int) -> 'AudioFeatures':
+        """Measure audio that isn't frame aligned (the last frame may be short)"""
+        frame_size = max(1, int(frame_size))
+        whole = len(audio) // frame_size * frame_size
+        parts = [cls.from_frames(audio[:whole].reshape(-1, frame_size))]
+        if whole < len(audio):
+            parts.append(cls.from_frames(audio[whole:].reshape(1, -1)))
+        return cls.concatenate(parts, frame_size)
+
+    @classmethod
+    def concatenate(cls, parts: List['AudioFeatures'], frame_size: Optional[int] = None) -> 'AudioFeatures':
+        return cls(
+            frame_size=frame_size if frame_size is not None else parts[0].frame_size,
+            frame_energies=np.concatenate([p.frame_energies for p in parts]),
+            frame_peaks=np.concatenate([p.frame_peaks for p in parts]),
+            frame_clipped=np.concatenate([p.frame_clipped for p in parts]),
+        )
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.frame_energies)
+
+    @property
+    def rms(self) -> float:
+        if not self.num_frames:
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(self.frame_energies, dtype=np.float64))))
+
+    @property
+    def peak(self) -> float:
+        return float(self.frame_peaks.max()) if self.num_frames else 0.0
+
+    @property
+    def clipped_samples(self) -> int:
+        return int(self.frame_clipped.sum())
+
+    @property
+    def rms_db(self) -> float:
+        return float(20 * np.log10(self.rms + 1e-10))
+
+    @property
+    def peak_db(self) -> float:
+        return float(20 * np.log10(self.peak + 1e-10))
+
+    def slice(self, first: int, last: int) -> 'AudioFeatures':
+        """Features of frames [first, last)"""
+        return AudioFeatures(self.frame_size, self.frame_energies[first:last],
+                             self.frame_peaks[first:last], self.frame_clipped[first:last])
+
+
+class FrameHistory:
+    """
+    Recent per-frame VAD flags and features on the model-rate sample clock
+
+    Filled by the audio consumer as chunks pass the VAD; segments look up the
+    frames they cover instead of measuring their audio again. Frames partly
+    inside a segment count as a whole, so segment peaks and ratios are exact
+    to one frame at each edge.
+
+    Not thread-safe: owned by the audio consumer thread.
+    """
+
+    def __init__(self, sample_rate: int, frame_size: int, history_duration: float = 60.0):
+        self.sample_rate = sample_rate
+        self.frame_size = max(1, int(frame_size))
+        capacity = max(1, int(history_duration * sample_rate / self.frame_size))
+        self.flags = AudioRingBuffer(capacity, dtype=bool)
+        self.energies = AudioRingBuffer(capacity, dtype=np.float32)
+        self.peaks = AudioRingBuffer(capacity, dtype=np.float32)
+        self.clipped = AudioRingBuffer(capacity, dtype=np.int32)
+
+    def record(self, speech_flags: np.ndarray, features: AudioFeatures):
+        """Append the next frames of the stream"""
+        self.flags.write(np.asarray(speech_flags, dtype=bool))
+        self.energies.write(features.frame_energies)
+        self.peaks.write(features.frame_peaks)
+        self.clipped.write(features.frame_clipped)
+
+    def frame_range(self, start_sample: int, end_sample: int) -> Tuple[int, int]:
+        """Frames [first, last) overlapping samples [start_sample, end_sample)"""
+        return start_sample // self.frame_size, math.ceil(end_sample / self.frame_size)
+
+    def lookup(self, start_sample: int, end_sample: int) -> Optional[Tuple[np.ndarray, AudioFeatures]]:
+        """Flags and features covering a sample range, or None if not fully recorded"""
+        first, last = self.frame_range(start_sample, end_sample)
+        if last <= first or first < self.flags.start_index or last > self.flags.total_written:
+            return None
+        a, b = first - self.flags.start_index, last - self.flags.start_index
+        # Features outlive the rings (segments wait for STT on another thread)
+        features = AudioFeatures(self.frame_size, self.energies.peek()[a:b].copy(),
+                                 self.peaks.peek()[a:b].copy(), self.clipped.peek()[a:b].copy())
+        return self.flags.peek()[a:b], features
@@ -7,11 +7,21 @@ Handles efficient CPU-based resampling from capture rate to model rate
 import numpy as np
 from scipy import signal
 import logging
+from functools import lru_cache
+from math import gcd
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Filter half-length in zero crossings of the anti-aliasing sinc per quality
+# (scipy.signal.resample_poly uses 10)
+QUALITY_ZERO_CROSSINGS = {
+    "fast": 4,
+    "balanced": 8,
+    "high": 16,
+}
+
 
 @dataclass
 class ResamplerConfig:
@@ -22,112 +32,195 @@ class ResamplerConfig:
     chunk_size: Optional[int] = None
 
 
+@dataclass(frozen=True, eq=False)
+class PolyphaseFilterBank:
+    """Anti-aliasing FIR for one up/down ratio, split into polyphase branches"""
+    up: int
+    down: int
+    quality: str
+    filter: np.ndarray         # Prototype lowpass at input_rate * up
+    half_len: int
+    taps_per_phase: int
+    phases: np.ndarray         # phases[p, k] = up * filter[p + k * up]
+    phases_by_tap: np.ndarray  # phases.T, one contiguous row per tap
+
+
+@lru_cache(maxsize=None)
+def get_filter_bank(up: int, down: int, quality: str = "high") -> PolyphaseFilterBank:
+    """
+    Design (once per process) the filter bank for a reduced up/down ratio
+
+    Banks are shared by every resampler with the same ratio and quality, so
+    their arrays are read-only.
+    """
+    zero_crossings = QUALITY_ZERO_CROSSINGS.get(quality, QUALITY_ZERO_CROSSINGS["high"])
+    max_rate = max(up, down)
+    half_len = zero_crossings * max_rate
+    filter_length = 2 * half_len + 1
+
+    # Lowpass at the lower Nyquist, designed at the upsampled rate (as resample_poly)
+    h = signal.firwin(filter_length, 1.0 / max_rate, window=('kaiser', 5.0))
+
+    # phases[p, k] = up * h[p + k * up]: taps applied to x[base - k]
+    taps_per_phase = -(-filter_length // up)
+    padded = np.zeros(taps_per_phase * up)
+    padded[:filter_length] = h * up
+    phases = padded.reshape(taps_per_phase, up).T.copy()
+    phases_by_tap = phases.T.copy()
+    for array in (h, phases, phases_by_tap):
+        array.flags.writeable = False
+
+    logger.debug(f"Designed {quality} polyphase filter bank {up}/{down}: "
+                 f"{filter_length} taps, {taps_per_phase} per phase")
+    return PolyphaseFilterBank(up, down, quality, h, half_len, taps_per_phase, phases, phases_by_tap)
+
+
 class AudioResampler:
-    """Efficient audio resampler using polyphase filtering"""
-    
+    """
+    Streaming polyphase resampler for any rational rate ratio
+
+    The anti-aliasing FIR runs at input_rate * up and is split into `up`
+    phase filters. Output sample n is computed from absolute stream positions
+    only (phase and input history are carried across calls), accumulating the
+    taps in a fixed order, so the output is bit-identical however the input
+    is split into chunks. Output is aligned like scipy.signal.resample_poly:
+    each call returns every sample whose filter support has arrived, which
+    leaves a lookahead of about half a filter (well under a millisecond of
+    input) buffered until the next call or flush().
+    """
+
     def __init__(self, config: ResamplerConfig):
         self.config = config
         self.input_rate = config.input_rate
         self.output_rate = config.output_rate
-        
+
         # Calculate resampling ratio
         self.ratio = self.output_rate / self.input_rate
-        
-        # For 44100 -> 16000, we can use ratio 160/441 for exact conversion
-        if self.input_rate == 44100 and self.output_rate == 16000:
-            self.up = 160
-            self.down = 441
-            logger.info(f"Using exact ratio {self.up}/{self.down} for 44.1k->16k conversion")
-        else:
-            # Find reasonable up/down factors
-            from math import gcd
-            g = gcd(self.input_rate, self.output_rate)
-            self.up = self.output_rate // g
-            self.down = self.input_rate // g
-            logger.info(f"Resampling ratio: {self.up}/{self.down} ({self.ratio:.4f})")
-        
-        # Buffer for maintaining continuity between chunks
-        self.buffer = np.array([], dtype=np.float32)
-        
+
+        # Exact rational ratio, e.g. 160/441 for 44.1k -> 16k
+        g = gcd(self.input_rate, self.output_rate)
+        self.up = self.output_rate // g
+        self.down = self.input_rate // g
+        logger.info(f"Resampling ratio: {self.up}/{self.down} ({self.ratio:.4f})")
+
         # Pre-design filter based on quality setting
         self._design_filter()
-        
+
+        # Stream state: input history and absolute sample positions
+        self.reset()
+
         logger.info(f"AudioResampler initialized: {self.input_rate}Hz -> {self.output_rate}Hz")
-    
+
     def _design_filter(self):
-        """Design anti-aliasing filter based on quality setting"""
-        if self.config.quality == "fast":
-            # Simple decimation, lower quality but fast
-            self.filter_length = 64
-        elif self.config.quality == "balanced":
-            # Good quality/performance trade-off
-            self.filter_length = 128
-        else:  # "high"
-            # Best quality, slightly more CPU
-            self.filter_length = 256
-        
-        # Design lowpass filter
-        cutoff = min(self.input_rate, self.output_rate) / 2.0
-        nyquist = self.input_rate / 2.0
-        self.filter = signal.firwin(
-            self.filter_length,
-            cutoff / nyquist,
-            window='hamming'
-        )
-        
+        """Look up the anti-aliasing filter bank (designed once per ratio and quality)"""
+        if self.up == self.down:
+            self.filter_bank = None  # Same rate: audio passes through
+            self.filter = None
+            self.filter_length = self.half_len = self.taps_per_phase = 0
+            self.phases = self.phases_by_tap = None
+            return
+        quality = self.config.quality if self.config.quality in QUALITY_ZERO_CROSSINGS else "high"
+        self.filter_bank = get_filter_bank(self.up, self.down, quality)
+        self.filter = self.filter_bank.filter
+        self.filter_length = len(self.filter)
+        self.half_len = self.filter_bank.half_len
+        self.taps_per_phase = self.filter_bank.taps_per_phase
+        self.phases = self.filter_bank.phases
+        self.phases_by_tap = self.filter_bank.phases_by_tap
+
     def resample_chunk(self, audio_chunk: np.ndarray) -> np.ndarray:
         """
         Resample a chunk of audio while maintaining continuity
-        
+
         Args:
             audio_chunk: Input audio at capture_sample_rate
-            
+
         Returns:
-            Resampled audio at model_sample_rate
+            Resampled audio at model_sample_rate (every sample computable so far)
         """
         if len(audio_chunk) == 0:
             return np.array([], dtype=np.float32)
-        
-        # Ensure float32
-        if audio_chunk.dtype != np.float32:
-            audio_chunk = audio_chunk.astype(np.float32)
-        
-        # For exact ratio (44.1k -> 16k), use resample_poly
-        if self.up == 160 and self.down == 441:
-            try:
-                # Concatenate with buffer for continuity
-                if len(self.buffer) > 0:
-                    audio_chunk = np.concatenate([self.buffer, audio_chunk])
-                    self.buffer = np.array([], dtype=np.float32)
-                
-                # Resample using polyphase method
-                resampled = signal.resample_poly(
-                    audio_chunk, 
-                    self.up, 
-                    self.down,
-                    window=self.filter
-                )
-                
-                return resampled.astype(np.float32)
-                
-            except Exception as e:
-                logger.error(f"Resampling error: {e}")
-                # Fallback to simple decimation
-                indices = np.round(np.arange(0, len(audio_chunk), 1/self.ratio)).astype(int)
-                indices = indices[indices < len(audio_chunk)]
-                return audio_chunk[indices]
-        
+
+        if self.up == self.down:
+            # Same rate: nothing to filter
+            return np.array(audio_chunk, dtype=np.float32)
+
+        self._history = np.concatenate([self._history, np.asarray(audio_chunk, dtype=np.float32)])
+        self._input_count += len(audio_chunk)
+        return self._produce(self._input_count)
+
+    def flush(self) -> np.ndarray:
+        """Emit the buffered tail at end of stream (input beyond the end is zero)"""
+        total_out = -(-self._input_count * self.up // self.down)
+        if self._next_output >= total_out:
+            return np.array([], dtype=np.float32)
+        last_base = ((total_out - 1) * self.down + self.half_len) // self.up
+        pad = max(0, last_base + 1 - (self._history_start + len(self._history)))
+        self._history = np.concatenate([self._history, np.zeros(pad, dtype=np.float32)])
+        return self._produce(last_base + 1, limit=total_out)
+
+    def _produce(self, available: int, limit: Optional[int] = None) -> np.ndarray:
+        """Compute all outputs whose newest input index is below `available`"""
+        # Output n needs input up to base(n) = (n * down + half_len) // up
+        end = (available * self.up - self.half_len - 1) // self.down + 1
+        if limit is not None:
+            end = min(end, limit)
+        start = self._next_output
+        if end <= start:
+            return np.array([], dtype=np.float32)
+
+        x = self._history
+        acc = np.zeros(end - start, dtype=np.float64)
+        first_base = (start * self.down + self.half_len) // self.up - self._history_start
+
+        if self.up == 1 and first_base >= self.taps_per_phase - 1:
+            # Integer decimation: a single phase, so each tap is a scalar times a
+            # strided view (no index gathers). Same per-sample arithmetic as below.
+            stop = first_base + (end - start - 1) * self.down + 1
+            taps = self.phases_by_tap[:, 0]
+            for k in range(self.taps_per_phase):
+                acc += taps[k] * x[first_base - k:stop - k:self.down]
+            self._next_output = end
+            self._trim_history()
+            return acc.astype(np.float32)
+
+        t = np.arange(start, end, dtype=np.int64) * self.down + self.half_len
+        phase = t % self.up
+        # Relative to the history buffer, which starts at absolute index _history_start
+        base = t // self.up - self._history_start
+
+        coefs = self.phases_by_tap[:, phase]  # (taps, outputs), one contiguous row per tap
+        if base[0] >= self.taps_per_phase - 1:
+            for k in range(self.taps_per_phase):
+                acc += coefs[k] * x[base - k]
         else:
-            # General case resampling
-            target_length = int(len(audio_chunk) * self.ratio)
-            resampled = signal.resample(audio_chunk, target_length)
-            return resampled.astype(np.float32)
-    
+            # Stream start: input before sample 0 is zero
+            for k in range(self.taps_per_phase):
+                idx = base - k
+                valid = idx >= 0
+                acc[valid] += coefs[k, valid] * x[idx[valid]]
+
+        self._next_output = end
+        self._trim_history()
+        return acc.astype(np.float32)
+
+    def _trim_history(self):
+        """Keep only the input the next output's filter can still reach"""
+        next_base = (self._next_output * self.down + self.half_len) // self.up
+        keep_from = max(self._history_start, next_base - self.taps_per_phase + 1)
+        drop = min(keep_from - self._history_start, len(self._history))
+        if drop > 0:
+            self._history = self._history[drop:]
+            self._history_start += drop
+
     def get_output_size(self, input_size: int) -> int:
         """Calculate output size for a given input size"""
         return int(input_size * self.ratio)
-    
+
     def reset(self):
         """Reset internal buffers"""
-        self.buffer = np.array([], dtype=np.float32)
-        logger.debug("Resampler buffers reset")
\ No newline at end of file
+        self._history = np.array([], dtype=np.float32)
+        self._history_start = 0  # Absolute input index of _history[0]
+        self._input_count = 0
+        self._next_output = 0
+        logger.debug("Resampler buffers reset")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Audio Ring Buffer - Fixed-capacity float32 circular buffer for PersonalParakeet v3
+Replaces the Python list STT buffer with a preallocated NumPy array
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity circular audio buffer backed by a single NumPy array
+
+    The storage is mirrored: every sample is written twice, once at its ring
+    position and once at ring position + capacity. Any run of up to `capacity`
+    consecutive samples is therefore contiguous in memory, so reads hand out
+    zero-copy views instead of concatenating the two halves of a wrapped ring.
+
+    Views returned by peek()/read()/latest() alias the internal storage and are
+    only valid until the next write(). Callers that keep audio beyond that
+    point (e.g. hand it to another thread) must copy it.
+
+    Not thread-safe: the buffer is meant to be owned by a single consumer thread.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        if capacity <= 0:
+            raise ValueError("AudioRingBuffer capacity must be positive")
+
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self._storage = np.zeros(2 * self.capacity, dtype=self.dtype)
+
+        # Read position (0 <= _read_pos < capacity) and number of valid samples
+        self._read_pos = 0
+        self._size = 0
+
+        # Monotonic counters (absolute sample indices since creation)
+        self.total_written = 0
+        self.total_consumed = 0
+        self.overflow_samples = 0  # Oldest samples dropped because the ring was full
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def free_space(self) -> int:
+        """Number of samples that can be written without dropping audio"""
+        return self.capacity - self._size
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Append samples, dropping the oldest audio if the ring is full
+
+        Args:
+            samples: 1D audio array (converted to the buffer dtype on copy)
+
+        Returns:
+            Number of old samples dropped to make room
+        """
+        n = len(samples)
+        if n == 0:
+            return 0
+
+        # Only the newest `capacity` samples can ever be retained
+        if n > self.capacity:
+            skipped = n - self.capacity
+            samples = samples[skipped:]
+            self.total_written += skipped
+            self.total_consumed += skipped
+            self.overflow_samples += skipped
+            n = self.capacity
+        else:
+            skipped = 0
+
+        dropped = max(0, self._size + n - self.capacity)
+        if dropped:
+            self._advance(dropped)
+            self.overflow_samples += dropped
+
+        cap = self.capacity
+        write_pos = (self._read_pos + self._size) % cap
+        first = min(n, cap - write_pos)
+
+        # Primary copy plus its mirror (write_pos + cap never exceeds 2 * cap)
+        self._storage[write_pos:write_pos + first] = samples[:first]
+        self._storage[write_pos + cap:write_pos + cap + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            self._storage[:rest] = samples[first:]
+            self._storage[cap:cap + rest] = samples[first:]
+
+        self._size += n
+        self.total_written += n
+        return dropped + skipped
+
+    def peek(self, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the oldest `n` samples (all samples if n is None)"""
+        n = self._size if n is None else min(int(n), self._size)
+        return self._storage[self._read_pos:self._read_pos + n]
+
+    def latest(self, n: int) -> np.ndarray:
+        """Zero-copy view of the newest `n` samples"""
+        n = min(int(n), self._size)
+        end = self._read_pos + self._size
+        return self._storage[end - n:end]
+
+    def consume(self, n: int) -> int:
+        """Discard the oldest `n` samples and return how many were discarded"""
+        n = max(0, min(int(n), self._size))
+        self._advance(n)
+        return n
+
+    def read(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a view of the oldest `n` samples and mark them consumed"""
+        view = self.peek(n)
+        self._advance(len(view))
+        return view
+
+    def clear(self):
+        """Drop all buffered samples (storage stays allocated)"""
+        self.total_consumed += self._size
+        self._read_pos = 0
+        self._size = 0
+
+    def skip(self, n: int):
+        """Drop all buffered samples and advance the sample clock past `n` unbuffered ones"""
+        self.clear()
+        self.total_written += n
+        self.total_consumed += n
+
+    @property
+    def start_index(self) -> int:
+        """Absolute index of the oldest buffered sample"""
+        return self.total_written - self._size
+
+    def _advance(self, n: int):
+        self._read_pos = (self._read_pos + n) % self.capacity
+        self._size -= n
+        self.total_consumed += n
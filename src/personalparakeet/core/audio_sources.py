@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Audio Sources - Pluggable capture inputs for AudioEngine
+Live sounddevice capture, WAV/FLAC file replay and a synthetic speech generator
+all feed the engine through the same sounddevice-style callback
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from personalparakeet.config import AudioConfig
+from personalparakeet.utils.dependency_validation import get_validator
+
+# Check dependencies on initialization
+_validator = get_validator()
+AUDIO_DEPS_AVAILABLE = _validator.check_audio_dependencies()
+SOUNDDDEVICE_AVAILABLE = AUDIO_DEPS_AVAILABLE.get("sounddevice", False)
+
+# Optional imports for hardware dependencies
+if SOUNDDDEVICE_AVAILABLE:
+    import sounddevice as sd
+else:
+    sd = None
+
+logger = logging.getLogger(__name__)
+
+# callback(indata[frames, channels], frames, time_info, status) - same as sounddevice
+AudioCallback = Callable[[np.ndarray, int, Optional[dict], Optional[str]], None]
+
+
+def open_audio_blocks(path: Path, block_duration: float) -> Tuple[int, Iterator[np.ndarray]]:
+    """
+    Open an audio file for chunked reading
+
+    WAV/FLAC are read block by block through soundfile when it is installed.
+    Without soundfile, WAV files are memory-mapped with scipy and converted one
+    block at a time, so neither path loads the whole recording into memory.
+
+    Returns:
+        (sample_rate, iterator of mono float32 blocks)
+    """
+    path = Path(path)
+    try:
+        import soundfile as sf
+    except ImportError:
+        sf = None
+
+    if sf is not None:
+        info = sf.info(str(path))
+        blocksize = max(1, int(block_duration * info.samplerate))
+
+        def soundfile_blocks():
+            for block in sf.blocks(str(path), blocksize=blocksize, dtype='float32', always_2d=True):
+                yield block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+
+        return info.samplerate, soundfile_blocks()
+
+    if path.suffix.lower() != ".wav":
+        raise RuntimeError(f"Reading {path.suffix} files requires soundfile: pip install soundfile")
+
+    from scipy.io import wavfile
+    sample_rate, data = wavfile.read(str(path), mmap=True)
+    blocksize = max(1, int(block_duration * sample_rate))
+    if np.issubdtype(data.dtype, np.integer):
+        scale = 1.0 / float(np.iinfo(data.dtype).max + 1)
+    else:
+        scale = 1.0
+
+    def wav_blocks():
+        for start in range(0, len(data), blocksize):
+            block = np.asarray(data[start:start + blocksize], dtype=np.float32)
+            if block.ndim > 1:
+                block = block.mean(axis=1, dtype=np.float32)
+            if scale != 1.0:
+                block *= scale
+            yield block
+
+    return sample_rate, wav_blocks()
+
+
+def generate_speech_like_audio(duration: float, sample_rate: int = 16000,
+                               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Harmonic tone with a wandering pitch and attack/release envelope (test fixture signal)"""
+    rng = rng or np.random.default_rng()
+    n = int(sample_rate * duration)
+    t = np.arange(n) / sample_rate
+
+    # Varying pitch fundamental plus two harmonics
+    base = 150 + 50 * np.sin(2 * np.pi * 0.5 * t)
+    audio = np.sin(2 * np.pi * base * t)
+    audio += 0.5 * np.sin(2 * np.pi * base * 2 * t)
+    audio += 0.3 * np.sin(2 * np.pi * base * 3 * t)
+
+    ramp = min(int(0.1 * sample_rate), n // 2)
+    envelope = np.ones(n)
+    if ramp:
+        envelope[:ramp] = np.linspace(0, 1, ramp)
+        envelope[n - ramp:] = np.linspace(1, 0, ramp)
+
+    audio = audio * envelope / 1.8 + 0.05 * rng.standard_normal(n)
+    return audio.astype(np.float32)
+
+
+class AudioSource:
+    """
+    Base class for AudioEngine inputs
+
+    A source delivers float32 blocks of `blocksize` frames at `sample_rate`
+    to a sounddevice-style callback until stopped or exhausted.
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int):
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+
+    def start(self, callback: AudioCallback, has_space: Optional[Callable[[], bool]] = None):
+        """
+        Begin delivering blocks
+
+        Args:
+            callback: Receives each block like a sounddevice InputStream callback
+            has_space: Consumer backpressure probe; non-realtime sources wait on it
+                instead of overflowing the engine. Live capture ignores it.
+        """
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+    @property
+    def is_active(self) -> bool:
+        raise NotImplementedError
+
+
+class SoundDeviceSource(AudioSource):
+    """Live microphone capture through sounddevice"""
+
+    def __init__(self, sample_rate: int, blocksize: int, device: Optional[int] = None):
+        super().__init__(sample_rate, blocksize)
+        self.device = device
+        self.stream = None
+
+    def start(self, callback: AudioCallback, has_space: Optional[Callable[[], bool]] = None):
+        if not SOUNDDDEVICE_AVAILABLE:
+            raise RuntimeError("sounddevice library not available. Install with: pip install sounddevice")
+
+        self.stream = sd.InputStream(
+            device=self.device,
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=np.float32,
+            callback=callback,
+            blocksize=self.blocksize
+        )
+        self.stream.start()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.stream is not None and self.stream.active
+
+
+class _ThreadedSource(AudioSource):
+    """Delivers generated blocks from a background thread, paced or as fast as possible"""
+
+    def __init__(self, sample_rate: int, blocksize: int, realtime: bool = True):
+        super().__init__(sample_rate, blocksize)
+        self.realtime = realtime
+        self.finished = threading.Event()  # Set once the source runs out of audio
+        self.blocks_delivered = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, callback: AudioCallback, has_space: Optional[Callable[[], bool]] = None):
+        self._stop_event.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback, has_space), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    @property
+    def is_active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        raise NotImplementedError
+
+    def _run(self, callback: AudioCallback, has_space: Optional[Callable[[], bool]]):
+        start_time = time.monotonic()
+        frames_sent = 0
+        try:
+            for block in self._blocks():
+                if self._stop_event.is_set():
+                    return
+                if self.realtime:
+                    # Pace delivery against the sample clock, like a sound card would
+                    delay = start_time + frames_sent / self.sample_rate - time.monotonic()
+                    if delay > 0:
+                        self._stop_event.wait(delay)
+                elif has_space is not None:
+                    # Lossless fast replay: wait for the consumer instead of overflowing
+                    while not has_space() and not self._stop_event.is_set():
+                        time.sleep(0.001)
+
+                callback(block.reshape(-1, 1), len(block), None, None)
+                frames_sent += len(block)
+                self.blocks_delivered += 1
+        except Exception as e:
+            logger.error(f"{type(self).__name__} failed: {e}")
+        finally:
+            self.finished.set()
+
+
+class FileSource(_ThreadedSource):
+    """Replays a WAV/FLAC file in realtime or as fast as the consumer allows"""
+
+    def __init__(self, path, blocksize: Optional[int] = None, realtime: bool = True,
+                 block_duration: float = 0.5, loop: bool = False):
+        self.path = Path(path)
+        self.block_duration = block_duration
+        self.loop = loop
+        sample_rate, _ = open_audio_blocks(self.path, block_duration)
+        super().__init__(sample_rate, blocksize or int(block_duration * sample_rate), realtime)
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        while True:
+            _, blocks = open_audio_blocks(self.path, self.blocksize / self.sample_rate)
+            for block in blocks:
+                if len(block) == self.blocksize:
+                    yield block
+                else:
+                    # Pad the final short block so every delivery has a fixed size
+                    yield np.pad(block, (0, self.blocksize - len(block)))
+            if not self.loop:
+                return
+
+
+class SyntheticSource(_ThreadedSource):
+    """Speech-like bursts separated by silence, for headless load tests"""
+
+    def __init__(self, sample_rate: int = 16000, blocksize: Optional[int] = None,
+                 duration: Optional[float] = None, speech_duration: float = 1.5,
+                 pause_duration: float = 1.0, noise_level: float = 0.001,
+                 realtime: bool = True, seed: int = 0):
+        super().__init__(sample_rate, blocksize or sample_rate // 2, realtime)
+        self.duration = duration  # None runs until stopped
+        self.speech_duration = speech_duration
+        self.pause_duration = pause_duration
+        self.noise_level = noise_level
+        self.seed = seed
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        rng = np.random.default_rng(self.seed)
+        total = None if self.duration is None else int(self.duration * self.sample_rate)
+        pending = np.zeros(0, dtype=np.float32)
+        produced = 0
+        while total is None or produced < total:
+            while len(pending) < self.blocksize:
+                speech = generate_speech_like_audio(self.speech_duration, self.sample_rate, rng)
+                pause = self.noise_level * rng.standard_normal(int(self.pause_duration * self.sample_rate))
+                pending = np.concatenate([pending, speech, pause.astype(np.float32)])
+            block, pending = pending[:self.blocksize], pending[self.blocksize:]
+            produced += self.blocksize
+            yield block
+
+
+def create_audio_source(audio_config: AudioConfig, blocksize: int) -> AudioSource:
+    """Build the source selected by audio_config.audio_source"""
+    source = audio_config.audio_source
+    if source == "file":
+        if not audio_config.audio_source_path:
+            raise ValueError("audio_source 'file' requires audio_source_path")
+        return FileSource(audio_config.audio_source_path,
+                          realtime=audio_config.audio_source_realtime,
+                          block_duration=blocksize / audio_config.capture_sample_rate)
+    if source == "synthetic":
+        return SyntheticSource(sample_rate=audio_config.capture_sample_rate, blocksize=blocksize,
+                               realtime=audio_config.audio_source_realtime)
+    if source != "sounddevice":
+        logger.warning(f"Unknown audio source '{source}', using sounddevice")
+    return SoundDeviceSource(audio_config.capture_sample_rate, blocksize, audio_config.device_index)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Backpressure - Load shedding policy for when STT falls behind realtime
+Escalates one step at a time: drop VAD-silent audio, merge pending segments
+into larger STT batches, then switch the STT processor to a faster profile
+"""
+
+import logging
+import time
+from enum import IntEnum
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressureLevel(IntEnum):
+    """Load shedding steps, each one including the ones below it"""
+    NORMAL = 0
+    DROP_SILENCE = 1     # Silent chunks skip the STT buffer
+    MERGE_SEGMENTS = 2   # Completed segments are batched; streaming partials are skipped
+    DEGRADE_QUALITY = 3  # STT processor runs its fast profile
+
+
+class BackpressureController:
+    """
+    Tracks the pipeline real-time factor and decides how much load to shed
+
+    The real-time factor (RTF) is STT processing time divided by the amount of
+    captured audio consumed over the same interval, so it covers overlapping
+    windows and partial re-decodes, not just single-call speed. The consumer
+    is behind when the smoothed RTF exceeds `behind_rtf` or the capture pool
+    fills past `high_backlog`. Levels move one step per `min_dwell` seconds
+    and only recover once both RTF and backlog are comfortably low.
+
+    Speech is never discarded by this policy: the only audio it drops is
+    audio the VAD flagged as silent. Every decision is counted in get_metrics().
+    """
+
+    def __init__(self, behind_rtf: float = 0.9, recovered_rtf: float = 0.5,
+                 high_backlog: float = 0.5, low_backlog: float = 0.1,
+                 measure_interval: float = 1.0, smoothing: float = 0.5,
+                 min_dwell: float = 2.0, max_level: BackpressureLevel = BackpressureLevel.DEGRADE_QUALITY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.behind_rtf = behind_rtf
+        self.recovered_rtf = recovered_rtf
+        self.high_backlog = high_backlog
+        self.low_backlog = low_backlog
+        self.measure_interval = measure_interval  # Audio seconds per RTF measurement
+        self.smoothing = smoothing
+        self.min_dwell = min_dwell
+        self.max_level = BackpressureLevel(max_level)
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.level = BackpressureLevel.NORMAL
+        self.rtf: Optional[float] = None
+        self.backlog = 0.0
+        self._interval_audio = 0.0
+        self._interval_stt = 0.0
+        self._level_changed_at = self.clock()
+
+        # Decision metrics
+        self.escalations = 0
+        self.recoveries = 0
+        self.silent_chunks_dropped = 0
+        self.silent_seconds_dropped = 0.0
+        self.segments_merged = 0   # Segments folded into a larger batch
+        self.merged_batches = 0    # STT calls that carried a merged batch
+        self.partials_skipped = 0
+        self.degraded_stt_calls = 0
+
+    @property
+    def drop_silence(self) -> bool:
+        return self.level >= BackpressureLevel.DROP_SILENCE
+
+    @property
+    def merge_segments(self) -> bool:
+        return self.level >= BackpressureLevel.MERGE_SEGMENTS
+
+    @property
+    def degrade_quality(self) -> bool:
+        return self.level >= BackpressureLevel.DEGRADE_QUALITY
+
+    def record_stt(self, processing_seconds: float):
+        """Account STT time spent since the last update"""
+        self._interval_stt += processing_seconds
+        if self.degrade_quality:
+            self.degraded_stt_calls += 1
+
+    def update(self, audio_seconds: float, backlog_fraction: float) -> BackpressureLevel:
+        """
+        Account one consumed capture chunk and re-evaluate the level
+
+        Args:
+            audio_seconds: Duration of the chunk just taken from the capture pool
+            backlog_fraction: Capture pool fill level (0 = empty, 1 = overflowing)
+        """
+        self.backlog = backlog_fraction
+        self._interval_audio += audio_seconds
+        if self._interval_audio >= self.measure_interval:
+            rtf = self._interval_stt / self._interval_audio
+            self.rtf = rtf if self.rtf is None else self.smoothing * rtf + (1 - self.smoothing) * self.rtf
+            self._interval_audio = 0.0
+            self._interval_stt = 0.0
+
+        rtf = self.rtf or 0.0
+        now = self.clock()
+        if now - self._level_changed_at < self.min_dwell:
+            return self.level
+
+        if (rtf > self.behind_rtf or backlog_fraction >= self.high_backlog) and self.level < self.max_level:
+            self._set_level(BackpressureLevel(self.level + 1), now)
+            self.escalations += 1
+        elif rtf < self.recovered_rtf and backlog_fraction <= self.low_backlog and self.level > BackpressureLevel.NORMAL:
+            self._set_level(BackpressureLevel(self.level - 1), now)
+            self.recoveries += 1
+        return self.level
+
+    def record_silence_dropped(self, seconds: float):
+        self.silent_chunks_dropped += 1
+        self.silent_seconds_dropped += seconds
+
+    def record_merge(self, num_segments: int):
+        self.merged_batches += 1
+        self.segments_merged += num_segments
+
+    def record_partial_skipped(self):
+        self.partials_skipped += 1
+
+    def get_metrics(self) -> dict:
+        """Current level, load measurements and decision counters"""
+        return {
+            'level': int(self.level),
+            'level_name': self.level.name.lower(),
+            'rtf': self.rtf if self.rtf is not None else 0.0,
+            'backlog': self.backlog,
+            'escalations': self.escalations,
+            'recoveries': self.recoveries,
+            'silent_chunks_dropped': self.silent_chunks_dropped,
+            'silent_seconds_dropped': self.silent_seconds_dropped,
+            'segments_merged': self.segments_merged,
+            'merged_batches': self.merged_batches,
+            'partials_skipped': self.partials_skipped,
+            'degraded_stt_calls': self.degraded_stt_calls,
+        }
+
+    def _set_level(self, level: BackpressureLevel, now: float):
+        rtf = self.rtf or 0.0
+        log = logger.warning if level > self.level else logger.info
+        log(f"Backpressure {self.level.name} -> {level.name} "
+            f"(RTF {rtf:.2f}, capture backlog {self.backlog * 100:.0f}%)")
+        self.level = level
+        self._level_changed_at = now
@@ -7,9 +7,10 @@ import logging
 import asyncio
 import time
 import numpy as np
-from typing import Optional
+from typing import List, Optional
 
 from personalparakeet.config import V3Config
+from .audio_features import AudioFeatures
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,7 @@ class MockSTTProcessor:
         self.config = config
         self.is_initialized = False
         self.device = "cpu"  # Mock always uses CPU
+        self.quality_profile = "accurate"
         
         # Performance tracking (mock values)
         self.transcription_count = 0
@@ -47,12 +49,13 @@ class MockSTTProcessor:
             logger.error(f"Failed to initialize Mock STT processor: {e}")
             raise
     
-    def transcribe(self, audio_chunk: np.ndarray) -> Optional[str]:
+    def transcribe(self, audio_chunk: np.ndarray, features: Optional[AudioFeatures] = None) -> Optional[str]:
         """
         Mock transcribe audio chunk to text
         
         Args:
             audio_chunk: Audio data as numpy array (float32)
+            features: Levels already measured upstream (saves another pass over the audio)
             
         Returns:
             Mock transcribed text
@@ -66,7 +69,8 @@ class MockSTTProcessor:
             start_time = time.time()
             
             # Check if audio chunk has enough energy (simple threshold)
-            if np.max(np.abs(audio_chunk)) < 0.01:
+            peak = features.peak if features is not None else np.max(np.abs(audio_chunk))
+            if peak < 0.01:
                 return None  # Silent audio
             
             # Mock transcription responses
@@ -99,6 +103,17 @@ class MockSTTProcessor:
             logger.error(f"Mock transcription failed: {e}")
             return None
     
+    def transcribe_batch(self, audio_chunks: List[np.ndarray],
+                         features: Optional[List[Optional[AudioFeatures]]] = None) -> List[Optional[str]]:
+        """Mock batch transcription - one mock response per segment, in order"""
+        features = features or [None] * len(audio_chunks)
+        return [self.transcribe(audio_chunk, f) for audio_chunk, f in zip(audio_chunks, features)]
+    
+    def set_quality_profile(self, profile: str):
+        """Mock profile switch - responses are identical in every profile"""
+        self.quality_profile = profile
+        logger.info(f"Mock STT quality profile: {profile}")
+    
     def get_performance_stats(self) -> dict:
         """Get mock performance statistics"""
         if not self.transcription_times:
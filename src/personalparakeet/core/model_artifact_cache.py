@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Model Artifact Cache - Unpacked .nemo checkpoints with memory-mapped weights
+The first start extracts the config and tokenizer files and converts the
+weights to safetensors; later starts build the model straight from the cache
+entry, without unpacking the tarball, and weights page in as they are used
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from personalparakeet.config import AudioConfig
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1  # Bump when the entry layout changes
+CONFIG_FILE = "model_config.yaml"
+WEIGHTS_FILE = "model_weights.ckpt"
+SAFETENSORS_FILE = "model_weights.safetensors"
+ARTIFACT_PREFIX = "nemo:"  # How .nemo configs refer to files packed in the tarball
+DATASET_KEYS = ("train_ds", "validation_ds", "test_ds")
+
+
+def artifact_cache_dir(audio_config: AudioConfig) -> Path:
+    return audio_config.get_local_cache_dir() / "artifacts"
+
+
+def model_fingerprint(path: Path, sample_bytes: int = 1 << 20) -> str:
+    """
+    Content hash of a model file that doesn't read all of it
+
+    Covers the size plus the first and last `sample_bytes`: the tar header
+    block and the tail of the last member, which change with any re-export.
+    """
+    size = path.stat().st_size
+    digest = hashlib.sha256(f"{CACHE_FORMAT}|{size}|".encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(sample_bytes, size - sample_bytes))
+            digest.update(f.read())
+    return digest.hexdigest()[:20]
+
+
+def _resolve_artifacts(node: Any, artifacts_dir: Path) -> Any:
+    """Point `nemo:<file>` references in a config tree at the extracted files"""
+    if isinstance(node, dict):
+        return {key: _resolve_artifacts(value, artifacts_dir) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_resolve_artifacts(value, artifacts_dir) for value in node]
+    if isinstance(node, str) and node.startswith(ARTIFACT_PREFIX):
+        return str(artifacts_dir / Path(node[len(ARTIFACT_PREFIX):]).name)
+    return node
+
+
+class ModelArtifactCache:
+    """
+    Extracted .nemo checkpoints, one directory per model fingerprint
+
+    An entry holds:
+        model_config.yaml          - model config, `nemo:` references resolved to
+                                     absolute paths and dataset sections removed
+        artifacts/                 - tokenizer and any other packed files
+        model_weights.safetensors  - state dict, memory-mapped on load
+        manifest.json              - source, fingerprint and build time
+
+    Entries are built in a scratch directory and renamed into place, so a
+    crash mid-build never leaves a half-written entry that looks valid.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def entry_path(self, nemo_path: Path) -> Path:
+        return self.cache_dir / f"{nemo_path.stem}-{model_fingerprint(nemo_path)}"
+
+    def lookup(self, nemo_path: Path) -> Optional[Path]:
+        """Cached entry for this checkpoint, or None"""
+        entry = self.entry_path(nemo_path)
+        return entry if (entry / "manifest.json").exists() else None
+
+    def prepare(self, nemo_path: Path) -> Path:
+        """Cached entry for this checkpoint, building it on first use"""
+        nemo_path = Path(nemo_path)
+        entry = self.lookup(nemo_path)
+        if entry is not None:
+            return entry
+
+        start_time = time.time()
+        entry = self.entry_path(nemo_path)
+        partial = entry.with_name(entry.name + ".partial")
+        shutil.rmtree(partial, ignore_errors=True)
+        partial.mkdir(parents=True)
+        try:
+            self._extract(nemo_path, partial)
+            convert_weights(partial / WEIGHTS_FILE, partial / SAFETENSORS_FILE)
+            (partial / WEIGHTS_FILE).unlink()
+            (partial / "manifest.json").write_text(json.dumps({
+                'format': CACHE_FORMAT,
+                'source': str(nemo_path.resolve()),
+                'fingerprint': entry.name.rsplit("-", 1)[-1],
+                'built_at': time.time(),
+            }, indent=2), encoding="utf-8")
+            os.replace(partial, entry)
+        finally:
+            shutil.rmtree(partial, ignore_errors=True)
+        logger.info(f"Cached {nemo_path.name} artifacts at {entry} in {time.time() - start_time:.1f}s")
+        return entry
+
+    def _extract(self, nemo_path: Path, dest: Path):
+        """Unpack config, weights and artifacts (flattened) and rewrite the config"""
+        artifacts_dir = dest / "artifacts"
+        artifacts_dir.mkdir()
+        config = None
+        with tarfile.open(nemo_path, "r:*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                name = Path(member.name).name
+                source = tar.extractfile(member)
+                if name == CONFIG_FILE:
+                    config = yaml.safe_load(source)
+                    continue
+                target = dest / WEIGHTS_FILE if name == WEIGHTS_FILE else artifacts_dir / name
+                with open(target, "wb") as out:
+                    shutil.copyfileobj(source, out, 1 << 20)
+        if config is None or not (dest / WEIGHTS_FILE).exists():
+            raise ValueError(f"{nemo_path} is not a NeMo checkpoint (no {CONFIG_FILE} / {WEIGHTS_FILE})")
+
+        config = _resolve_artifacts(config, artifacts_dir)
+        for key in DATASET_KEYS:
+            if key in config:
+                config[key] = None  # Inference only - never try to open training manifests
+        with open(dest / CONFIG_FILE, "w", encoding="utf-8") as f:
+            yaml.safe_dump(config, f, sort_keys=False)
+
+
+def convert_weights(checkpoint_path: Path, safetensors_path: Path):
+    """Re-save a torch state dict as safetensors (tensors sharing storage are copied)"""
+    import torch
+    from safetensors.torch import save_file
+
+    try:
+        state = torch.load(checkpoint_path, map_location="cpu", weights_only=True, mmap=True)
+    except RuntimeError:
+        # Legacy (non-zip) checkpoints can't be mapped
+        state = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
+    if "state_dict" in state and isinstance(state["state_dict"], dict):
+        state = state["state_dict"]
+
+    tensors, seen = {}, set()
+    for key, tensor in state.items():
+        storage = tensor.untyped_storage().data_ptr()
+        tensor = tensor.contiguous()
+        if storage in seen or tensor.untyped_storage().nbytes() != tensor.nbytes:
+            tensor = tensor.clone()  # safetensors refuses aliased or partial-storage tensors
+        seen.add(storage)
+        tensors[key] = tensor
+    save_file(tensors, str(safetensors_path))
+
+
+def load_weights(safetensors_path: Path) -> dict:
+    """State dict backed by a private memory map of the file: pages load on first touch"""
+    from safetensors.torch import load_file
+
+    return load_file(str(safetensors_path), device="cpu")
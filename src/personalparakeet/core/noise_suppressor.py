@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Noise Suppressor - Streaming spectral noise reduction before STT
+Wiener-style spectral gain with overlap-add on NumPy FFTs; the noise
+spectrum is learned from frames the VAD marks as non-speech
+"""
+
+import logging
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SpectralNoiseSuppressor:
+    """
+    Streaming noise suppression on VAD frames
+
+    Works on the VAD's frame grid: the STFT hop is one VAD frame and each
+    analysis block spans two frames (sqrt-Hann analysis and synthesis
+    windows, which overlap-add to unity). A block made only of non-speech
+    frames updates the noise power spectrum by exponential averaging; every
+    block gets the gain max(floor, 1 - oversubtraction * noise / power) per
+    bin. Until noise has been observed audio passes through unchanged.
+
+    Finishing a frame needs the block that starts on it, so the last frame of
+    each call is held until the next call. The output stream stays on the
+    input sample clock (a stream's first output starts at sample 0) and its
+    speech flags move with their frames.
+
+    Not thread-safe: owned by the audio consumer thread.
+    """
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_size: int = 480,
+                 oversubtraction: float = 1.5,
+                 gain_floor_db: float = -15.0,
+                 noise_smoothing: float = 0.95):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.oversubtraction = oversubtraction
+        self.gain_floor = 10 ** (gain_floor_db / 20)
+        self.noise_smoothing = noise_smoothing
+
+        block_size = 2 * frame_size
+        self.fft_size = 1 << (block_size - 1).bit_length()
+        # Periodic Hann split into sqrt halves: hann[n] + hann[n + frame_size] == 1
+        hann = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(block_size) / block_size)
+        self._window = np.sqrt(hann)
+
+        self.reset()
+        logger.info(f"SpectralNoiseSuppressor initialized: {block_size}-sample blocks, "
+                    f"{self.fft_size}-point FFT, floor {gain_floor_db:.0f} dB")
+
+    def reset(self):
+        """Start a new stream: forget held audio and the noise estimate"""
+        self._started = False
+        self._prev_frame = np.zeros(self.frame_size)
+        self._prev_flag = False
+        self._tail = np.zeros(self.frame_size)
+        self.noise_power = None
+
+        # Metrics
+        self.noise_frames = 0
+        self.frames_processed = 0
+        self._gain_sum = 0.0
+
+    def process(self, frame_audio: np.ndarray, speech_flags: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Suppress noise in the next whole frames of the stream
+
+        Args:
+            frame_audio: VAD frame-aligned audio (len == len(speech_flags) * frame_size)
+            speech_flags: VAD decision per frame
+
+        Returns:
+            (audio, flags) for the frames finished by this call, in stream order
+        """
+        speech_flags = np.asarray(speech_flags, dtype=bool)
+        n = len(speech_flags)
+        if n == 0:
+            return frame_audio[:0].astype(np.float32), speech_flags
+
+        frames = np.vstack([self._prev_frame, np.asarray(frame_audio, dtype=np.float64).reshape(n, self.frame_size)])
+        flags = np.concatenate(([self._prev_flag], speech_flags))
+
+        # Block j covers frames j-1 and j (frame -1 is the one held from the last call)
+        blocks = np.concatenate([frames[:-1], frames[1:]], axis=1) * self._window
+        spectra = np.fft.rfft(blocks, n=self.fft_size, axis=1)
+        power = spectra.real ** 2 + spectra.imag ** 2
+
+        silent = ~(flags[:-1] | flags[1:])
+        if self._started:
+            self._learn_noise(power[silent])
+        else:
+            self._learn_noise(power[1:][silent[1:]])  # Block 0 starts on padding
+
+        if self.noise_power is not None:
+            gains = np.maximum(self.gain_floor,
+                               1.0 - self.oversubtraction * self.noise_power / np.maximum(power, 1e-20))
+            spectra *= gains
+            self._gain_sum += float(gains.mean(axis=1).sum())
+        else:
+            self._gain_sum += n
+        out_blocks = np.fft.irfft(spectra, n=self.fft_size, axis=1)[:, :2 * self.frame_size] * self._window
+
+        # Overlap-add: a frame is the second half of its block plus the first half of the next
+        heads, tails = out_blocks[:, :self.frame_size], out_blocks[:, self.frame_size:]
+        finished = np.vstack([self._tail, tails[:-1]]) + heads
+        out_flags = flags[:-1]
+        if not self._started:
+            finished, out_flags = finished[1:], out_flags[1:]  # Nothing precedes the stream
+            self._started = True
+
+        self._tail = tails[-1]
+        self._prev_frame = frames[-1]
+        self._prev_flag = bool(flags[-1])
+        self.frames_processed += n
+        return finished.reshape(-1).astype(np.float32), out_flags
+
+    def _learn_noise(self, silent_power: np.ndarray):
+        """Fold non-speech block spectra into the noise estimate, oldest first"""
+        m = len(silent_power)
+        if m == 0:
+            return
+        a = self.noise_smoothing
+        if self.noise_power is None:
+            self.noise_power = silent_power.mean(axis=0)
+        else:
+            # Exponential average applied once per block, in order
+            weights = (1 - a) * a ** np.arange(m - 1, -1, -1)
+            self.noise_power = a ** m * self.noise_power + weights @ silent_power
+        self.noise_frames += m
+
+    def get_metrics(self) -> dict:
+        """How much noise has been learned and how hard the gain is working"""
+        return {
+            'noise_frames': self.noise_frames,
+            'mean_gain': self._gain_sum / self.frames_processed if self.frames_processed else 1.0,
+        }
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+ONNX STT Processor - CPU inference of an exported CTC speech model
+Runs the encoder + CTC head graph through ONNX Runtime with full graph
+optimizations; log-mel features and greedy CTC decoding are done in NumPy,
+so neither NeMo nor PyTorch is needed at runtime
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from personalparakeet.config import V3Config
+from .audio_features import AudioFeatures
+from .quantization import quantization_cache_dir, quantize_onnx_model
+from .stt_segmentation import segment_durations
+from .stt_stream import StreamingLogMel, STTStream
+
+logger = logging.getLogger(__name__)
+
+LOG_GUARD = 2 ** -24  # NeMo's log zero guard
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int,
+                   fmin: float = 0.0, fmax: Optional[float] = None) -> np.ndarray:
+    """Slaney-style mel filterbank, (n_mels, n_fft // 2 + 1) - as librosa/NeMo use"""
+    fmax = fmax if fmax is not None else sample_rate / 2
+
+    def hz_to_mel(f):
+        f = np.asarray(f, dtype=np.float64)
+        return np.where(f < 1000.0, 3 * f / 200, 15 + 27 * np.log(np.maximum(f, 1e-10) / 1000) / np.log(6.4))
+
+    def mel_to_hz(m):
+        return np.where(m < 15, 200 * m / 3, 1000 * np.exp((m - 15) * np.log(6.4) / 27))
+
+    hz = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower = (freqs[None, :] - hz[:-2, None]) / (hz[1:-1] - hz[:-2])[:, None]
+    upper = (hz[2:, None] - freqs[None, :]) / (hz[2:] - hz[1:-1])[:, None]
+    weights = np.maximum(0.0, np.minimum(lower, upper))
+    return weights * (2.0 / (hz[2:] - hz[:-2]))[:, None]
+
+
+class LogMelFeaturizer:
+    """
+    NumPy port of NeMo's AudioToMelSpectrogramPreprocessor (inference path)
+
+    Pre-emphasis, centered STFT with a Hann window, power spectrum, mel
+    filterbank, log and per-feature normalization; no dither.
+    """
+
+    def __init__(self, sample_rate: int = 16000, n_mels: int = 80, n_fft: int = 512,
+                 window_size: float = 0.025, window_stride: float = 0.01,
+                 preemph: float = 0.97, normalize: str = "per_feature"):
+        self.sample_rate = sample_rate
+        self.n_mels = n_mels
+        self.n_fft = n_fft
+        self.hop = int(window_stride * sample_rate)
+        self.preemph = preemph
+        self.normalize = normalize
+
+        win_length = int(window_size * sample_rate)
+        self.window = np.zeros(n_fft)
+        offset = (n_fft - win_length) // 2
+        self.window[offset:offset + win_length] = np.hanning(win_length)
+        self.filterbank = mel_filterbank(sample_rate, n_fft, n_mels).astype(np.float32)
+
+    def num_frames(self, num_samples: int) -> int:
+        return num_samples // self.hop + 1
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """(n_mels, num_frames) log-mel features of one segment"""
+        x = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if self.preemph:
+            x = np.concatenate((x[:1], x[1:] - self.preemph * x[:-1]))
+        x = np.pad(x, self.n_fft // 2)
+        frames = np.lib.stride_tricks.sliding_window_view(x, self.n_fft)[::self.hop]
+        features = self.log_mel(frames[:self.num_frames(len(audio))])
+
+        if self.normalize == "per_feature" and features.shape[1] > 1:
+            mean = features.mean(axis=1, keepdims=True)
+            std = features.std(axis=1, ddof=1, keepdims=True)
+            features = (features - mean) / (std + 1e-5)
+        return features.astype(np.float32)
+
+    def log_mel(self, frames: np.ndarray) -> np.ndarray:
+        """(n_mels, k) log-mel features of k pre-emphasized, padded n_fft-sample frames"""
+        spectrum = np.fft.rfft(frames * self.window, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        return np.log(power @ self.filterbank.T + LOG_GUARD).T.astype(np.float32)
+
+
+class OnnxSTTProcessor:
+    """
+    CPU speech-to-text on an exported CTC graph, same contract as STTProcessor
+
+    The model is an ONNX file as written by NeMo's `model.export()` for a CTC
+    model (or the CTC head of a hybrid model): inputs `audio_signal`
+    (batch, n_mels, frames) and `length` (batch), output log-probabilities
+    (batch, frames', vocabulary + blank), optionally followed by encoded
+    lengths. A JSON manifest next to it (same name, .json) holds the
+    vocabulary and feature settings:
+
+        {"vocabulary": ["▁the", "s", ...], "blank_id": 1024,
+         "subsampling_factor": 8, "features": {"n_mels": 80, ...}}
+
+    Cache-aware streaming exports (NeMo's `export(cache_support=True)`) take
+    three more inputs - the encoder's left-context caches - and return the
+    next caches after the logits and lengths, in the same order. With a
+    "streaming" section in the manifest,
+
+        {"streaming": {"chunk_frames": [9, 16], "pre_encode_cache_frames": [0, 9]}}
+
+    the processor decodes incrementally through create_stream() /
+    transcribe_stream(), and whole segments are run through one stream.
+
+    Transducer (TDT/RNNT) decoders need a stateful decoding loop and are not
+    supported here; use the NeMo runtime for those.
+    """
+
+    def __init__(self, config: V3Config):
+        self.config = config
+        self.model = None  # onnxruntime.InferenceSession
+        self.is_initialized = False
+        self.device = "cpu"
+        self.quality_profile = "accurate"  # Greedy CTC in every profile
+        self.quantization = "none"  # "int8" when running the quantized copy of the graph
+        self.warmup_timings: List[dict] = []
+
+        self.featurizer: Optional[LogMelFeaturizer] = None
+        self.vocabulary: List[str] = []
+        self.blank_id = 0
+        self.subsampling_factor = 1
+        self.word_prefix = "▁"  # SentencePiece word boundary
+        self.supports_streaming = False  # Cache-aware graph + manifest "streaming" section
+        self._streaming: dict = {}
+        self._cache_inputs: List = []  # onnxruntime NodeArg of each cache input
+
+        # Performance tracking
+        self.transcription_count = 0
+        self.total_transcription_time = 0.0
+        self.transcription_times = []
+
+    def _model_path(self) -> Path:
+        if not self.config.audio.stt_onnx_model_path:
+            raise ValueError("stt_runtime 'onnx' needs stt_onnx_model_path: an exported CTC model "
+                             "with its .json manifest beside it")
+        return Path(self.config.audio.stt_onnx_model_path).expanduser()
+
+    async def initialize(self):
+        """Load the graph with full optimizations and the configured CPU threads"""
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("ONNX STT runtime needs onnxruntime: pip install -r requirements-onnx.txt") from e
+
+        start_time = time.time()
+        model_path = self._model_path()
+        manifest_path = model_path.with_suffix(".json")
+        if not model_path.exists() or not manifest_path.exists():
+            raise FileNotFoundError(f"ONNX STT model needs {model_path} and its manifest {manifest_path}")
+
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        self.vocabulary = list(manifest["vocabulary"])
+        self.blank_id = int(manifest.get("blank_id", len(self.vocabulary)))
+        self.subsampling_factor = int(manifest.get("subsampling_factor", 1))
+        self.word_prefix = manifest.get("word_prefix", self.word_prefix)
+        self.featurizer = LogMelFeaturizer(sample_rate=self.config.audio.model_sample_rate,
+                                           **manifest.get("features", {}))
+
+        session_path = model_path
+        quantization = self.config.audio.stt_cpu_quantization
+        if quantization == "int8":
+            session_path, _ = quantize_onnx_model(model_path, quantization_cache_dir(self.config.audio))
+            self.quantization = "int8"
+        elif quantization != "none":
+            logger.warning(f"Unknown stt_cpu_quantization '{quantization}', using fp32")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = self.config.audio.stt_cpu_threads  # 0: one per physical core
+        options.inter_op_num_threads = self.config.audio.stt_cpu_inter_op_threads
+        self.model = ort.InferenceSession(str(session_path), sess_options=options,
+                                          providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.model.get_inputs()]
+        self._output_names = [o.name for o in self.model.get_outputs()]
+        self._cache_inputs = self.model.get_inputs()[2:]
+        self._streaming = manifest.get("streaming") or {}
+        self.supports_streaming = bool(self._cache_inputs and self._streaming)
+        if self._cache_inputs and not self._streaming:
+            raise ValueError(f"{model_path} takes encoder caches but its manifest has no 'streaming' section")
+        logger.info(f"ONNX STT model loaded from {model_path} in {time.time() - start_time:.2f}s "
+                    f"({len(self.vocabulary)} tokens, {self.quantization}, intra-op threads {options.intra_op_num_threads or 'auto'}, "
+                    f"inter-op threads {options.inter_op_num_threads}"
+                    f"{', cache-aware streaming' if self.supports_streaming else ''})")
+
+        if self.config.audio.stt_warmup:
+            self.warm_up(segment_durations(self.config.audio), batch_size=self.config.audio.stt_max_batch_size,
+                         runs=self.config.audio.stt_warmup_runs)
+        self.is_initialized = True
+
+    def transcribe(self, audio_chunk: np.ndarray, features: Optional[AudioFeatures] = None) -> Optional[str]:
+        """
+        Transcribe audio chunk to text
+
+        Args:
+            audio_chunk: Audio data as numpy array (float32)
+            features: Levels already measured upstream (saves another pass over the audio)
+
+        Returns:
+            Transcribed text or None if transcription fails
+        """
+        return self.transcribe_batch([audio_chunk], [features])[0]
+
+    def transcribe_batch(self, audio_chunks: List[np.ndarray],
+                         features: Optional[List[Optional[AudioFeatures]]] = None) -> List[Optional[str]]:
+        """Transcribe several segments in one padded graph run"""
+        texts: List[Optional[str]] = [None] * len(audio_chunks)
+        if not self.is_initialized or self.model is None:
+            logger.error("ONNX STT processor not initialized")
+            return texts
+
+        features = features or [None] * len(audio_chunks)
+        try:
+            batch, positions = [], []
+            for i, (audio_chunk, chunk_features) in enumerate(zip(audio_chunks, features)):
+                max_level = chunk_features.peak if chunk_features is not None else np.max(np.abs(audio_chunk))
+                if max_level < self.config.audio.stt_audio_threshold:
+                    continue  # Skip transcription for silent audio
+                batch.append(np.asarray(audio_chunk, dtype=np.float32).reshape(-1))
+                positions.append(i)
+            if not batch:
+                return texts
+
+            start_time = time.time()
+            decoded = self._infer(batch)
+            transcription_time = time.time() - start_time
+            self.transcription_count += len(batch)
+            self.total_transcription_time += transcription_time
+            self.transcription_times.append(transcription_time)
+            if len(self.transcription_times) > 100:
+                self.transcription_times.pop(0)
+
+            for i, text in zip(positions, decoded):
+                texts[i] = text or None
+            return texts
+        except Exception as e:
+            logger.error(f"ONNX transcription error: {e}")
+            return texts
+
+    def create_stream(self) -> STTStream:
+        """New per-utterance state: empty feature buffer and zeroed encoder caches"""
+        if not self.supports_streaming:
+            raise RuntimeError("ONNX STT model is not a cache-aware streaming export")
+        caches = {}
+        for cache in self._cache_inputs:
+            shape = [dim if isinstance(dim, int) else 1 for dim in cache.shape]  # Symbolic dims: batch of 1
+            dtype = np.int64 if "int64" in cache.type else np.float32
+            caches[cache.name] = np.zeros(shape, dtype=dtype)
+        return STTStream(StreamingLogMel(self.featurizer),
+                         chunk_frames=self._streaming["chunk_frames"],
+                         pre_encode_frames=self._streaming.get("pre_encode_cache_frames", 0),
+                         caches=caches)
+
+    def transcribe_stream(self, stream: STTStream, audio_chunk: np.ndarray,
+                          is_final: bool = False) -> Optional[str]:
+        """
+        Extend an utterance with new audio and decode only what it adds
+
+        Args:
+            stream: State from create_stream(), one per utterance
+            audio_chunk: Audio following everything already passed to this stream
+            is_final: Flush the trailing frames; the stream takes no more audio
+
+        Returns:
+            Hypothesis for the utterance so far, or None if empty or on error
+        """
+        if not self.is_initialized or self.model is None:
+            logger.error("ONNX STT processor not initialized")
+            return None
+        try:
+            self._stream_steps(stream, audio_chunk, is_final)
+            return stream.text or None
+        except Exception as e:
+            logger.error(f"ONNX streaming transcription error: {e}")
+            return None
+
+    def _stream_steps(self, stream: STTStream, audio: np.ndarray, is_final: bool):
+        """One graph run per chunk made ready by this audio; caches and hypothesis carried over"""
+        if stream.is_finished:
+            raise RuntimeError("Stream already finished")
+        for signal, new_frames in stream.chunks(audio, is_final):
+            step_start = time.time()
+            feeds = {self._input_names[0]: signal[None],
+                     self._input_names[1]: np.array([signal.shape[1]], dtype=np.int64)}
+            feeds.update(stream.caches)
+            outputs = self.model.run(self._output_names, feeds)
+            encoded = int(np.asarray(outputs[1]).reshape(-1)[0])
+            for cache, value in zip(self._cache_inputs, outputs[2:]):
+                stream.caches[cache.name] = value
+            self._decode_step(stream, outputs[0][0, :encoded])
+            stream.record_step(new_frames, time.time() - step_start)
+        stream.is_finished = is_final
+
+    def _decode_step(self, stream: STTStream, log_probs: np.ndarray):
+        """Greedy CTC over new frames; (last token, pieces) carried so repeats collapse across steps"""
+        if not len(log_probs):
+            return
+        previous, pieces = stream.decoder_state or (-1, "")
+        ids = log_probs.argmax(axis=-1)
+        keep = ids != self.blank_id
+        keep &= ids != np.concatenate(([previous], ids[:-1]))
+        pieces += "".join(self.vocabulary[i] for i in ids[keep] if i < len(self.vocabulary))
+        stream.decoder_state = (int(ids[-1]), pieces)
+        stream.text = pieces.replace(self.word_prefix, " ").strip()
+
+    def _infer(self, batch: List[np.ndarray]) -> List[str]:
+        """Featurize, run the graph once for the whole batch and decode"""
+        if self.supports_streaming:
+            # Cache-aware graphs only run chunk by chunk: one stream per segment
+            texts = []
+            for audio in batch:
+                stream = self.create_stream()
+                self._stream_steps(stream, audio, is_final=True)
+                texts.append(stream.text)
+            return texts
+        mels = [self.featurizer(audio) for audio in batch]
+        lengths = np.array([m.shape[1] for m in mels], dtype=np.int64)
+        signal = np.zeros((len(mels), self.featurizer.n_mels, lengths.max()), dtype=np.float32)
+        for row, m in enumerate(mels):
+            signal[row, :, :m.shape[1]] = m
+
+        outputs = self.model.run(self._output_names, dict(zip(self._input_names, (signal, lengths))))
+        log_probs = outputs[0]
+        if len(outputs) > 1:
+            encoded_lengths = np.asarray(outputs[1]).reshape(-1)
+        else:
+            encoded_lengths = -(-lengths // self.subsampling_factor)
+        return [self._decode(log_probs[row, :encoded_lengths[row]]) for row in range(len(batch))]
+
+    def _decode(self, log_probs: np.ndarray) -> str:
+        """Greedy CTC: best token per frame, collapse repeats, drop blanks"""
+        ids = log_probs.argmax(axis=-1)
+        keep = ids != self.blank_id
+        keep[1:] &= ids[1:] != ids[:-1]
+        pieces = "".join(self.vocabulary[i] for i in ids[keep] if i < len(self.vocabulary))
+        return pieces.replace(self.word_prefix, " ").strip()
+
+    def warm_up(self, durations: Sequence[float], batch_size: int = 1, runs: int = 2) -> List[dict]:
+        """Run dummy segments of each length so ORT's allocations and kernels are set up front"""
+        sample_rate = self.config.audio.model_sample_rate
+        rng = np.random.default_rng(0)
+        shapes = [(d, 1) for d in durations]
+        if batch_size > 1 and durations:
+            shapes.append((max(durations), batch_size))
+
+        self.warmup_timings = []
+        for duration, count in shapes:
+            batch = [(rng.standard_normal(int(duration * sample_rate)) * 0.05).astype(np.float32)
+                     for _ in range(count)]
+            latencies = []
+            for _ in range(max(1, runs)):
+                run_start = time.time()
+                self._infer(batch)
+                latencies.append(time.time() - run_start)
+            timing = {'duration': duration, 'batch_size': count,
+                      'cold_ms': latencies[0] * 1000, 'warm_ms': latencies[-1] * 1000}
+            self.warmup_timings.append(timing)
+            logger.info(f"ONNX STT warm-up {duration:.1f}s x{count}: cold {timing['cold_ms']:.0f}ms, "
+                        f"warm {timing['warm_ms']:.0f}ms")
+        return self.warmup_timings
+
+    def set_quality_profile(self, profile: str):
+        """Greedy CTC has no cheaper decoding - the profile is only recorded"""
+        self.quality_profile = profile
+
+    def get_performance_stats(self) -> dict:
+        if not self.transcription_times:
+            return {'total_transcriptions': 0, 'avg_processing_time_ms': 0, 'total_processing_time_s': 0}
+        return {
+            'total_transcriptions': self.transcription_count,
+            'avg_processing_time_ms': sum(self.transcription_times) / len(self.transcription_times) * 1000,
+            'total_processing_time_s': self.total_transcription_time,
+        }
+
+    async def cleanup(self):
+        self.model = None
+        self.is_initialized = False
+        logger.info("ONNX STT processor cleaned up")
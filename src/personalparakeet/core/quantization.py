@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Quantization - Dynamic int8 quantization for CPU STT inference
+Converted weights are cached on disk, keyed by the source model and the
+converting library's version, so only the first startup pays for them
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Tuple
+
+from personalparakeet.config import AudioConfig
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("none", "int8")
+
+
+def quantization_cache_dir(audio_config: AudioConfig) -> Path:
+    """Where converted models live: under model_cache_dir, else the user cache"""
+    return audio_config.get_local_cache_dir() / "quantized"
+
+
+def _cache_entry(cache_dir: Path, source: str, library_version: str) -> Path:
+    """
+    Cache location for one (source model, converter version) pair
+
+    A file source is identified by its resolved path, size and mtime, so a
+    re-exported or re-downloaded model gets a fresh entry; anything else
+    (a pretrained model name) by its name.
+    """
+    source_path = Path(source).expanduser()
+    if source_path.is_file():
+        stat = source_path.stat()
+        identity = f"{source_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+        name = source_path.stem
+    else:
+        identity = name = source
+    digest = hashlib.sha256(f"{identity}|{library_version}".encode()).hexdigest()[:16]
+    safe_name = re.sub(r"[^\w.-]+", "_", name)
+    return cache_dir / f"{safe_name}-int8-{digest}"
+
+
+def _dynamic_int8_skeleton(module) -> list:
+    """
+    Swap every nn.Linear under `module` for an empty dynamic int8 Linear
+
+    The replacements hold zero weights of the right shapes - enough structure
+    for load_state_dict, without quantizing anything.
+
+    Returns:
+        (parent, name, original) for each swap, so a failed load can be undone
+    """
+    import torch
+
+    swaps = []
+    for parent in list(module.modules()):
+        for name, child in list(parent.named_children()):
+            if type(child) is torch.nn.Linear:  # Exact type, as quantize_dynamic matches it
+                skeleton = torch.ao.nn.quantized.dynamic.Linear(
+                    child.in_features, child.out_features, bias_=child.bias is not None, dtype=torch.qint8)
+                setattr(parent, name, skeleton)
+                swaps.append((parent, name, child))
+    return swaps
+
+
+def quantize_torch_encoder(model, source: str, cache_dir: Path) -> bool:
+    """
+    Swap a NeMo model's encoder for a dynamic int8 copy
+
+    Every nn.Linear in the encoder is quantized - the Conformer feed-forward
+    blocks and the attention q/k/v/output projections, which hold nearly all
+    of its weights. Activations stay float and are quantized per batch at run
+    time. The preprocessor and decoder are left in fp32.
+
+    The cache holds only the quantized state dict, loaded with
+    weights_only=True (nothing in the cache directory is unpickled as code)
+    into an empty int8 skeleton of the encoder, so a cached start skips the
+    conversion entirely.
+
+    Args:
+        model: Loaded NeMo ASR model on the CPU
+        source: Checkpoint path or pretrained name (the cache key)
+        cache_dir: Directory for converted encoders
+
+    Returns:
+        True if the encoder came from the cache, False if it was converted now
+    """
+    import torch
+
+    entry = _cache_entry(cache_dir, source, torch.__version__)
+    entry = entry.with_name(entry.name + ".pt")
+    model.eval()
+    if entry.exists():
+        swaps = _dynamic_int8_skeleton(model.encoder)
+        try:
+            model.encoder.load_state_dict(torch.load(entry, map_location="cpu", weights_only=True))
+            logger.info(f"Loaded int8 encoder weights from cache: {entry}")
+            return True
+        except Exception as e:
+            logger.warning(f"Discarding unreadable int8 encoder cache {entry}: {e}")
+            for parent, name, original in swaps:
+                setattr(parent, name, original)
+
+    start_time = time.time()
+    encoder = torch.ao.quantization.quantize_dynamic(model.encoder, {torch.nn.Linear}, dtype=torch.qint8)
+    model.encoder = encoder
+    logger.info(f"Quantized encoder to int8 in {time.time() - start_time:.2f}s")
+
+    partial = entry.with_name(entry.name + ".partial")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        torch.save(encoder.state_dict(), partial)
+        os.replace(partial, entry)  # Never leave a half-written entry behind
+        logger.info(f"Cached int8 encoder weights at {entry}")
+    except Exception as e:
+        # The quantized encoder is already in place - only the cache is lost
+        logger.warning(f"Could not cache int8 encoder: {e}")
+        partial.unlink(missing_ok=True)
+    return False
+
+
+def quantize_onnx_model(model_path: Path, cache_dir: Path) -> Tuple[Path, bool]:
+    """
+    Dynamic int8 copy of an ONNX graph (MatMul/Gemm/Attention weights)
+
+    Args:
+        model_path: fp32 model file
+        cache_dir: Directory for converted models
+
+    Returns:
+        (path of the int8 model, True if it came from the cache)
+    """
+    import onnxruntime
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    entry = _cache_entry(cache_dir, str(model_path), onnxruntime.__version__)
+    quantized_path = entry / "model.onnx"
+    if quantized_path.exists():
+        logger.info(f"Loaded int8 ONNX model from cache: {quantized_path}")
+        return quantized_path, True
+
+    # Convert into a scratch directory (weights go to an external data file next to
+    # the graph, so >2 GB exports work) and move it into place in one step
+    start_time = time.time()
+    partial = entry.with_name(entry.name + ".partial")
+    shutil.rmtree(partial, ignore_errors=True)
+    partial.mkdir(parents=True)
+    try:
+        quantize_dynamic(model_path, partial / "model.onnx", weight_type=QuantType.QInt8,
+                         op_types_to_quantize=["MatMul", "Gemm", "Attention"],
+                         use_external_data_format=True)
+        os.replace(partial, entry)
+    finally:
+        shutil.rmtree(partial, ignore_errors=True)
+    logger.info(f"Quantized {model_path.name} to int8 in {time.time() - start_time:.2f}s, cached at {entry}")
+    return quantized_path, False
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Segment Backlog - Holds finished segments while the STT model is loading
+Bounded by seconds of audio: when full, the oldest segments are dropped
+"""
+
+import logging
+from collections import deque
+from typing import Optional
+
+from .stt_segmentation import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentBacklog:
+    """
+    FIFO ring of segments waiting for a model that isn't ready yet
+
+    Capture, VAD and segmentation run from the first moment; their segments
+    park here until STT can take them, then leave in arrival order. Only
+    `max_duration` seconds are held - speech older than that is dropped
+    (and counted) rather than letting startup grow memory without bound.
+    A streaming partial is dropped as soon as any later segment arrives,
+    since that segment re-decodes the same audio.
+
+    Owned by the audio consumer thread.
+    """
+
+    def __init__(self, max_duration: float = 60.0):
+        self.max_duration = max_duration
+        self._segments = deque()
+        self.duration = 0.0  # Seconds of audio currently held
+
+        # Metrics
+        self.segments_held = 0
+        self.segments_dropped = 0
+        self.seconds_dropped = 0.0
+        self.stale_partials_dropped = 0
+        self.peak_duration = 0.0
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def push(self, segment: AudioSegment):
+        """Hold a segment, dropping the oldest ones to stay within max_duration"""
+        if self._segments and self._segments[-1].is_partial:
+            self.stale_partials_dropped += 1
+            self.duration -= self._segments.pop().duration
+
+        # Views alias segmenter rings - copy before holding on to them
+        segment.audio = segment.audio.copy()
+        self._segments.append(segment)
+        self.duration += segment.duration
+        self.segments_held += 1
+
+        while self.duration > self.max_duration and len(self._segments) > 1:
+            dropped = self._segments.popleft()
+            self.duration -= dropped.duration
+            self.segments_dropped += 1
+            self.seconds_dropped += dropped.duration
+            logger.warning(f"Startup backlog full ({self.max_duration:.0f}s) - dropped segment "
+                           f"{dropped.segment_id} ({dropped.duration:.1f}s)")
+        self.peak_duration = max(self.peak_duration, self.duration)
+
+    def pop(self) -> Optional[AudioSegment]:
+        """Oldest held segment, or None"""
+        if not self._segments:
+            return None
+        segment = self._segments.popleft()
+        self.duration = max(0.0, self.duration - segment.duration) if self._segments else 0.0
+        return segment
+
+    def clear(self) -> int:
+        """Drop everything held; returns how many segments were discarded"""
+        count = len(self._segments)
+        self.segments_dropped += count
+        self.seconds_dropped += self.duration
+        self._segments.clear()
+        self.duration = 0.0
+        return count
+
+    def get_metrics(self) -> dict:
+        return {
+            'segments_waiting': len(self._segments),
+            'seconds_waiting': self.duration,
+            'segments_held': self.segments_held,
+            'segments_dropped': self.segments_dropped,
+            'seconds_dropped': self.seconds_dropped,
+            'stale_partials_dropped': self.stale_partials_dropped,
+            'peak_seconds': self.peak_duration,
+        }
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Speech Gate - Keeps non-speech audio away from the STT model
+Trims silent edges off each segment using the per-frame VAD flags and
+skips segments whose speech ratio is below a configurable floor
+"""
+
+import logging
+
+import numpy as np
+
+from .audio_features import FrameHistory
+from .stt_segmentation import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechGate:
+    """
+    Pre-STT stage driven by the VAD flags of the model-rate stream
+
+    The VAD flags come from a FrameHistory kept on the same sample clock as
+    the segmenters. apply() looks up the frames a segment covers, stores their
+    speech ratio on the segment and trims leading/trailing non-speech in place
+    (keeping `pad_duration` of context on each side). Segments below `min_speech_ratio` should not be
+    transcribed at all - see passes(). Segments the flags don't fully cover
+    (no VAD, or audio older than the history) are left alone.
+
+    Owned by the audio consumer thread; passes() only reads the segment.
+    """
+
+    def __init__(self, history: FrameHistory, pad_duration: float = 0.15,
+                 min_speech_ratio: float = 0.1):
+        self.history = history
+        self.frame_size = history.frame_size
+        self.pad_samples = int(pad_duration * history.sample_rate)
+        self.min_speech_ratio = min_speech_ratio
+
+        # Metrics
+        self.segments_checked = 0
+        self.segments_trimmed = 0
+        self.segments_skipped = 0
+        self.seconds_checked = 0.0
+        self.seconds_trimmed = 0.0
+        self.seconds_skipped = 0.0
+
+    def apply(self, segment: AudioSegment, trim: bool = True) -> AudioSegment:
+        """
+        Annotate a segment with its speech ratio and trim its silent edges
+
+        Args:
+            segment: Segment about to be scheduled (audio and start_sample change in place)
+            trim: False for overlapping windows, whose positions the merger relies on
+
+        Returns:
+            The same segment
+        """
+        recorded = self.history.lookup(segment.start_sample, segment.end_sample)
+        if recorded is None:
+            return segment
+
+        flags, _ = recorded
+        first, _ = self.history.frame_range(segment.start_sample, segment.end_sample)
+        segment.speech_ratio = float(np.mean(flags))
+        duration = segment.duration
+        self.segments_checked += 1
+        self.seconds_checked += duration
+
+        if not self.passes(segment):
+            self.segments_skipped += 1
+            self.seconds_skipped += duration
+            return segment
+        if not trim:
+            return segment
+
+        speech = np.flatnonzero(flags)
+        start = max(segment.start_sample, (first + speech[0]) * self.frame_size - self.pad_samples)
+        end = min(segment.end_sample, (first + speech[-1] + 1) * self.frame_size + self.pad_samples)
+        if start > segment.start_sample or end < segment.end_sample:
+            segment.audio = segment.audio[start - segment.start_sample:end - segment.start_sample]
+            segment.start_sample = start
+            self.segments_trimmed += 1
+            self.seconds_trimmed += duration - segment.duration
+        return segment
+
+    def passes(self, segment: AudioSegment) -> bool:
+        """Whether a segment holds enough speech to be worth transcribing"""
+        return segment.speech_ratio is None or (
+            segment.speech_ratio > 0 and segment.speech_ratio >= self.min_speech_ratio)
+
+    def get_metrics(self) -> dict:
+        """Audio kept away from the model by trimming and skipping"""
+        saved = self.seconds_trimmed + self.seconds_skipped
+        return {
+            'segments_checked': self.segments_checked,
+            'segments_trimmed': self.segments_trimmed,
+            'segments_skipped': self.segments_skipped,
+            'seconds_trimmed': self.seconds_trimmed,
+            'seconds_skipped': self.seconds_skipped,
+            'seconds_saved': saved,
+            'saved_fraction': saved / self.seconds_checked if self.seconds_checked else 0.0,
+        }
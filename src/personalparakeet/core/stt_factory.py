@@ -19,6 +19,7 @@ class STTFactory:
     """Factory for creating STT processors with real hardware"""
     
     _nemo_available = None  # Cache availability check
+    _onnx_available = None
     
     @classmethod
     def check_nemo_availability(cls) -> bool:
@@ -49,6 +50,25 @@ class STTFactory:
             cls._nemo_available = False
             return False
     
+    @classmethod
+    def check_onnx_availability(cls) -> bool:
+        """Check if ONNX Runtime is available for the CPU runtime"""
+        if cls._onnx_available is None:
+            try:
+                import onnxruntime
+                logger.info(f"✓ ONNX Runtime {onnxruntime.__version__} available")
+                cls._onnx_available = True
+            except ImportError as e:
+                logger.error(f"✗ ONNX Runtime not available: {e}")
+                cls._onnx_available = False
+        return cls._onnx_available
+    
+    @classmethod
+    def _check_runtime(cls, config: V3Config) -> bool:
+        if config.audio.stt_runtime == "onnx":
+            return cls.check_onnx_availability()
+        return cls.check_nemo_availability()
+    
     @classmethod
     def create_stt_processor(cls, config: V3Config) -> 'STTProcessor':
         """
@@ -63,12 +83,34 @@ class STTFactory:
         Raises:
             RuntimeError: If NeMo is not available (violates hardware requirements)
         """
+        # Model in a supervised child process (the child builds its own in-process processor)
+        if config.audio.stt_backend == "process":
+            if not config.audio.use_mock_stt and not cls._check_runtime(config):
+                raise RuntimeError(f"CRITICAL: {config.audio.stt_runtime} STT runtime not available "
+                                   "for the STT process backend")
+            logger.info("Creating process-isolated STT backend")
+            from .stt_process_backend import ProcessSTTProcessor
+            return ProcessSTTProcessor(config)
+        if config.audio.stt_backend != "inprocess":
+            logger.warning(f"Unknown STT backend '{config.audio.stt_backend}', running in-process")
+        
         # Check if mock STT is requested
         if config.audio.use_mock_stt:
             logger.info("Mock STT requested - creating mock processor")
             from .mock_stt_processor import MockSTTProcessor
             return MockSTTProcessor(config)
         
+        # CPU runtime: exported graph on ONNX Runtime, no NeMo/PyTorch needed
+        if config.audio.stt_runtime == "onnx":
+            if not cls.check_onnx_availability():
+                raise RuntimeError("CRITICAL: onnxruntime not available for stt_runtime='onnx'.\n"
+                                   "Install it with: pip install -r requirements-onnx.txt")
+            logger.info("Creating ONNX Runtime STT processor")
+            from .onnx_stt_processor import OnnxSTTProcessor
+            return OnnxSTTProcessor(config)
+        if config.audio.stt_runtime != "nemo":
+            logger.warning(f"Unknown STT runtime '{config.audio.stt_runtime}', using NeMo")
+        
         # Real hardware always present - check if ML dependencies available
         if not cls.check_nemo_availability():
             error_msg = (
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Process STT Backend - Runs the STT model in a supervised child process
+Audio is handed over through multiprocessing.shared_memory slots, so the
+model never competes with capture, VAD and injection for the main GIL
+"""
+
+import copy
+import logging
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+import numpy as np
+
+from personalparakeet.config import V3Config
+from .audio_features import AudioFeatures
+
+logger = logging.getLogger(__name__)
+
+
+class SharedAudioSlots:
+    """
+    Fixed number of float32 audio slots in one shared memory block
+
+    The creating process owns the block and unlinks it on close(); other
+    processes attach by name. Slot bookkeeping lives in the owner only.
+    """
+
+    def __init__(self, num_slots: int, slot_samples: int, name: Optional[str] = None):
+        self.num_slots = num_slots
+        self.slot_samples = slot_samples
+        self.owner = name is None
+        size = num_slots * slot_samples * np.dtype(np.float32).itemsize
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach_shared_memory(name)
+        self.slots = np.ndarray((num_slots, slot_samples), dtype=np.float32, buffer=self.shm.buf)
+        self._free = list(range(num_slots))
+        self._available = threading.Condition()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def acquire(self) -> int:
+        return self.acquire_many(1)[0]
+
+    def acquire_many(self, count: int) -> List[int]:
+        """Take `count` slots at once (never holds some while waiting for the rest)"""
+        with self._available:
+            while len(self._free) < count:
+                self._available.wait()
+            return [self._free.pop() for _ in range(count)]
+
+    def release(self, slot: int):
+        with self._available:
+            self._free.append(slot)
+            self._available.notify_all()
+
+    def close(self):
+        self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach without registering the block for cleanup by this process"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+def _stt_child_main(config: V3Config, shm_name: str, num_slots: int, slot_samples: int, conn):
+    """Child process: load the in-process STT processor and serve requests"""
+    import asyncio
+    from .stt_factory import STTFactory
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - stt-child - %(name)s - %(levelname)s - %(message)s')
+    slots = SharedAudioSlots(num_slots, slot_samples, name=shm_name)
+    processor = None
+    try:
+        config.audio.stt_backend = "inprocess"
+        processor = STTFactory.create_stt_processor(config)
+        asyncio.run(processor.initialize())
+        conn.send(("ready", getattr(processor, 'device', None), getattr(processor, 'warmup_timings', [])))
+
+        while True:
+            message = conn.recv()
+            kind = message[0]
+            if kind == "transcribe":
+                _, request_id, slot, length, features = message
+                try:
+                    text = processor.transcribe(slots.slots[slot, :length], features)
+                except Exception as e:
+                    logger.error(f"Child transcription failed: {e}")
+                    text = None
+                conn.send(("result", request_id, text))
+            elif kind == "transcribe_batch":
+                _, request_id, slot_lengths, features = message
+                chunks = [slots.slots[slot, :length] for slot, length in slot_lengths]
+                try:
+                    if hasattr(processor, 'transcribe_batch'):
+                        texts = processor.transcribe_batch(chunks, features)
+                    else:
+                        texts = [processor.transcribe(c, f) for c, f in zip(chunks, features)]
+                except Exception as e:
+                    logger.error(f"Child batch transcription failed: {e}")
+                    texts = [None] * len(chunks)
+                conn.send(("result", request_id, texts))
+            elif kind == "profile":
+                if hasattr(processor, 'set_quality_profile'):
+                    processor.set_quality_profile(message[1])
+            elif kind == "stop":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    except Exception as e:
+        logger.error(f"STT child process failed: {e}")
+        try:
+            conn.send(("error", str(e)))
+        except Exception:
+            pass
+    finally:
+        if processor is not None and hasattr(processor, 'cleanup'):
+            try:
+                result = processor.cleanup()
+                if asyncio.iscoroutine(result):
+                    asyncio.run(result)
+            except Exception:
+                pass
+        slots.close()
+
+
+class ProcessSTTProcessor:
+    """
+    STT processor proxy with the same transcribe() contract as STTProcessor
+
+    The model runs in a spawned child process. Each request copies the audio
+    into a free shared memory slot and sends only (slot, length) over a pipe.
+    A supervisor thread restarts the child if it dies (crash, OOM kill); a
+    request that was in flight when the child died or timed out is retried
+    once on the fresh process, then reported as no transcription.
+    """
+
+    def __init__(self, config: V3Config):
+        self.config = config
+        self.is_initialized = False
+        self.device = None
+        self.quality_profile = "accurate"
+        self.warmup_timings = []  # Reported by the child once its model is warmed up
+
+        sample_rate = config.audio.model_sample_rate
+        self.num_slots = max(1, config.audio.stt_process_slots)
+        self.slot_samples = int(config.audio.stt_process_slot_duration * sample_rate)
+        self.request_timeout = config.audio.stt_process_timeout
+        self.startup_timeout = 300.0  # First model download/load can be slow
+
+        self.slots: Optional[SharedAudioSlots] = None
+        self.process = None
+        self._conn = None
+        self._context = multiprocessing.get_context("spawn")  # Safe with CUDA and threads
+        self._lock = threading.RLock()  # One request (or restart) on the pipe at a time
+        self._next_request_id = 0
+        self._stopping = threading.Event()
+        self._supervisor = None
+
+        # Metrics
+        self.restart_count = 0
+        self.transcription_count = 0
+        self.failed_requests = 0
+        self.last_exit_code = None
+
+    async def initialize(self):
+        """Create the shared slots and start the child process"""
+        self.slots = SharedAudioSlots(self.num_slots, self.slot_samples)
+        self._start_child()
+        self._stopping.clear()
+        self._supervisor = threading.Thread(target=self._supervise, name="STTSupervisor", daemon=True)
+        self._supervisor.start()
+        self.is_initialized = True
+
+    def transcribe(self, audio_chunk: np.ndarray, features: Optional[AudioFeatures] = None) -> Optional[str]:
+        """Transcribe audio in the child process (blocks until the result arrives)
+
+        Features (a few bytes per frame) travel over the pipe with the slot index,
+        so the child doesn't measure the audio again.
+        """
+        if not self.is_initialized:
+            logger.error("STT process backend not initialized")
+            return None
+
+        audio_chunk = np.asarray(audio_chunk, dtype=np.float32).reshape(-1)
+        if len(audio_chunk) > self.slot_samples:
+            # Oversized segments are decoded slot by slot rather than dropped
+            parts = [self.transcribe(audio_chunk[i:i + self.slot_samples])
+                     for i in range(0, len(audio_chunk), self.slot_samples)]
+            return " ".join(p for p in parts if p) or None
+
+        slot = self.slots.acquire()
+        try:
+            self.slots.slots[slot, :len(audio_chunk)] = audio_chunk
+            for _ in range(2):
+                try:
+                    text = self._request("transcribe", slot, len(audio_chunk), features)
+                    self.transcription_count += 1
+                    return text
+                except (EOFError, OSError, BrokenPipeError, TimeoutError) as e:
+                    logger.error(f"STT child process failed during request ({e}) - restarting")
+                    self._restart()
+            self.failed_requests += 1
+            return None
+        finally:
+            self.slots.release(slot)
+
+    def transcribe_batch(self, audio_chunks: List[np.ndarray],
+                         features: Optional[List[Optional[AudioFeatures]]] = None) -> List[Optional[str]]:
+        """Transcribe several segments in one child request (one model call per group of slots)
+
+        Segments longer than a slot go through transcribe() on their own.
+        """
+        if not self.is_initialized:
+            logger.error("STT process backend not initialized")
+            return [None] * len(audio_chunks)
+
+        features = features or [None] * len(audio_chunks)
+        audio_chunks = [np.asarray(a, dtype=np.float32).reshape(-1) for a in audio_chunks]
+        texts: List[Optional[str]] = [None] * len(audio_chunks)
+        fitting = []
+        for i, audio_chunk in enumerate(audio_chunks):
+            if len(audio_chunk) > self.slot_samples:
+                texts[i] = self.transcribe(audio_chunk, features[i])
+            else:
+                fitting.append(i)
+
+        for start in range(0, len(fitting), self.num_slots):
+            group = fitting[start:start + self.num_slots]
+            slots = self.slots.acquire_many(len(group))
+            try:
+                for slot, i in zip(slots, group):
+                    self.slots.slots[slot, :len(audio_chunks[i])] = audio_chunks[i]
+                slot_lengths = [(slot, len(audio_chunks[i])) for slot, i in zip(slots, group)]
+                for _ in range(2):
+                    try:
+                        results = self._request("transcribe_batch", slot_lengths, [features[i] for i in group])
+                        self.transcription_count += len(group)
+                        for i, text in zip(group, results):
+                            texts[i] = text
+                        break
+                    except (EOFError, OSError, BrokenPipeError, TimeoutError) as e:
+                        logger.error(f"STT child process failed during batch request ({e}) - restarting")
+                        self._restart()
+                else:
+                    self.failed_requests += 1
+            finally:
+                for slot in slots:
+                    self.slots.release(slot)
+        return texts
+
+    def set_quality_profile(self, profile: str):
+        """Forward the profile to the child (re-applied after a restart)"""
+        self.quality_profile = profile
+        with self._lock:
+            try:
+                self._conn.send(("profile", profile))
+            except (OSError, BrokenPipeError, AttributeError):
+                pass  # Applied when the child restarts
+
+    def get_performance_stats(self) -> dict:
+        return {
+            'total_transcriptions': self.transcription_count,
+            'restarts': self.restart_count,
+            'failed_requests': self.failed_requests,
+            'last_exit_code': self.last_exit_code,
+            'child_pid': self.process.pid if self.process else None,
+        }
+
+    async def cleanup(self):
+        """Stop the child process and release the shared memory"""
+        self._stopping.set()
+        if self._supervisor:
+            self._supervisor.join(timeout=2.0)
+        with self._lock:
+            self._stop_child()
+        if self.slots:
+            self.slots.close()
+            self.slots = None
+        self.is_initialized = False
+        logger.info("STT process backend cleaned up")
+
+    def _request(self, kind: str, *args):
+        """Send (kind, request_id, *args) and wait for the matching result"""
+        with self._lock:
+            if self.process is None or not self.process.is_alive():
+                raise EOFError("STT child process is not running")
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            self._conn.send((kind, request_id, *args))
+
+            deadline = time.monotonic() + self.request_timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"no STT result after {self.request_timeout:.0f}s")
+                if self._conn.poll(min(remaining, 0.5)):
+                    message = self._conn.recv()
+                    if message[0] == "error":
+                        # The child's fatal-error report; it exits right after sending it
+                        raise EOFError(f"STT child failed: {message[1]}")
+                    kind, reply_id, text = message
+                    if kind == "result" and reply_id == request_id:
+                        return text
+                elif not self.process.is_alive():
+                    raise EOFError(f"STT child exited with code {self.process.exitcode}")
+
+    def _start_child(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_stt_child_main,
+            args=(copy.deepcopy(self.config), self.slots.name, self.num_slots, self.slot_samples, child_conn),
+            name="PersonalParakeetSTT",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        if not parent_conn.poll(self.startup_timeout):
+            process.kill()
+            raise RuntimeError(f"STT child process did not start within {self.startup_timeout:.0f}s")
+        try:
+            message = parent_conn.recv()
+        except EOFError as exc:
+            process.join(timeout=1.0)
+            raise RuntimeError(f"STT child process exited during startup (code {process.exitcode})") from exc
+        if message[0] != "ready":
+            process.join(timeout=5.0)
+            raise RuntimeError(f"STT child process failed to start: {message[1]}")
+
+        self.process = process
+        self._conn = parent_conn
+        self.device = message[1]
+        self.warmup_timings = message[2]
+        if self.quality_profile != "accurate":
+            parent_conn.send(("profile", self.quality_profile))
+        logger.info(f"STT child process ready (pid {process.pid}, device {self.device})")
+
+    def _stop_child(self):
+        if self.process is None:
+            return
+        try:
+            self._conn.send(("stop",))
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=5.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        self.last_exit_code = self.process.exitcode
+        self._conn.close()
+        self.process = None
+        self._conn = None
+
+    def _restart(self, only_if_dead: bool = False):
+        with self._lock:
+            if self._stopping.is_set():
+                return
+            if only_if_dead and self.process is not None and self.process.is_alive():
+                return  # Already replaced by a failing request
+            if self.process is not None:
+                if self.process.is_alive():
+                    self.process.kill()  # Hung request
+                self.process.join(timeout=1.0)
+                self.last_exit_code = self.process.exitcode
+                self._conn.close()
+                self.process = None
+            self.restart_count += 1
+            logger.warning(f"Restarting STT child process (restart #{self.restart_count}, "
+                           f"last exit code {self.last_exit_code})")
+            try:
+                self._start_child()
+            except Exception as e:
+                logger.error(f"STT child process restart failed: {e}")
+
+    def _supervise(self):
+        """Restart a dead child between requests so the next one doesn't pay for it"""
+        backoff = 1.0
+        while not self._stopping.wait(1.0):
+            process = self.process
+            if process is not None and process.is_alive():
+                backoff = 1.0
+                continue
+            self._restart(only_if_dead=True)
+            if self.process is None:
+                self._stopping.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
@@ -8,19 +8,31 @@ import logging
 import asyncio
 import time
 import os
+import copy
+import itertools
+import math
 import torch
 import numpy as np
-from typing import Optional
+from typing import List, Optional, Sequence
 from pathlib import Path
 
 # Import NeMo for Parakeet model
 import nemo.collections.asr as nemo_asr
 
 from personalparakeet.config import V3Config
+from .audio_features import AudioFeatures
 from .cuda_compatibility import CUDACompatibility, get_optimal_device
+from .model_artifact_cache import (CONFIG_FILE, SAFETENSORS_FILE, ModelArtifactCache, artifact_cache_dir,
+                                   load_weights)
+from .onnx_stt_processor import LogMelFeaturizer
+from .quantization import quantization_cache_dir, quantize_torch_encoder
+from .stt_segmentation import segment_durations
+from .stt_stream import StreamingLogMel, STTStream
 
 logger = logging.getLogger(__name__)
 
+PRETRAINED_MODEL = "nvidia/parakeet-tdt-1.1b"
+
 
 class STTProcessor:
     """
@@ -33,6 +45,11 @@ class STTProcessor:
         self.model = None
         self.is_initialized = False
         self.device = None  # Will be set during initialization
+        self.quality_profile = "accurate"  # "fast" is used under backpressure
+        self._default_decoding_cfg = None
+        self.quantization = "none"  # "int8" once the encoder has been quantized
+        self.supports_streaming = False  # Cache-aware encoder: create_stream() / transcribe_stream()
+        self.warmup_timings: List[dict] = []  # Cold/warm latency per warmed-up segment shape
         
         # Performance tracking
         self.transcription_count = 0
@@ -72,38 +89,115 @@ class STTProcessor:
             model_path = self.config.audio.get_stt_model_path()
             
             # Load Parakeet model
-            if model_path and Path(model_path).exists():
-                logger.info(f"Loading model from: {model_path}")
-                self.model = nemo_asr.models.ASRModel.restore_from(
-                    model_path,
-                    map_location=self.device
-                )
-            else:
-                logger.info("Loading model from NVIDIA NGC...")
-                self.model = nemo_asr.models.ASRModel.from_pretrained(
-                    "nvidia/parakeet-tdt-1.1b",
-                    map_location=self.device
-                )
+            model_source = model_path if model_path and Path(model_path).exists() else PRETRAINED_MODEL
+            self.model = self._load_model(model_source)
             
             # Apply optimizations
             if self.device == "cuda":
                 self.model = self.model.to(dtype=torch.float16)
                 logger.info("Using float16 for GPU memory efficiency")
+            elif self.config.audio.stt_cpu_quantization == "int8":
+                # int8 linear kernels: the CPU counterpart of the fp16 cast
+                quantize_torch_encoder(self.model, model_source, quantization_cache_dir(self.config.audio))
+                self.quantization = "int8"
+            elif self.config.audio.stt_cpu_quantization != "none":
+                logger.warning(f"Unknown stt_cpu_quantization '{self.config.audio.stt_cpu_quantization}', using fp32")
             
-            self.is_initialized = True
             load_time = time.time() - start_time
             logger.info(f"Parakeet model loaded successfully in {load_time:.2f}s")
             
+            # Pay lazy kernel/allocator/decoder setup now, not on the user's first utterance
+            if self.config.audio.stt_warmup:
+                batch_size = self.config.audio.stt_max_batch_size
+                self.warm_up(segment_durations(self.config.audio), batch_size=batch_size,
+                             runs=self.config.audio.stt_warmup_runs)
+            
+            self.supports_streaming = self._setup_streaming()
+            self.is_initialized = True
+            
         except Exception as e:
             logger.error(f"Failed to initialize STT processor: {e}")
             raise
     
-    def transcribe(self, audio_chunk: np.ndarray) -> Optional[str]:
+    def _load_model(self, model_source: str):
+        """Restore a .nemo checkpoint or pretrained model, through the artifact cache when enabled"""
+        is_local = Path(model_source).exists()
+        if self.config.audio.stt_artifact_cache:
+            nemo_path = Path(model_source) if is_local else self._pretrained_checkpoint(model_source)
+            if nemo_path is not None:
+                try:
+                    return self._restore_from_artifact_cache(nemo_path)
+                except Exception as e:
+                    logger.warning(f"Model artifact cache failed ({e}) - restoring {nemo_path.name} directly")
+        
+        if is_local:
+            logger.info(f"Loading model from: {model_source}")
+            return nemo_asr.models.ASRModel.restore_from(
+                model_source,
+                map_location=self.device
+            )
+        logger.info("Loading model from NVIDIA NGC...")
+        return nemo_asr.models.ASRModel.from_pretrained(
+            model_source,
+            map_location=self.device
+        )
+    
+    def _pretrained_checkpoint(self, model_name: str) -> Optional[Path]:
+        """The .nemo file behind a Hugging Face hosted pretrained model (downloaded on first use)"""
+        try:
+            from huggingface_hub import hf_hub_download
+            filename = f"{model_name.split('/')[-1]}.nemo"
+            cache_dir = os.environ.get('HUGGINGFACE_HUB_CACHE')
+            try:
+                return Path(hf_hub_download(model_name, filename, cache_dir=cache_dir, local_files_only=True))
+            except Exception:
+                return Path(hf_hub_download(model_name, filename, cache_dir=cache_dir))
+        except Exception as e:
+            logger.info(f"No checkpoint file for {model_name} ({e}) - using from_pretrained")
+            return None
+    
+    def _restore_from_artifact_cache(self, nemo_path: Path):
+        """Build the model from its unpacked cache entry and adopt the memory-mapped weights"""
+        from omegaconf import OmegaConf
+        from nemo.utils.model_utils import import_class_by_path
+        
+        start_time = time.time()
+        cache = ModelArtifactCache(artifact_cache_dir(self.config.audio))
+        was_cached = cache.lookup(nemo_path) is not None
+        entry = cache.prepare(nemo_path)
+        cfg = OmegaConf.load(entry / CONFIG_FILE)
+        model_class = import_class_by_path(cfg.target)
+        weights = load_weights(entry / SAFETENSORS_FILE)
+        
+        # Build the module skeleton without allocating weights, then take the mapped tensors
+        # as parameters (assign=True) so nothing is copied until the device move
+        model = None
+        try:
+            with torch.device("meta"):
+                model = model_class(cfg=cfg, trainer=None)
+            model.load_state_dict(weights, strict=True, assign=True)
+            if any(t.is_meta for t in itertools.chain(model.parameters(), model.buffers())):
+                model = None  # Buffers computed at construction aren't in the checkpoint
+        except Exception as e:
+            logger.debug(f"Meta-device construction failed ({e}) - building on CPU")
+            model = None
+        if model is None:
+            model = model_class(cfg=cfg, trainer=None)
+            model.load_state_dict(weights, strict=True, assign=True)
+        
+        model = model.to(self.device)
+        model.eval()
+        logger.info(f"Model restored from artifact cache{'' if was_cached else ' (built now)'} "
+                    f"in {time.time() - start_time:.2f}s: {entry}")
+        return model
+    
+    def transcribe(self, audio_chunk: np.ndarray, features: Optional[AudioFeatures] = None) -> Optional[str]:
         """
         Transcribe audio chunk to text
         
         Args:
             audio_chunk: Audio data as numpy array (float32)
+            features: Levels already measured upstream (saves another pass over the audio)
             
         Returns:
             Transcribed text or None if transcription fails
@@ -114,62 +208,271 @@ class STTProcessor:
         
         try:
             # Direct synchronous transcription (will run in worker thread)
-            return self._transcribe_sync(audio_chunk)
+            return self._transcribe_sync(audio_chunk, features)
             
         except Exception as e:
             logger.error(f"Transcription error: {e}")
             return None
     
-    def _transcribe_sync(self, audio_chunk: np.ndarray) -> Optional[str]:
-        """Synchronous transcription (runs in thread pool)"""
+    def transcribe_batch(self, audio_chunks: List[np.ndarray],
+                         features: Optional[List[Optional[AudioFeatures]]] = None) -> List[Optional[str]]:
+        """
+        Transcribe several audio segments in one model call
+        
+        Args:
+            audio_chunks: Audio data per segment (float32)
+            features: Levels per segment, or None entries to measure them here
+            
+        Returns:
+            Transcribed text (or None) per segment, in input order
+        """
+        if not self.is_initialized or self.model is None:
+            logger.error("STT processor not initialized")
+            return [None] * len(audio_chunks)
+        
+        try:
+            return self._transcribe_batch_sync(audio_chunks, features or [None] * len(audio_chunks))
+        except Exception as e:
+            logger.error(f"Batch transcription error: {e}")
+            return [None] * len(audio_chunks)
+    
+    def warm_up(self, durations: Sequence[float], batch_size: int = 1, runs: int = 2) -> List[dict]:
+        """
+        Decode dummy segments of each length so first-inference costs are paid up front
+        
+        Runs `runs` passes per segment length (plus one batch of `batch_size` segments
+        at the longest length when batching is enabled) and records the first (cold)
+        and last (warm) latency. Warm-up calls don't count in the performance stats.
+        
+        Returns:
+            One timing dict per warmed-up shape
+        """
+        sample_rate = self.config.audio.model_sample_rate
+        rng = np.random.default_rng(0)
+        shapes = [(d, 1) for d in durations]
+        if batch_size > 1 and durations:
+            shapes.append((max(durations), batch_size))
+        
+        self.warmup_timings = []
+        start_time = time.time()
+        for duration, count in shapes:
+            # Low-level noise: above the silence threshold, so the full decoder runs
+            batch = [(rng.standard_normal(int(duration * sample_rate)) * 0.05).astype(np.float32)
+                     for _ in range(count)]
+            latencies = []
+            try:
+                for _ in range(max(1, runs)):
+                    run_start = time.time()
+                    with torch.inference_mode():
+                        self.model.transcribe(batch, batch_size=count)
+                    if self.device == "cuda":
+                        torch.cuda.synchronize()
+                    latencies.append(time.time() - run_start)
+            except Exception as e:
+                logger.warning(f"STT warm-up failed for {duration:.1f}s x{count}: {e}")
+                continue
+            timing = {'duration': duration, 'batch_size': count,
+                      'cold_ms': latencies[0] * 1000, 'warm_ms': latencies[-1] * 1000}
+            self.warmup_timings.append(timing)
+            logger.info(f"STT warm-up {duration:.1f}s x{count}: cold {timing['cold_ms']:.0f}ms, "
+                        f"warm {timing['warm_ms']:.0f}ms")
+        
+        logger.info(f"STT warm-up finished in {time.time() - start_time:.2f}s")
+        return self.warmup_timings
+    
+    def _setup_streaming(self) -> bool:
+        """Enable incremental decoding on cache-aware encoders (limited left attention context)"""
+        encoder = getattr(self.model, 'encoder', None)
+        if not hasattr(encoder, 'setup_streaming_params') or not hasattr(self.model, 'conformer_stream_step'):
+            return False
+        if encoder.att_context_size[0] < 0:
+            return False  # Full-context attention (Parakeet-TDT): its caches would grow with the utterance
+        if self.model.cfg.preprocessor.get('normalize', 'NA') not in ('NA', None):
+            return False  # Per-utterance feature statistics aren't known until the utterance ends
         try:
-            # Check audio level threshold
-            max_level = np.max(np.abs(audio_chunk))
-            if max_level < self.config.audio.stt_audio_threshold:
-                # Skip transcription for silent audio
-                return None
+            encoder.setup_streaming_params()
+        except Exception as e:
+            logger.warning(f"Cache-aware streaming unavailable: {e}")
+            return False
+        logger.info(f"Cache-aware streaming enabled: {encoder.streaming_cfg.chunk_size} feature frames per step")
+        return True
+    
+    def create_stream(self) -> STTStream:
+        """New per-utterance state: empty feature buffer and the encoder's initial caches"""
+        if not self.supports_streaming:
+            raise RuntimeError("STT model has no cache-aware streaming encoder")
+        preprocessor = self.model.cfg.preprocessor
+        sample_rate = self.config.audio.model_sample_rate
+        window_size = preprocessor.get('window_size', 0.02)
+        featurizer = LogMelFeaturizer(
+            sample_rate=sample_rate,
+            n_mels=preprocessor.get('features', 80),
+            n_fft=preprocessor.get('n_fft') or 2 ** math.ceil(math.log2(window_size * sample_rate)),
+            window_size=window_size,
+            window_stride=preprocessor.get('window_stride', 0.01),
+            preemph=preprocessor.get('preemph', 0.97),
+            normalize="NA",
+        )
+        cache_last_channel, cache_last_time, cache_last_channel_len = \
+            self.model.encoder.get_initial_cache_state(batch_size=1)
+        streaming_cfg = self.model.encoder.streaming_cfg
+        return STTStream(StreamingLogMel(featurizer),
+                         chunk_frames=streaming_cfg.chunk_size,
+                         pre_encode_frames=streaming_cfg.pre_encode_cache_size,
+                         caches={'cache_last_channel': cache_last_channel,
+                                 'cache_last_time': cache_last_time,
+                                 'cache_last_channel_len': cache_last_channel_len})
+    
+    def transcribe_stream(self, stream: STTStream, audio_chunk: np.ndarray,
+                          is_final: bool = False) -> Optional[str]:
+        """
+        Extend an utterance with new audio and decode only what it adds
+        
+        Args:
+            stream: State from create_stream(), one per utterance
+            audio_chunk: Audio following everything already passed to this stream
+            is_final: Flush the trailing frames; the stream takes no more audio
             
+        Returns:
+            Hypothesis for the utterance so far, or None if empty or on error
+        """
+        if not self.is_initialized or self.model is None:
+            logger.error("STT processor not initialized")
+            return None
+        if stream.is_finished:
+            logger.error("STT stream already finished")
+            return None
+        
+        try:
+            dtype = torch.float16 if self.device == "cuda" else torch.float32
+            chunks = list(stream.chunks(audio_chunk, is_final))
             with torch.inference_mode():
+                for index, (signal, new_frames) in enumerate(chunks):
+                    step_start = time.time()
+                    self._stream_step(stream, torch.from_numpy(signal)[None].to(self.device, dtype=dtype),
+                                      is_last=is_final and index == len(chunks) - 1)
+                    stream.record_step(new_frames, time.time() - step_start)
+            stream.is_finished = is_final
+            return stream.text or None
+        except Exception as e:
+            logger.error(f"Streaming transcription error: {e}")
+            return None
+    
+    def _stream_step(self, stream: STTStream, signal: torch.Tensor, is_last: bool):
+        """One conformer_stream_step: encode a chunk against the caches and extend the hypothesis"""
+        previous_hypotheses, previous_pred_out = stream.decoder_state or (None, None)
+        drop = 0 if stream.steps == 0 else self.model.encoder.streaming_cfg.drop_extra_pre_encoded
+        (pred_out, transcriptions, cache_last_channel, cache_last_time, cache_last_channel_len,
+         hypotheses) = self.model.conformer_stream_step(
+            processed_signal=signal,
+            processed_signal_length=torch.tensor([signal.shape[-1]], device=signal.device),
+            cache_last_channel=stream.caches['cache_last_channel'],
+            cache_last_time=stream.caches['cache_last_time'],
+            cache_last_channel_len=stream.caches['cache_last_channel_len'],
+            keep_all_outputs=is_last,
+            previous_hypotheses=previous_hypotheses,
+            previous_pred_out=previous_pred_out,
+            drop_extra_pre_encoded=drop,
+            return_transcription=True,
+        )
+        stream.caches = {'cache_last_channel': cache_last_channel, 'cache_last_time': cache_last_time,
+                         'cache_last_channel_len': cache_last_channel_len}
+        stream.decoder_state = (hypotheses, pred_out)
+        hypothesis = transcriptions[0] if transcriptions else ""
+        stream.text = (getattr(hypothesis, 'text', hypothesis) or "").strip()
+    
+    def _transcribe_sync(self, audio_chunk: np.ndarray, features: Optional[AudioFeatures] = None) -> Optional[str]:
+        """Synchronous transcription (runs in thread pool)"""
+        return self._transcribe_batch_sync([audio_chunk], [features])[0]
+    
+    def _transcribe_batch_sync(self, audio_chunks: List[np.ndarray],
+                               features: List[Optional[AudioFeatures]]) -> List[Optional[str]]:
+        """Synchronous transcription of a batch; silent segments never reach the model"""
+        texts: List[Optional[str]] = [None] * len(audio_chunks)
+        try:
+            batch, positions = [], []
+            for i, (audio_chunk, chunk_features) in enumerate(zip(audio_chunks, features)):
+                # Check audio level threshold
+                max_level = chunk_features.peak if chunk_features is not None else np.max(np.abs(audio_chunk))
+                if max_level < self.config.audio.stt_audio_threshold:
+                    # Skip transcription for silent audio
+                    continue
+                
                 # Ensure audio is in correct format for Parakeet
                 if audio_chunk.dtype != np.float32:
                     audio_chunk = audio_chunk.astype(np.float32)
                 
-                # Log audio chunk info for debugging
-                logger.debug(f"Audio chunk shape: {audio_chunk.shape}, dtype: {audio_chunk.dtype}, max: {np.max(np.abs(audio_chunk)):.4f}")
-                
                 # Ensure 1D array (Parakeet expects list of 1D arrays)
                 if audio_chunk.ndim > 1:
                     audio_chunk = audio_chunk.flatten()
                 
-                # Transcribe with Parakeet
+                # Log audio chunk info for debugging
+                logger.debug(f"Audio chunk shape: {audio_chunk.shape}, dtype: {audio_chunk.dtype}, max: {max_level:.4f}")
+                batch.append(audio_chunk)
+                positions.append(i)
+            
+            if not batch:
+                return texts
+            
+            with torch.inference_mode():
+                # Transcribe with Parakeet - the whole batch is padded and decoded together
                 start_time = time.time()
-                result = self.model.transcribe([audio_chunk])
+                result = self.model.transcribe(batch, batch_size=len(batch))
                 transcription_time = time.time() - start_time
                 
                 # Track performance metrics
-                self.transcription_count += 1
+                self.transcription_count += len(batch)
                 self.total_transcription_time += transcription_time
                 self.transcription_times.append(transcription_time)
                 
-                text = result[0].text if result and result[0].text else ""
+                for i, hypothesis in zip(positions, result or []):
+                    text = hypothesis.text if hypothesis and hypothesis.text else ""
+                    texts[i] = text.strip() or None
                 
                 # Log performance metrics periodically
-                if self.transcription_count % 50 == 0:
+                if len(self.transcription_times) % 50 == 0:
                     avg_time = self.total_transcription_time / self.transcription_count
                     recent_avg = sum(self.transcription_times[-10:]) / min(10, len(self.transcription_times))
                     logger.info(f"STT performance - Count: {self.transcription_count}, "
-                              f"Avg time: {avg_time:.3f}s, Recent avg: {recent_avg:.3f}s, "
-                              f"Current: {transcription_time:.3f}s")
+                              f"Avg time per segment: {avg_time:.3f}s, Recent avg per call: {recent_avg:.3f}s, "
+                              f"Current: {transcription_time:.3f}s for {len(batch)} segment(s)")
                 
-                return text.strip() if text else None
+                return texts
                 
         except torch.cuda.OutOfMemoryError:
             logger.error("GPU out of memory! Clearing cache...")
             torch.cuda.empty_cache()
-            return None
+            return texts
         except Exception as e:
             logger.error(f"Sync transcription error: {e}")
-            return None
+            return texts
+    
+    def set_quality_profile(self, profile: str):
+        """
+        Switch decoding between "accurate" (the model's configured decoding) and
+        "fast" (greedy batch decoding, no beam search)
+        """
+        if profile == self.quality_profile or self.model is None:
+            return
+        
+        try:
+            from omegaconf import open_dict
+            
+            if self._default_decoding_cfg is None:
+                self._default_decoding_cfg = copy.deepcopy(self.model.cfg.decoding)
+            
+            if profile == "fast":
+                decoding_cfg = copy.deepcopy(self._default_decoding_cfg)
+                with open_dict(decoding_cfg):
+                    decoding_cfg.strategy = "greedy_batch"
+            else:
+                decoding_cfg = self._default_decoding_cfg
+            
+            self.model.change_decoding_strategy(decoding_cfg)
+            self.quality_profile = profile
+            logger.info(f"STT quality profile: {profile}")
+        except Exception as e:
+            logger.warning(f"Could not switch STT quality profile to '{profile}': {e}")
     
     async def cleanup(self):
         """Cleanup resources"""
@@ -0,0 +1,707 @@
+#!/usr/bin/env python3
+"""
+STT Segmentation - Decides which slices of the audio stream go to the STT model
+Fixed 4 s blocks, overlapping sliding windows with word-level de-duplication,
+VAD-endpointed utterances, or streaming partials with stable-prefix commit
+"""
+
+import logging
+import math
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from personalparakeet.config import AudioConfig
+from .audio_features import AudioFeatures
+from .audio_ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AudioSegment:
+    """A slice of model-rate audio scheduled for transcription"""
+    segment_id: int
+    start_sample: int  # Absolute sample index in the model-rate stream
+    audio: np.ndarray  # May be a view into a segmenter ring - copy before keeping it
+    sample_rate: int
+    is_final: bool = False  # Last segment before a flush (no more context will follow)
+    is_partial: bool = False  # Interim re-decode of an utterance that is still open
+    utterance_id: Optional[int] = None  # Set by utterance-based segmenters
+    speech_ratio: Optional[float] = None  # Share of VAD speech frames, set by SpeechGate
+    features: Optional[AudioFeatures] = None  # Per-frame levels measured by the VAD pass
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.audio)
+
+    @property
+    def end_sample(self) -> int:
+        return self.start_sample + len(self.audio)
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def start_time(self) -> float:
+        return self.start_sample / self.sample_rate
+
+    @property
+    def end_time(self) -> float:
+        return self.end_sample / self.sample_rate
+
+
+@dataclass
+class PartialTranscription:
+    """Interim hypothesis for an utterance that is still being spoken"""
+    utterance_id: int
+    stable_text: str    # Prefix that will not change any more (already committed)
+    unstable_text: str  # Tail that later hypotheses may still revise
+    is_final: bool = False
+
+    @property
+    def text(self) -> str:
+        return " ".join(t for t in (self.stable_text, self.unstable_text) if t)
+
+
+class Segmenter:
+    """Common interface for STT segmenters used by AudioEngine"""
+
+    uses_speech_flags = False  # True if segments are endpointed on the VAD flags
+    allows_trimming = True  # False if segment positions must stay as emitted (overlap merging)
+
+    def push(self, audio_chunk: np.ndarray, speech_flags=None) -> List[AudioSegment]:
+        raise NotImplementedError
+
+    def flush(self, force: bool = False) -> Optional[AudioSegment]:
+        """Emit buffered audio; `force` also emits tails the mode would normally hold back"""
+        raise NotImplementedError
+
+    def skip(self, num_samples: int):
+        """Advance the sample clock past audio that is not buffered (dropped silence)"""
+        raise NotImplementedError
+
+    def merge_transcript(self, segment: AudioSegment, text: Optional[str]) -> Optional[str]:
+        """Return the part of a segment transcript that is new, committed text"""
+        return text
+
+    def pop_partial(self) -> Optional[PartialTranscription]:
+        """Interim hypothesis produced by the last merge, if the mode has any"""
+        return None
+
+    def reset(self):
+        raise NotImplementedError
+
+
+def merge_segments(segments: List[AudioSegment]) -> AudioSegment:
+    """
+    Combine consecutive segments into one STT batch
+
+    Overlapping windows only contribute audio past the previous segment's end.
+    Gaps between utterances are closed up, so word timing inside the batch
+    is approximate after the first gap. The batch keeps the first segment's
+    id and utterance so stable-prefix state carries over.
+    """
+    first = segments[0]
+    parts = [first.audio]
+    end = first.end_sample
+    for segment in segments[1:]:
+        skip = max(0, end - segment.start_sample)
+        if skip < segment.num_samples:
+            parts.append(segment.audio[skip:])
+        end = max(end, segment.end_sample)
+    features = None
+    if all(s.features is not None for s in segments):
+        # Overlapping windows count their shared frames twice - fine for levels
+        features = AudioFeatures.concatenate([s.features for s in segments])
+    return AudioSegment(first.segment_id, first.start_sample, np.concatenate(parts),
+                        first.sample_rate, is_final=segments[-1].is_final,
+                        utterance_id=first.utterance_id, features=features)
+
+
+class FixedWindowSegmenter(Segmenter):
+    """Back-to-back fixed-length segments (the original 4 s STT buffer)"""
+
+    def __init__(self, sample_rate: int, window_duration: float = 4.0,
+                 min_flush_duration: float = 0.5):
+        self.sample_rate = sample_rate
+        self.window_samples = int(window_duration * sample_rate)
+        self.min_flush_samples = int(min_flush_duration * sample_rate)
+        # 2x window for headroom - reads are zero-copy views
+        self.ring = AudioRingBuffer(2 * self.window_samples)
+        self._next_segment_id = 0
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    def push(self, audio_chunk: np.ndarray, speech_flags=None) -> List[AudioSegment]:
+        """Buffer a chunk and return any segments that are now complete (VAD flags unused)"""
+        self.ring.write(audio_chunk)
+        segments = []
+        while len(self.ring) >= self.window_samples:
+            start = self.ring.start_index
+            segments.append(self._make_segment(start, self.ring.read(self.window_samples)))
+        return segments
+
+    def flush(self, force: bool = False) -> Optional[AudioSegment]:
+        """Emit leftover audio during quiet periods so trailing speech isn't lost
+
+        Tails up to min_flush_duration wait for more audio unless `force` is
+        set - the buffer is about to be dropped (skip) and they would be lost.
+        """
+        if len(self.ring) == 0 or (len(self.ring) <= self.min_flush_samples and not force):
+            return None
+        start = self.ring.start_index
+        return self._make_segment(start, self.ring.read(), is_final=True)
+
+    def skip(self, num_samples: int):
+        self.ring.skip(num_samples)
+
+    def reset(self):
+        self.ring.clear()
+
+    def _make_segment(self, start: int, audio: np.ndarray, is_final: bool = False) -> AudioSegment:
+        segment = AudioSegment(self._next_segment_id, start, audio, self.sample_rate, is_final)
+        self._next_segment_id += 1
+        return segment
+
+
+class HypothesisMerger:
+    """
+    Merges transcripts of overlapping windows into one word stream
+
+    Each window's transcript overlaps words that were already committed from
+    earlier windows. The overlap is located by matching the head of the new
+    hypothesis against the tail of the committed words (allowing a few leading
+    words to be skipped, since the left window edge may cut a word in half).
+    Words that fall in the right context of the window are held back, because
+    the right edge may also cut a word; the next window sees them whole.
+    """
+
+    _NORMALIZE = re.compile(r"[^\w']+")
+
+    def __init__(self, hop_duration: float, left_context: float = 0.25,
+                 right_context: float = 0.25, history_words: int = 64):
+        self.hop_duration = hop_duration
+        self.left_context = left_context
+        self.right_context = right_context
+        self.history_words = history_words
+
+        self._history: List[str] = []  # Normalized committed words (tail only)
+        self._pending: List[str] = []  # Raw words held back from the last hypothesis
+
+    def merge(self, text: Optional[str], duration: float, is_final: bool = False) -> str:
+        """
+        Merge one window hypothesis
+
+        Args:
+            text: Transcript of the window (None/empty for silence)
+            duration: Length of the window in seconds
+            is_final: Commit held-back words too (no further windows follow)
+
+        Returns:
+            Newly committed words, space-separated ("" if nothing new)
+        """
+        words = text.split() if text else []
+        if not words:
+            # Silence: nothing can still change the held-back words
+            return self.flush()
+
+        holdback = 0
+        if not is_final and self.right_context > 0:
+            holdback = math.ceil(len(words) * self.right_context / max(duration, 1e-6))
+        stable = words[:len(words) - holdback] if holdback else words
+        self._pending = words[len(words) - holdback:] if holdback else []
+
+        start = self._find_new_words(words, stable, duration)
+        new_words = stable[start:]
+        self._remember(new_words)
+        return " ".join(new_words)
+
+    def flush(self) -> str:
+        """Commit held-back words"""
+        words, self._pending = self._pending, []
+        self._remember(words)
+        return " ".join(words)
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def reset(self):
+        self._history = []
+        self._pending = []
+
+    def _find_new_words(self, words: List[str], stable: List[str], duration: float) -> int:
+        """Index of the first stable word that hasn't been committed yet"""
+        if not self._history:
+            return 0
+
+        norm = [self._normalize(w) for w in stable]
+        max_skip = math.ceil(len(words) * self.left_context / max(duration, 1e-6)) + 1
+        best_k, best_s = 0, 0
+        for s in range(min(max_skip, len(norm)) + 1):
+            max_k = min(len(self._history), len(norm) - s)
+            for k in range(max_k, best_k, -1):
+                if self._history[-k:] == norm[s:s + k]:
+                    best_k, best_s = k, s
+                    break
+
+        # A single matching word is only trusted when it's all we have to go on
+        if best_k >= 2 or (best_k == 1 and len(self._history) == 1):
+            return best_s + best_k
+
+        # No reliable overlap - estimate from timing how much was already committed
+        committed = max(0.0, duration - self.hop_duration - self.right_context)
+        return min(len(stable), round(len(words) * committed / max(duration, 1e-6)))
+
+    def _remember(self, words: List[str]):
+        if not words:
+            return
+        self._history.extend(self._normalize(w) for w in words)
+        del self._history[:-self.history_words]
+
+    @classmethod
+    def _normalize(cls, word: str) -> str:
+        return cls._NORMALIZE.sub("", word.lower())
+
+
+class SlidingWindowSegmenter(Segmenter):
+    """
+    Overlapping windows emitted every hop
+
+    A window covering the newest `window_duration` seconds is scheduled every
+    `hop_duration` seconds of new audio, so the first words reach the model
+    after one hop instead of a full fixed window. Overlapping transcripts are
+    merged word by word by HypothesisMerger.
+    """
+
+    allows_trimming = False
+
+    def __init__(self, sample_rate: int, window_duration: float = 2.0,
+                 hop_duration: float = 0.5, left_context: float = 0.25,
+                 right_context: float = 0.25):
+        if hop_duration <= 0 or window_duration < hop_duration:
+            raise ValueError("Sliding window needs 0 < hop_duration <= window_duration")
+
+        self.sample_rate = sample_rate
+        self.window_samples = int(window_duration * sample_rate)
+        self.hop_samples = int(hop_duration * sample_rate)
+        self.ring = AudioRingBuffer(self.window_samples)
+        self.merger = HypothesisMerger(hop_duration, left_context, right_context)
+
+        self._new_samples = 0  # Samples received since the last emitted window
+        self._next_segment_id = 0
+
+    def __len__(self) -> int:
+        return self._new_samples
+
+    def push(self, audio_chunk: np.ndarray, speech_flags=None) -> List[AudioSegment]:
+        """Buffer a chunk and return a window for every completed hop (VAD flags unused)"""
+        segments = []
+        offset = 0
+        # Walk the chunk hop by hop so large chunks still yield every window
+        while offset < len(audio_chunk):
+            take = min(len(audio_chunk) - offset, self.hop_samples - self._new_samples)
+            self.ring.write(audio_chunk[offset:offset + take])
+            self._new_samples += take
+            offset += take
+            if self._new_samples >= self.hop_samples:
+                segments.append(self._emit_window())
+                if offset < len(audio_chunk):
+                    # Segment views alias the ring; later writes would overwrite them
+                    segments[-1].audio = segments[-1].audio.copy()
+        return segments
+
+    def flush(self, force: bool = False) -> Optional[AudioSegment]:
+        """Final window for trailing audio and held-back words"""
+        if self._new_samples == 0 and not self.merger.has_pending:
+            return None
+        if len(self.ring) == 0:
+            return None
+        return self._emit_window(is_final=True)
+
+    def merge_transcript(self, segment: AudioSegment, text: Optional[str]) -> Optional[str]:
+        """Return only the words of this window that haven't been committed"""
+        return self.merger.merge(text, segment.duration, segment.is_final)
+
+    def skip(self, num_samples: int):
+        self.ring.skip(num_samples)
+        self._new_samples = 0
+
+    def reset(self):
+        self.ring.clear()
+        self.merger.reset()
+        self._new_samples = 0
+
+    def _emit_window(self, is_final: bool = False) -> AudioSegment:
+        audio = self.ring.latest(self.window_samples)
+        segment = AudioSegment(self._next_segment_id, self.ring.total_written - len(audio),
+                               audio, self.sample_rate, is_final)
+        self._next_segment_id += 1
+        self._new_samples = 0
+        return segment
+
+
+class VADEndpointSegmenter(Segmenter):
+    """
+    Utterance segments from speech onset to the detected pause
+
+    Audio is only buffered while the VAD reports speech (plus a short pre-roll
+    so soft onsets aren't clipped). A segment is closed once `endpoint_silence`
+    seconds of non-speech follow the last speech frame, force-split when it
+    reaches `max_segment_duration`, and dropped if it holds less than
+    `min_segment_duration` of speech. All timing is counted in samples.
+    """
+
+    uses_speech_flags = True
+
+    def __init__(self, sample_rate: int, min_segment_duration: float = 0.3,
+                 max_segment_duration: float = 8.0, endpoint_silence: float = 0.5,
+                 padding: float = 0.2):
+        if max_segment_duration <= max(padding, 0) or min_segment_duration > max_segment_duration:
+            raise ValueError("VAD endpointing needs padding < max_segment_duration and "
+                             "min_segment_duration <= max_segment_duration")
+
+        self.sample_rate = sample_rate
+        self.min_samples = int(min_segment_duration * sample_rate)
+        self.max_samples = int(max_segment_duration * sample_rate)
+        self.endpoint_samples = int(endpoint_silence * sample_rate)
+        self.pad_samples = int(padding * sample_rate)
+        self.ring = AudioRingBuffer(self.max_samples + self.pad_samples)
+
+        self._in_speech = False
+        self._speech_samples = 0   # Speech samples in the open segment
+        self._silence_samples = 0  # Non-speech samples since the last speech frame
+        self._live_segment: Optional[AudioSegment] = None  # Emitted segment still aliasing the ring
+        self._next_segment_id = 0
+        self._utterance_id = 0  # Utterance currently being buffered
+
+        # Metrics
+        self.forced_splits = 0
+        self.discarded_segments = 0
+
+    def __len__(self) -> int:
+        return len(self.ring) if self._in_speech else 0
+
+    def push(self, audio_chunk: np.ndarray, speech_flags=None) -> List[AudioSegment]:
+        """
+        Buffer a chunk and return the segments it closed
+
+        Args:
+            audio_chunk: Model-rate audio
+            speech_flags: VAD decision(s) for the chunk - a single flag or one flag
+                per equal-length frame. None treats the chunk as speech.
+        """
+        self._live_segment = None  # Segments from earlier pushes were already consumed
+        flags = np.atleast_1d(True if speech_flags is None else speech_flags)
+        frame_len = max(1, len(audio_chunk) // len(flags))
+
+        segments = []
+        for i, is_speech in enumerate(flags):
+            start = i * frame_len
+            end = len(audio_chunk) if i == len(flags) - 1 else start + frame_len
+            self._push_frame(audio_chunk[start:end], bool(is_speech), segments)
+        return segments
+
+    def flush(self, force: bool = False) -> Optional[AudioSegment]:
+        """Close the open segment during quiet periods"""
+        if not self._in_speech:
+            return None
+        self._live_segment = None
+        return self._close_segment(is_final=True)
+
+    def reset(self):
+        self.ring.clear()
+        self._in_speech = False
+        self._speech_samples = 0
+        self._silence_samples = 0
+        self._live_segment = None
+
+    def _push_frame(self, frame: np.ndarray, is_speech: bool, segments: List[AudioSegment]):
+        if not self._in_speech:
+            if not is_speech:
+                # Idle: only keep the pre-roll
+                self._write(frame)
+                self.ring.consume(len(self.ring) - self.pad_samples)
+                return
+            # Onset: the segment starts with the buffered pre-roll
+            self._in_speech = True
+            self._speech_samples = 0
+            self._silence_samples = 0
+
+        while len(frame):
+            take = min(len(frame), self.max_samples - len(self.ring))
+            self._write(frame[:take])
+            frame = frame[take:]
+            if is_speech:
+                self._speech_samples += take
+                self._silence_samples = 0
+            else:
+                self._silence_samples += take
+
+            if len(self.ring) >= self.max_samples:
+                # Long monologue - split here and keep the segment open
+                self.forced_splits += 1
+                self._emit(segments, self._close_segment(keep_open=True))
+
+        if self._in_speech and self._silence_samples >= self.endpoint_samples:
+            self._emit(segments, self._close_segment())
+
+    def _close_segment(self, is_final: bool = False, keep_open: bool = False) -> Optional[AudioSegment]:
+        # Trailing silence beyond the pad stays in the ring as the next pre-roll
+        tail = 0 if keep_open else max(0, self._silence_samples - self.pad_samples)
+        start = self.ring.start_index
+        audio = self.ring.read(len(self.ring) - tail)
+        speech_samples = self._speech_samples
+
+        utterance_id = self._utterance_id
+        self._utterance_id += 1
+        self._speech_samples = 0
+        if not keep_open:
+            self._in_speech = False
+            self._silence_samples = 0
+            self.ring.consume(len(self.ring) - self.pad_samples)
+
+        if speech_samples < self.min_samples:
+            self.discarded_segments += 1
+            return None
+
+        segment = AudioSegment(self._next_segment_id, start, audio, self.sample_rate, is_final,
+                               utterance_id=utterance_id)
+        self._next_segment_id += 1
+        return segment
+
+    def _emit(self, segments: List[AudioSegment], segment: Optional[AudioSegment]):
+        if segment is not None:
+            segments.append(segment)
+            self._live_segment = segment
+
+    def _write(self, frame: np.ndarray):
+        if self._live_segment is not None:
+            # Segment views alias the ring; detach before it gets overwritten
+            self._live_segment.audio = self._live_segment.audio.copy()
+            self._live_segment = None
+        self.ring.write(frame)
+
+
+class StablePrefixTracker:
+    """
+    Stable-prefix commit for repeated re-decodes of one utterance
+
+    A word becomes stable once two consecutive hypotheses agree on it and on
+    every word before it (local agreement). Stable words are committed once
+    and never revised; the rest of the latest hypothesis stays unstable.
+    """
+
+    def __init__(self):
+        self.committed: List[str] = []
+        self._previous: List[str] = []  # Normalized words of the last hypothesis
+
+    def update(self, text: Optional[str], is_final: bool = False):
+        """
+        Feed the next hypothesis
+
+        Returns:
+            (newly committed words, unstable tail words)
+        """
+        words = text.split() if text else []
+        start = len(self.committed)
+
+        if is_final:
+            new_words = words[start:]
+            self.committed.extend(new_words)
+            self._previous = []
+            return new_words, []
+
+        norm = [HypothesisMerger._normalize(w) for w in words]
+        agreed = 0
+        for a, b in zip(norm, self._previous):
+            if a != b:
+                break
+            agreed += 1
+        self._previous = norm
+
+        new_words = words[start:agreed] if agreed > start else []
+        self.committed.extend(new_words)
+        return new_words, words[len(self.committed):]
+
+    def reset(self):
+        self.committed = []
+        self._previous = []
+
+
+class StreamingSegmenter(VADEndpointSegmenter):
+    """
+    VAD utterances re-decoded every `partial_interval` while they are spoken
+
+    Interim segments cover the open utterance from its onset; their
+    transcripts go through StablePrefixTracker so only the agreed prefix is
+    committed (and injected). The closing segment commits whatever remains.
+    Latency from onset to the first partial and from endpoint to the final
+    commit is recorded per utterance.
+    """
+
+    def __init__(self, sample_rate: int, partial_interval: float = 0.3, **kwargs):
+        super().__init__(sample_rate, **kwargs)
+        self.partial_samples = max(1, int(partial_interval * sample_rate))
+        self.tracker = StablePrefixTracker()
+
+        self._since_partial = 0
+        self._tracked_utterance: Optional[int] = None
+        self._partial: Optional[PartialTranscription] = None
+        self._onset_times = {}     # utterance_id -> monotonic time the onset was buffered
+        self._endpoint_times = {}  # utterance_id -> monotonic time the utterance was closed
+        self._first_partial_seen = set()
+
+        # Latency metrics (seconds, most recent utterances)
+        self.first_partial_latencies = deque(maxlen=100)
+        self.final_commit_latencies = deque(maxlen=100)
+
+    def merge_transcript(self, segment: AudioSegment, text: Optional[str]) -> Optional[str]:
+        """Commit the newly stable words and stage the partial result"""
+        utterance_id = segment.utterance_id
+        now = time.monotonic()
+        if utterance_id != self._tracked_utterance:
+            self.tracker.reset()
+            self._tracked_utterance = utterance_id
+
+        if segment.is_partial:
+            new_words, unstable = self.tracker.update(text)
+            if text and utterance_id not in self._first_partial_seen:
+                self._first_partial_seen.add(utterance_id)
+                onset = self._onset_times.get(utterance_id)
+                if onset is not None:
+                    self.first_partial_latencies.append(now - onset)
+            self._partial = PartialTranscription(
+                utterance_id, " ".join(self.tracker.committed), " ".join(unstable))
+        else:
+            new_words, _ = self.tracker.update(text, is_final=True)
+            endpoint = self._endpoint_times.pop(utterance_id, None)
+            if endpoint is not None:
+                self.final_commit_latencies.append(now - endpoint)
+            self._onset_times.pop(utterance_id, None)
+            self._first_partial_seen.discard(utterance_id)
+            self._partial = PartialTranscription(
+                utterance_id, " ".join(self.tracker.committed), "", is_final=True)
+            self.tracker.reset()
+            self._tracked_utterance = None
+
+        return " ".join(new_words)
+
+    def pop_partial(self) -> Optional[PartialTranscription]:
+        partial, self._partial = self._partial, None
+        return partial
+
+    def get_latency_stats(self) -> dict:
+        """Average and last first-partial / final-commit latency in ms"""
+        stats = {}
+        for name, values in (('first_partial', self.first_partial_latencies),
+                             ('final_commit', self.final_commit_latencies)):
+            stats[f'{name}_avg_ms'] = sum(values) / len(values) * 1000 if values else 0.0
+            stats[f'{name}_last_ms'] = values[-1] * 1000 if values else 0.0
+        return stats
+
+    def reset(self):
+        super().reset()
+        self.tracker.reset()
+        self._since_partial = 0
+        self._tracked_utterance = None
+        self._partial = None
+        self._onset_times.clear()
+        self._endpoint_times.clear()
+        self._first_partial_seen.clear()
+
+    def _push_frame(self, frame: np.ndarray, is_speech: bool, segments: List[AudioSegment]):
+        was_speaking = self._in_speech
+        super()._push_frame(frame, is_speech, segments)
+        if not self._in_speech:
+            return
+        if not was_speaking:
+            self._onset_times[self._utterance_id] = time.monotonic()
+            self._since_partial = 0
+
+        self._since_partial += len(frame)
+        # Partials only start once the utterance can no longer be discarded as a blip,
+        # and trailing silence waits for the endpoint's final segment instead
+        if (is_speech and self._since_partial >= self.partial_samples
+                and self._speech_samples >= self.min_samples):
+            self._since_partial = 0
+            self._emit(segments, AudioSegment(
+                self._next_segment_id, self.ring.start_index, self.ring.peek(), self.sample_rate,
+                is_partial=True, utterance_id=self._utterance_id))
+            self._next_segment_id += 1
+
+    def _close_segment(self, is_final: bool = False, keep_open: bool = False) -> Optional[AudioSegment]:
+        utterance_id = self._utterance_id
+        segment = super()._close_segment(is_final, keep_open)
+        now = time.monotonic()
+        if segment is None:
+            self._onset_times.pop(utterance_id, None)
+        else:
+            self._endpoint_times[utterance_id] = now
+        if keep_open:
+            # The continuation of a force-split monologue is a new utterance
+            self._onset_times[self._utterance_id] = now
+        self._since_partial = 0
+        return segment
+
+
+def create_segmenter(audio_config: AudioConfig, sample_rate: int,
+                     fixed_window_duration: float = 4.0):
+    """Build the segmenter selected by audio_config.stt_segmentation_mode"""
+    mode = audio_config.stt_segmentation_mode
+    if mode == "sliding":
+        logger.info(f"Sliding-window STT: window={audio_config.stt_window_duration}s, "
+                    f"hop={audio_config.stt_hop_duration}s, "
+                    f"context={audio_config.stt_left_context}s/{audio_config.stt_right_context}s")
+        return SlidingWindowSegmenter(
+            sample_rate,
+            window_duration=audio_config.stt_window_duration,
+            hop_duration=audio_config.stt_hop_duration,
+            left_context=audio_config.stt_left_context,
+            right_context=audio_config.stt_right_context,
+        )
+    if mode == "streaming":
+        logger.info(f"Streaming STT: partials every {audio_config.stt_partial_interval}s, "
+                    f"endpoint after {audio_config.stt_endpoint_silence}s silence")
+        return StreamingSegmenter(
+            sample_rate,
+            partial_interval=audio_config.stt_partial_interval,
+            min_segment_duration=audio_config.stt_min_segment_duration,
+            max_segment_duration=audio_config.stt_max_segment_duration,
+            endpoint_silence=audio_config.stt_endpoint_silence,
+            padding=audio_config.stt_segment_padding,
+        )
+    if mode == "vad":
+        logger.info(f"VAD endpointing STT: segments {audio_config.stt_min_segment_duration}s-"
+                    f"{audio_config.stt_max_segment_duration}s, "
+                    f"endpoint after {audio_config.stt_endpoint_silence}s silence")
+        return VADEndpointSegmenter(
+            sample_rate,
+            min_segment_duration=audio_config.stt_min_segment_duration,
+            max_segment_duration=audio_config.stt_max_segment_duration,
+            endpoint_silence=audio_config.stt_endpoint_silence,
+            padding=audio_config.stt_segment_padding,
+        )
+    if mode != "fixed":
+        logger.warning(f"Unknown STT segmentation mode '{mode}', using fixed windows")
+    return FixedWindowSegmenter(sample_rate, window_duration=fixed_window_duration)
+
+
+def segment_durations(audio_config: AudioConfig, fixed_window_duration: float = 4.0) -> List[float]:
+    """Segment lengths the configured mode hands to STT (shortest to longest), for model warm-up"""
+    mode = audio_config.stt_segmentation_mode
+    if mode == "sliding":
+        return [audio_config.stt_window_duration]
+    if mode in ("vad", "streaming"):
+        shortest = audio_config.stt_min_segment_duration + 2 * audio_config.stt_segment_padding
+        if mode == "streaming":
+            shortest = min(shortest, audio_config.stt_partial_interval)
+        return sorted({round(shortest, 3), audio_config.stt_max_segment_duration})
+    return [fixed_window_duration]
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+STT Stream - Per-utterance state for cache-aware incremental decoding
+Log-mel features are computed only for new audio and cut into fixed-size
+encoder chunks; the encoder's activation caches carry the left context, so
+every step costs the same however long the utterance has run
+"""
+
+from collections import deque
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class StreamingLogMel:
+    """
+    Incremental log-mel frames for one stream
+
+    Produces exactly the frames the featurizer would compute on the whole
+    stream at once (centered STFT with zero padding, pre-emphasis carried
+    across calls): a frame is emitted as soon as its window is complete and
+    the trailing frames on finish(). Needs a featurizer without
+    whole-utterance normalization - cache-aware models use normalize "NA".
+    """
+
+    def __init__(self, featurizer):
+        if featurizer.normalize not in (None, "NA", "none"):
+            raise ValueError(f"Streaming features need normalize='NA', not '{featurizer.normalize}'")
+        self.featurizer = featurizer
+        self.n_mels = featurizer.n_mels
+        self._buffer = np.zeros(featurizer.n_fft // 2, dtype=np.float32)  # Leading STFT padding
+        self._last_sample: Optional[float] = None
+        self.samples = 0
+        self.frames = 0
+
+    def accept(self, audio: np.ndarray) -> np.ndarray:
+        """(n_mels, k) features of the frames completed by this audio"""
+        x = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if len(x):
+            if self.featurizer.preemph:
+                previous = x[0] if self._last_sample is None else self._last_sample
+                emphasized = x - self.featurizer.preemph * np.concatenate(([previous], x[:-1]))
+                if self._last_sample is None:
+                    emphasized[0] = x[0]
+                self._last_sample = float(x[-1])
+                x = emphasized
+            self._buffer = np.concatenate((self._buffer, x))
+            self.samples += len(x)
+        ready = (len(self._buffer) - self.featurizer.n_fft) // self.featurizer.hop + 1
+        return self._take(max(0, ready))
+
+    def finish(self) -> np.ndarray:
+        """Features of the remaining frames (trailing STFT padding added)"""
+        self._buffer = np.concatenate((self._buffer, np.zeros(self.featurizer.n_fft // 2, dtype=np.float32)))
+        return self._take(max(0, self.featurizer.num_frames(self.samples) - self.frames))
+
+    def _take(self, count: int) -> np.ndarray:
+        if count == 0:
+            return np.zeros((self.n_mels, 0), dtype=np.float32)
+        hop = self.featurizer.hop
+        frames = np.lib.stride_tricks.sliding_window_view(self._buffer, self.featurizer.n_fft)[::hop][:count]
+        features = self.featurizer.log_mel(frames)
+        self._buffer = self._buffer[count * hop:]
+        self.frames += count
+        return features
+
+
+def _first_and_rest(value: Union[int, Sequence[int]]) -> Tuple[int, int]:
+    """NeMo streaming sizes are either one int or [first step, later steps]"""
+    if isinstance(value, (list, tuple)):
+        return int(value[0]), int(value[-1])
+    return int(value), int(value)
+
+
+class STTStream:
+    """
+    One utterance decoded incrementally by a cache-aware encoder
+
+    Audio goes in as it arrives; chunks() turns it into encoder inputs of
+    `chunk_frames` new feature frames, each preceded by `pre_encode_frames`
+    of earlier features (zeros before the stream start) for the subsampling
+    convolution. Everything older than that reaches the encoder only through
+    `caches`, which the processor replaces after each step. `decoder_state`
+    is the processor's incremental decoding state and `text` the hypothesis
+    so far.
+
+    Not thread-safe: used by the thread that runs the model.
+    """
+
+    def __init__(self, features: StreamingLogMel,
+                 chunk_frames: Union[int, Sequence[int]],
+                 pre_encode_frames: Union[int, Sequence[int]] = 0,
+                 caches: Optional[Dict[str, object]] = None):
+        self.features = features
+        self.chunk_frames = _first_and_rest(chunk_frames)
+        self.pre_encode_frames = _first_and_rest(pre_encode_frames)
+        self.caches = caches or {}
+        self.decoder_state = None
+        self.text = ""
+        self.is_finished = False
+
+        n_mels = features.n_mels
+        self._pending = np.zeros((n_mels, 0), dtype=np.float32)
+        self._context = np.zeros((n_mels, max(self.pre_encode_frames)), dtype=np.float32)
+        self._chunks_made = 0
+
+        # Metrics
+        self.steps = 0
+        self.frames_encoded = 0
+        self.step_frames = deque(maxlen=100)  # New frames per encoder step
+        self.step_times = deque(maxlen=100)   # Seconds per encoder step
+
+    def chunks(self, audio: np.ndarray, is_final: bool = False) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Encoder inputs made ready by this audio
+
+        Yields:
+            (features with left context prepended, number of new frames); the
+            last chunk of a final call may be shorter than chunk_frames
+        """
+        new = self.features.accept(audio)
+        if is_final:
+            new = np.concatenate((new, self.features.finish()), axis=1)
+        self._pending = np.concatenate((self._pending, new), axis=1)
+
+        while True:
+            later = self._chunks_made > 0
+            size = self.chunk_frames[later]
+            available = self._pending.shape[1]
+            if available < size and not (is_final and available):
+                return
+            chunk, self._pending = self._pending[:, :size], self._pending[:, size:]
+            context_frames = self.pre_encode_frames[later]
+            context = self._context[:, self._context.shape[1] - context_frames:] if context_frames else \
+                self._context[:, :0]
+            if self._context.shape[1]:
+                self._context = np.concatenate((self._context, chunk), axis=1)[:, -self._context.shape[1]:]
+            self._chunks_made += 1
+            yield np.concatenate((context, chunk), axis=1), chunk.shape[1]
+
+    def record_step(self, new_frames: int, seconds: float):
+        self.steps += 1
+        self.frames_encoded += new_frames
+        self.step_frames.append(new_frames)
+        self.step_times.append(seconds)
+
+    def get_metrics(self) -> dict:
+        return {
+            'steps': self.steps,
+            'frames_encoded': self.frames_encoded,
+            'feature_frames': self.features.frames,
+            'avg_step_ms': sum(self.step_times) / len(self.step_times) * 1000 if self.step_times else 0.0,
+        }
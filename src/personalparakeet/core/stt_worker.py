@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+STT Worker - Runs transcription off the audio consumer thread
+Segments queue up in a bounded FIFO and results come back in submission order
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .stt_segmentation import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class STTWorker:
+    """
+    Single background thread that transcribes segments in order
+
+    The audio consumer only enqueues segments, so resampling, VAD and pause
+    detection keep running at chunk cadence however long inference takes.
+    One worker thread means results are delivered strictly in submission
+    order; every result carries its segment (and segment_id).
+
+    The queue is bounded. submit() waits for space instead of dropping a
+    segment, and queue depth is exposed so backpressure can shed load before
+    that happens. A streaming partial whose successor is already queued is
+    skipped: the newer segment re-decodes the same audio.
+
+    With `transcribe_batch`, segments that have backed up in the queue are
+    taken together (up to `max_batch_size`, waiting at most `max_batch_wait`
+    for more) and decoded in one call; results are still delivered one
+    segment at a time in submission order. An idle worker never waits unless
+    `max_batch_wait` is set, so batching costs no latency without a backlog.
+    """
+
+    def __init__(self, transcribe: Callable[[AudioSegment], Optional[str]],
+                 on_result: Callable[[AudioSegment, Optional[str]], None],
+                 max_pending: int = 8,
+                 transcribe_batch: Optional[Callable[[List[AudioSegment]], List[Optional[str]]]] = None,
+                 max_batch_size: int = 1,
+                 max_batch_wait: float = 0.0):
+        if max_pending <= 0:
+            raise ValueError("STTWorker needs a positive queue size")
+
+        self.transcribe = transcribe
+        self.on_result = on_result
+        self.max_pending = max_pending
+        self.transcribe_batch = transcribe_batch
+        self.max_batch_size = max(1, max_batch_size) if transcribe_batch else 1
+        self.max_batch_wait = max_batch_wait
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+        # Metrics
+        self.segments_submitted = 0
+        self.segments_completed = 0
+        self.stale_partials_skipped = 0
+        self.blocked_submits = 0      # submit() calls that had to wait for space
+        self.blocked_seconds = 0.0
+        self.last_segment_id: Optional[int] = None
+        self.last_queue_wait = 0.0    # Seconds the last segment waited before STT started
+        self.batches_run = 0
+        self.largest_batch = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._thread = threading.Thread(target=self._run, name="STTWorker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Finish every queued segment, then stop the thread (timeout None waits for all)
+
+        Returns:
+            False if the queue could not be drained within `timeout`
+        """
+        if not self.is_running:
+            return True
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("STT worker queue did not drain - stopping with segments pending")
+            return False
+        self._thread.join(timeout=timeout)
+        drained = not self._thread.is_alive()
+        if not drained:
+            logger.warning(f"STT worker still busy after {timeout}s")
+        self._thread = None
+        return drained
+
+    def submit(self, segment: AudioSegment):
+        """Queue a segment for transcription, waiting while the queue is full"""
+        # Segment views alias segmenter rings - the worker needs its own copy
+        segment.audio = segment.audio.copy()
+        item = (segment, time.monotonic())
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.blocked_submits += 1
+            wait_start = time.monotonic()
+            self._queue.put(item)
+            self.blocked_seconds += time.monotonic() - wait_start
+        self.segments_submitted += 1
+
+    def qsize(self) -> int:
+        """Segments waiting for the model"""
+        return self._queue.qsize()
+
+    def get_metrics(self) -> dict:
+        return {
+            'queue_depth': self.qsize(),
+            'max_pending': self.max_pending,
+            'segments_submitted': self.segments_submitted,
+            'segments_completed': self.segments_completed,
+            'stale_partials_skipped': self.stale_partials_skipped,
+            'blocked_submits': self.blocked_submits,
+            'blocked_seconds': self.blocked_seconds,
+            'last_segment_id': self.last_segment_id,
+            'last_queue_wait_ms': self.last_queue_wait * 1000,
+            'batches_run': self.batches_run,
+            'mean_batch_size': self.segments_completed / self.batches_run if self.batches_run else 0.0,
+            'largest_batch': self.largest_batch,
+        }
+
+    def _take_batch(self, first) -> Tuple[list, bool]:
+        """Collect queued items after `first`; returns (items, stop_requested)"""
+        items = [first]
+        deadline = time.monotonic() + self.max_batch_wait
+        while len(items) < self.max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return items, True
+            items.append(item)
+        return items, False
+
+    def _run(self):
+        logger.info("STT worker started")
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            items, stop = self._take_batch(item)
+
+            # A partial is stale once any later segment is waiting (in the batch or the queue)
+            batch = []
+            for i, (segment, submitted_at) in enumerate(items):
+                if segment.is_partial and (i < len(items) - 1 or not self._queue.empty()):
+                    self.stale_partials_skipped += 1
+                    continue
+                batch.append((segment, submitted_at))
+            if not batch:
+                continue
+
+            self.last_queue_wait = time.monotonic() - batch[0][1]
+            segments = [segment for segment, _ in batch]
+            try:
+                if len(segments) == 1:
+                    texts = [self.transcribe(segments[0])]
+                else:
+                    texts = self.transcribe_batch(segments)
+                for segment, text in zip(segments, texts):
+                    self.on_result(segment, text)
+            except Exception as e:
+                logger.error(f"STT worker failed on segments {segments[0].segment_id}-{segments[-1].segment_id}: {e}",
+                             exc_info=True)
+            self.last_segment_id = segments[-1].segment_id
+            self.segments_completed += len(segments)
+            self.batches_run += 1
+            self.largest_batch = max(self.largest_batch, len(segments))
+        logger.info("STT worker stopped")
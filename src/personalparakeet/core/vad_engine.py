@@ -4,75 +4,274 @@ VAD Engine - Direct port from personalparakeet.vad_engine
 Voice Activity Detection with callback support
 """
 
+import logging
 import numpy as np
 from typing import Callable, Optional
 import threading
-import time
+
+from personalparakeet.config import VADConfig
+from personalparakeet.core.audio_features import CLIP_LEVEL, AudioFeatures
+
+logger = logging.getLogger(__name__)
 
 
 class VoiceActivityDetector:
-    """Voice Activity Detector with pause detection and callbacks"""
-    
-    def __init__(self, 
+    """
+    Voice Activity Detector with pause detection and callbacks
+
+    Incoming chunks are cut into fixed `frame_duration` frames (a partial frame
+    is carried over to the next call) and classified in one vectorized pass.
+    All timing - speech onsets, silence length, pause detection - is counted
+    in samples, so it stays exact however late the chunks are processed.
+    """
+
+    def __init__(self,
                  sample_rate: int = 16000,
                  frame_duration: float = 0.03,
                  silence_threshold: float = 0.01,
                  pause_threshold: float = 1.5):
-        
+
         self.sample_rate = sample_rate
-        self.frame_size = int(sample_rate * frame_duration)
+        self.frame_size = max(1, int(sample_rate * frame_duration))
         self.silence_threshold = silence_threshold
         self.pause_threshold = pause_threshold
-        
-        # State tracking
-        self.is_speaking = False
-        self.silence_start_time = None
-        self.last_speech_time = time.time()
-        
+        self.pause_samples = int(pause_threshold * sample_rate)
+
         # Callbacks (adapted for direct function calls instead of WebSocket)
         self.on_speech_start: Optional[Callable] = None
         self.on_speech_end: Optional[Callable] = None
         self.on_pause_detected: Optional[Callable[[float], None]] = None
-        
-    def process_audio_frame(self, audio_data: np.ndarray) -> dict:
-        """Process single audio frame and return VAD status"""
-        # Calculate RMS energy
-        rms_energy = np.sqrt(np.mean(audio_data ** 2))
-        
-        # Determine if currently speaking
-        is_speech = rms_energy > self.silence_threshold
-        
-        current_time = time.time()
-        
-        if is_speech:
-            if not self.is_speaking:
-                # Speech started
-                self.is_speaking = True
-                self.silence_start_time = None
-                if self.on_speech_start:
-                    self.on_speech_start()
-            
-            self.last_speech_time = current_time
-            
+
+        self.reset()
+
+    def reset(self):
+        """Start a new stream: clear state and restart the sample clock"""
+        self.is_speaking = False
+        self.last_speech = False  # Decision of the most recent frame
+        self.samples_processed = 0  # Sample clock (whole frames classified so far)
+        self.last_speech_sample = None  # End of the most recent speech frame
+        self.silence_samples = 0  # Non-speech since the last speech frame
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self._input_remainder = self._remainder
+
+    @property
+    def stream_time(self) -> float:
+        """Seconds of audio classified so far"""
+        return self.samples_processed / self.sample_rate
+
+    def process_audio_frame(self, audio_data: np.ndarray, input_audio: Optional[np.ndarray] = None) -> dict:
+        """
+        Classify every complete frame in a chunk and update pause state
+
+        Args:
+            audio_data: Next chunk of the stream
+            input_audio: The same chunk before conditioning, if any. Clipping
+                is counted on it - the conditioner's limiter keeps audio_data
+                below full scale, so clipped input would never show there.
+
+        Returns:
+            VAD status. 'speech_flags' holds one decision per frame completed
+            by this call and 'frame_audio' the matching audio (the carried
+            partial frame plus this chunk, minus its own unfinished tail), so
+            downstream stages can consume audio and flags frame-aligned.
+            'features' are the per-frame levels of that audio, measured once
+            here and shared with the rest of the pipeline.
+        """
+        data = np.concatenate([self._remainder, np.asarray(audio_data, dtype=np.float32)])
+        num_frames = len(data) // self.frame_size
+        used = num_frames * self.frame_size
+        self._remainder = data[used:]
+        frame_audio = data[:used]
+
+        frames = frame_audio.reshape(num_frames, self.frame_size)
+        features = AudioFeatures.from_frames(frames)
+        if input_audio is not None:
+            raw = np.concatenate([self._input_remainder, np.asarray(input_audio, dtype=np.float32)])
+            self._input_remainder = raw[used:]
+            raw_frames = raw[:used].reshape(num_frames, self.frame_size)
+            features.frame_clipped = np.count_nonzero(np.abs(raw_frames) >= CLIP_LEVEL, axis=1)
+        else:
+            self._input_remainder = self._remainder
+        if num_frames:
+            speech_flags = self._classify_frames(frames, features)
+            self._update_state(speech_flags)
+            self.last_speech = bool(speech_flags[-1])
         else:
-            if self.is_speaking:
-                # Potential pause/end of speech
-                if self.silence_start_time is None:
-                    self.silence_start_time = current_time
-                
-                pause_duration = current_time - self.silence_start_time
-                
-                if pause_duration >= self.pause_threshold:
-                    # Pause threshold reached
-                    self.is_speaking = False
-                    if self.on_pause_detected:
-                        self.on_pause_detected(pause_duration)
-                    if self.on_speech_end:
-                        self.on_speech_end()
-        
+            speech_flags = np.zeros(0, dtype=bool)
+
         return {
-            'is_speech': is_speech,
-            'rms_energy': rms_energy,
-            'pause_duration': (current_time - self.silence_start_time) if self.silence_start_time else 0,
-            'is_speaking': self.is_speaking
-        }
\ No newline at end of file
+            'is_speech': bool(speech_flags.any()) if num_frames else self.last_speech,
+            'speech_flags': speech_flags,
+            'features': features,
+            'frame_energies': features.frame_energies,
+            'frame_audio': frame_audio,
+            'rms_energy': features.rms,
+            'pause_duration': self.silence_samples / self.sample_rate if self.last_speech_sample is not None else 0,
+            'is_speaking': self.is_speaking,
+            'stream_time': self.stream_time,
+        }
+
+    def _classify_frames(self, frames: np.ndarray, features: AudioFeatures) -> np.ndarray:
+        """Speech decision per frame of a (num_frames, frame_size) block"""
+        return features.frame_energies > self.silence_threshold
+
+    def _update_state(self, speech_flags: np.ndarray):
+        """Walk the runs of equal decisions (not the frames) and fire callbacks"""
+        changes = np.flatnonzero(speech_flags[1:] != speech_flags[:-1]) + 1
+        starts = np.concatenate(([0], changes))
+        ends = np.concatenate((changes, [len(speech_flags)]))
+
+        for start, end in zip(starts, ends):
+            run_samples = int(end - start) * self.frame_size
+            run_end = self.samples_processed + int(end) * self.frame_size
+            if speech_flags[start]:
+                if not self.is_speaking:
+                    # Speech started
+                    self.is_speaking = True
+                    if self.on_speech_start:
+                        self.on_speech_start()
+                self.last_speech_sample = run_end
+                self.silence_samples = 0
+                continue
+
+            before = self.silence_samples
+            self.silence_samples += run_samples
+            if self.is_speaking and before < self.pause_samples <= self.silence_samples:
+                # Pause threshold reached - report it at the frame that crossed it
+                frames_needed = -(-(self.pause_samples - before) // self.frame_size)
+                pause_duration = (before + frames_needed * self.frame_size) / self.sample_rate
+                self.is_speaking = False
+                if self.on_pause_detected:
+                    self.on_pause_detected(pause_duration)
+                if self.on_speech_end:
+                    self.on_speech_end()
+
+        self.samples_processed += len(speech_flags) * self.frame_size
+
+
+class AdaptiveVoiceActivityDetector(VoiceActivityDetector):
+    """
+    VAD that adapts to the room instead of using a fixed RMS threshold
+
+    Each frame is voiced when it is `snr_threshold_db` above a tracked noise
+    floor, keeps most of its energy in the speech band and has a speech-like
+    zero-crossing rate - fan rumble fails the band test, keyboard clicks the
+    crossing-rate and attack tests, and quiet talkers still clear a low floor.
+    Voiced runs shorter than `attack_duration` are ignored; speech is held for
+    `hangover_duration` after the last qualifying run. Features, noise floor
+    and smoothing are all computed per chunk with array operations.
+    """
+
+    SPEECH_BAND = (200.0, 4000.0)  # Hz - voiced harmonics and formants, above fan/mains rumble
+
+    def __init__(self,
+                 sample_rate: int = 16000,
+                 frame_duration: float = 0.03,
+                 pause_threshold: float = 1.5,
+                 snr_threshold_db: float = 9.0,
+                 noise_rise_db_per_s: float = 3.0,
+                 min_energy: float = 0.001,
+                 min_band_ratio: float = 0.6,
+                 max_zero_crossing_rate: float = 0.35,
+                 attack_duration: float = 0.06,
+                 hangover_duration: float = 0.3):
+        frame_seconds = max(1, int(sample_rate * frame_duration)) / sample_rate
+        self.snr_threshold_db = snr_threshold_db
+        self.noise_rise_per_frame = noise_rise_db_per_s * frame_seconds
+        self.min_energy_db = 20 * np.log10(max(min_energy, 1e-10))
+        self.min_band_ratio = min_band_ratio
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.attack_frames = max(1, int(round(attack_duration / frame_seconds)))
+        self.hangover_frames = max(0, int(round(hangover_duration / frame_seconds)))
+        super().__init__(sample_rate, frame_duration, min_energy, pause_threshold)
+
+        freqs = np.fft.rfftfreq(self.frame_size, 1.0 / sample_rate)
+        # Hann window keeps loud low-frequency rumble from leaking into the speech band
+        self._window = np.hanning(self.frame_size).astype(np.float32)
+        self._window_power = float(np.sum(self._window ** 2))
+        self._above_band_start = freqs >= self.SPEECH_BAND[0]
+        self._band_mask = self._above_band_start & (freqs <= self.SPEECH_BAND[1])
+
+    def reset(self):
+        """Start a new stream: also forget the noise floor and smoothing state"""
+        super().reset()
+        self.noise_floor_db: Optional[float] = None  # Unknown until the first frame
+        self._voiced_run = 0  # Voiced frames at the end of the previous chunk
+        self._frames_since_trigger = self.hangover_frames + 1
+
+    @property
+    def noise_floor(self) -> float:
+        """Current noise floor as RMS amplitude"""
+        if self.noise_floor_db is None:
+            return 0.0
+        return float(10 ** (self.noise_floor_db / 20))
+
+    def _classify_frames(self, frames: np.ndarray, features: AudioFeatures) -> np.ndarray:
+        n = len(frames)
+        idx = np.arange(n)
+
+        # Speech band level (rumble below the band never counts), the band's share of
+        # everything above the rumble, and sign changes per sample
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        band_power = power[:, self._band_mask].sum(axis=1)
+        band_ratio = band_power / np.maximum(power[:, self._above_band_start].sum(axis=1), 1e-20)
+        band_rms = np.sqrt(2 * band_power / (self.frame_size * self._window_power))
+        energy_db = 20 * np.log10(np.maximum(band_rms, 1e-10))
+        crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+        zcr = crossings / (self.frame_size - 1) if self.frame_size > 1 else np.zeros(n)
+
+        # Noise floor follows any quieter frame at once but rises by at most
+        # noise_rise_per_frame: floor[i] = min(floor[i-1] + rise, energy[i]), unrolled
+        # to min over j <= i of (energy[j] + (i - j) * rise)
+        rise = self.noise_rise_per_frame
+        floor = np.minimum.accumulate(energy_db - idx * rise) + idx * rise
+        if self.noise_floor_db is not None:
+            floor = np.minimum(floor, self.noise_floor_db + (idx + 1) * rise)
+        self.noise_floor_db = float(floor[-1])
+
+        voiced = ((energy_db - floor >= self.snr_threshold_db)
+                  & (energy_db >= self.min_energy_db)
+                  & (band_ratio >= self.min_band_ratio)
+                  & (zcr <= self.max_zero_crossing_rate))
+
+        # Attack: length of the voiced run ending at each frame (carried across chunks)
+        positions = idx + 1
+        last_unvoiced = np.maximum.accumulate(np.where(voiced, 0, positions))
+        run = positions - last_unvoiced + np.where(last_unvoiced == 0, self._voiced_run, 0)
+        self._voiced_run = int(run[-1])
+        triggered = run >= self.attack_frames
+
+        # Hangover: frames since the last frame that completed an attack run
+        last_trigger = np.maximum.accumulate(np.where(triggered, positions, 0))
+        since = np.where(last_trigger == 0, self._frames_since_trigger + positions,
+                         positions - last_trigger)
+        self._frames_since_trigger = int(since[-1])
+
+        return since <= self.hangover_frames
+
+
+def create_vad(vad_config: VADConfig, sample_rate: int) -> VoiceActivityDetector:
+    """Build the detector selected by vad_config.mode"""
+    if vad_config.mode == "adaptive":
+        logger.info(f"Adaptive VAD: {vad_config.snr_threshold_db} dB over the noise floor, "
+                    f"attack {vad_config.attack_duration}s, hangover {vad_config.hangover_duration}s")
+        return AdaptiveVoiceActivityDetector(
+            sample_rate=sample_rate,
+            frame_duration=vad_config.frame_duration,
+            pause_threshold=vad_config.pause_threshold,
+            snr_threshold_db=vad_config.snr_threshold_db,
+            noise_rise_db_per_s=vad_config.noise_rise_db_per_s,
+            min_energy=vad_config.min_energy,
+            min_band_ratio=vad_config.min_band_ratio,
+            max_zero_crossing_rate=vad_config.max_zero_crossing_rate,
+            attack_duration=vad_config.attack_duration,
+            hangover_duration=vad_config.hangover_duration,
+        )
+    if vad_config.mode != "energy":
+        logger.warning(f"Unknown VAD mode '{vad_config.mode}', using the energy detector")
+    return VoiceActivityDetector(
+        sample_rate=sample_rate,
+        frame_duration=vad_config.frame_duration,
+        silence_threshold=vad_config.silence_threshold,
+        pause_threshold=vad_config.pause_threshold,
+    )
@@ -7,6 +7,7 @@ Main entry point for the dictation system with Rust+EGUI UI via PyO3 bridge
 import asyncio
 import logging
 import threading
+import time
 import sys
 import os
 from pathlib import Path
@@ -58,10 +59,14 @@ class PersonalParakeetV3:
         self.injection_manager = None
         self.is_running = False
         self.cleanup_registered = False
+        self.startup_timings = {}  # Phase name -> seconds since initialize() began
+        self._startup_start = None
+        self._startup_reported = False
         
     async def initialize(self, rust_ui):
         """Initialize the application components"""
         try:
+            self._startup_start = time.time()
             # Register cleanup
             if not self.cleanup_registered:
                 self.register_cleanup(rust_ui)
@@ -71,10 +76,14 @@ class PersonalParakeetV3:
             await self.configure_window(rust_ui)
             logger.info("Window configuration completed")
             
-            # Initialize audio engine with all components
+            self._mark_startup_phase('window')
+            
+            # Initialize audio engine with all components; with background loading the
+            # model comes up while the mic is already live
             logger.info("Initializing audio engine...")
             self.audio_engine = AudioEngine(self.config, asyncio.get_event_loop())
-            await self.audio_engine.initialize()
+            await self.audio_engine.initialize(background_stt=self.config.audio.stt_background_load)
+            self._mark_startup_phase('audio_engine')
             logger.info("Audio engine initialized successfully")
             
             # Initialize text injection manager
@@ -99,6 +108,7 @@ class PersonalParakeetV3:
                 self.injection_manager
             )
             logger.info("Thought linking integration initialized successfully")
+            self._mark_startup_phase('injection')
             
             # Connect audio engine callbacks to text injection
             logger.info("Connecting audio engine callbacks...")
@@ -120,11 +130,23 @@ class PersonalParakeetV3:
                     text = str(result)
                 rust_ui.update_text(text, "REPLACE")
             
+            def handle_partial_transcription(partial):
+                # Stable words arrive through handle_raw_transcription; show the changing tail
+                if partial.unstable_text:
+                    rust_ui.update_status(f"... {partial.unstable_text}", "blue")
+            
             self.audio_engine.on_raw_transcription = handle_raw_transcription
+            self.audio_engine.on_partial_transcription = handle_partial_transcription
             self.audio_engine.on_corrected_transcription = handle_corrected_transcription
             self.audio_engine.on_pause_detected = lambda: rust_ui.update_status("Pause detected", "yellow")
             self.audio_engine.on_vad_status = lambda active: rust_ui.set_recording(active)
             self.audio_engine.on_error = lambda error: rust_ui.show_error(str(error))
+            
+            def handle_stt_ready():
+                rust_ui.update_status("Ready", "green")
+                self.report_startup()
+            
+            self.audio_engine.on_stt_ready = handle_stt_ready
             logger.info("Audio engine callbacks connected")
             
             logger.info("Rust UI callbacks connected successfully")
@@ -133,6 +155,13 @@ class PersonalParakeetV3:
             logger.info("Starting audio processing...")
             await self.audio_engine.start()
             self.is_running = True
+            self._mark_startup_phase('capture')
+            if self.audio_engine.stt_ready.is_set():
+                self.report_startup()
+            elif self.audio_engine.stt_loading:
+                logger.info(f"Listening after {self.startup_timings['capture']:.2f}s - "
+                            f"speech is buffered until the STT model is ready")
+                rust_ui.update_status("Listening - loading speech model...", "yellow")
             
             # Log thought linking status
             logger.info(f"Thought linking status: enabled={self.config.thought_linking.enabled}")
@@ -151,6 +180,23 @@ class PersonalParakeetV3:
             await self.emergency_cleanup()
             raise
     
+    def _mark_startup_phase(self, phase: str):
+        self.startup_timings[phase] = time.time() - self._startup_start
+    
+    def report_startup(self):
+        """Log startup phase timings once capture is live and the model is ready"""
+        if self._startup_reported or 'capture' not in self.startup_timings:
+            return
+        self._startup_reported = True
+        metrics = self.audio_engine.get_startup_metrics()
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.startup_timings.items())
+        engine_phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in metrics['phases'].items())
+        logger.info(f"Startup timings (since launch): {phases}")
+        logger.info(f"Audio engine phases: {engine_phases}")
+        if metrics['segments_held']:
+            logger.info(f"Speech captured while loading: {metrics['segments_held']} segments, "
+                        f"peak {metrics['peak_seconds']:.1f}s buffered, {metrics['seconds_dropped']:.1f}s dropped")
+    
     async def configure_window(self, rust_ui):
         """Configure window properties for floating UI"""
         async def run_task():
@@ -247,7 +293,7 @@ async def app_main():
         # Initialize application with Rust UI BEFORE running GUI
         await app.initialize(rust_ui)
         
-        if not app.audio_engine.stt_processor:
+        if not app.audio_engine.stt_processor and not app.audio_engine.stt_loading:
             logger.error("STT processor not available")
             rust_ui.show_error(
                 "Speech-to-Text (STT) processor could not be initialized. "
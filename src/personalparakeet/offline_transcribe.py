@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Offline file transcription for PersonalParakeet v3
+Runs recorded audio through the same resample/VAD/segmentation/STT path as the
+live AudioEngine - no sounddevice, no GUI - as fast as the model allows.
+
+Usage:
+    python -m personalparakeet transcribe meeting.wav [more.flac ...] [--format jsonl]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from personalparakeet.config import V3Config
+from personalparakeet.core.audio_sources import open_audio_blocks
+
+logger = logging.getLogger(__name__)
+
+SEGMENTATION_MODES = ("fixed", "sliding", "vad", "streaming")
+
+
+class OfflineTranscriber:
+    """Drives an AudioEngine synchronously over audio files"""
+
+    def __init__(self, config: V3Config):
+        # Imported here so `--help` doesn't pay for the engine's imports
+        from personalparakeet.audio_engine import AudioEngine
+
+        self.config = config
+        self.engine = AudioEngine(config)
+        self.engine.set_clarity_enabled(False)  # Raw transcripts; corrections need the UI event loop
+        self._segments: List[dict] = []
+        self.engine.on_segment_transcribed = self._collect
+
+    def initialize(self):
+        asyncio.run(self.engine.initialize())
+
+    def transcribe_file(self, path: Path) -> dict:
+        """Transcribe one file and return its segments plus throughput stats"""
+        block_duration = self.config.audio.chunk_size / self.config.audio.model_sample_rate
+        sample_rate, blocks = open_audio_blocks(path, block_duration)
+
+        self._segments = []
+        self.engine.reset_stream(capture_sample_rate=sample_rate)
+        stt_calls_before = self.engine.total_stt_calls
+
+        # The STT worker lets segments queue up while the file is read faster than
+        # realtime, so they are decoded in batches; stop() drains it in order
+        total_samples = 0
+        start = time.perf_counter()
+        self.engine.stt_worker.start()
+        try:
+            for block in blocks:
+                total_samples += len(block)
+                self.engine.process_audio_chunk(block)
+            self.engine.flush_segments()
+        finally:
+            self.engine.stt_worker.stop(timeout=None)
+        elapsed = time.perf_counter() - start
+
+        audio_seconds = total_samples / sample_rate
+        return {
+            'file': str(path),
+            'segments': self._segments,
+            'audio_seconds': audio_seconds,
+            'processing_seconds': elapsed,
+            'speedup': audio_seconds / elapsed if elapsed > 0 else float('inf'),
+            'stt_calls': self.engine.total_stt_calls - stt_calls_before,
+        }
+
+    def _collect(self, segment, text: str):
+        self._segments.append({
+            'segment_id': segment.segment_id,
+            'start': round(segment.start_time, 3),
+            'end': round(segment.end_time, 3),
+            'text': text,
+            'partial': segment.is_partial,
+        })
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m personalparakeet transcribe",
+        description="Transcribe recorded audio files through the PersonalParakeet pipeline",
+    )
+    parser.add_argument("files", nargs="+", type=Path, help="WAV or FLAC files")
+    parser.add_argument("--format", choices=("text", "jsonl"), default="text",
+                        help="text: one transcript per file; jsonl: one JSON object per segment")
+    parser.add_argument("--mode", choices=SEGMENTATION_MODES, default="vad",
+                        help="STT segmentation mode (default: vad)")
+    parser.add_argument("--mock", action="store_true", help="Use the mock STT processor")
+    parser.add_argument("--device", choices=("cuda", "cpu"), help="STT device override")
+    parser.add_argument("--quiet", action="store_true", help="Suppress the throughput summary")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point; returns a process exit code"""
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    missing = [str(f) for f in args.files if not f.exists()]
+    if missing:
+        print(f"File not found: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    config = V3Config()
+    config.audio.stt_segmentation_mode = args.mode
+    if args.mock:
+        config.audio.use_mock_stt = True
+    if args.device:
+        config.audio.stt_device = args.device
+
+    transcriber = OfflineTranscriber(config)
+    transcriber.initialize()
+
+    total_audio = total_time = 0.0
+    for path in args.files:
+        result = transcriber.transcribe_file(path)
+        total_audio += result['audio_seconds']
+        total_time += result['processing_seconds']
+
+        if args.format == "jsonl":
+            for segment in result['segments']:
+                print(json.dumps({'file': result['file'], **segment}), flush=True)
+        else:
+            print(" ".join(s['text'] for s in result['segments']), flush=True)
+
+        if not args.quiet:
+            print(f"{path}: {result['audio_seconds']:.1f}s audio in {result['processing_seconds']:.2f}s "
+                  f"({result['speedup']:.1f}x realtime, {result['stt_calls']} STT calls)",
+                  file=sys.stderr)
+
+    if not args.quiet and len(args.files) > 1 and total_time > 0:
+        print(f"Total: {total_audio:.1f}s audio in {total_time:.2f}s ({total_audio / total_time:.1f}x realtime)",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
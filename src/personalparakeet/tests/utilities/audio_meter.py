@@ -8,6 +8,8 @@ import numpy as np
 from dataclasses import dataclass
 from typing import Tuple, List
 
+from personalparakeet.core.audio_features import AudioFeatures
+
 
 @dataclass
 class AudioLevel:
@@ -17,6 +19,7 @@ class AudioLevel:
     rms_db: float  # RMS in dB
     peak_db: float  # Peak in dB
     is_voice: bool  # Voice activity detected
+    clipped: int = 0  # Samples at full scale
     
 
 class AudioMeter:
@@ -33,25 +36,23 @@ class AudioMeter:
         if audio_data.ndim > 1:
             audio_data = audio_data[:, 0]
             
-        # Calculate RMS and peak
-        rms = np.sqrt(np.mean(audio_data**2))
-        peak = np.max(np.abs(audio_data))
-        
-        # Convert to dB (with floor to avoid log(0))
-        rms_db = 20 * np.log10(rms + 1e-10)
-        peak_db = 20 * np.log10(peak + 1e-10)
-        
-        # Detect voice activity
-        is_voice = rms > self.voice_threshold
-        
+        # Whole chunk as one frame
+        return self.measure_features(AudioFeatures.from_audio(audio_data, len(audio_data)))
+    
+    def measure_features(self, features: AudioFeatures, is_voice: bool = None) -> AudioLevel:
+        """Build a level from AudioFeatures the VAD already computed for the chunk (vad_status['features'])"""
+        rms = features.rms
         level = AudioLevel(
             rms=rms,
-            peak=peak,
-            rms_db=rms_db,
-            peak_db=peak_db,
-            is_voice=is_voice
+            peak=features.peak,
+            rms_db=features.rms_db,
+            peak_db=features.peak_db,
+            is_voice=rms > self.voice_threshold if is_voice is None else is_voice,
+            clipped=features.clipped_samples
         )
-        
+        return self._record(level)
+    
+    def _record(self, level: AudioLevel) -> AudioLevel:
         # Store in history
         self.history.append(level)
         if len(self.history) > self.max_history:
@@ -115,7 +116,8 @@ class AudioMeter:
         else:
             meter = self.get_ascii_meter(level)
             
-        return f"{status} {meter} RMS: {level.rms_db:6.1f} dB | Peak: {level.peak_db:6.1f} dB"
+        clip = " | CLIP" if level.clipped else ""
+        return f"{status} {meter} RMS: {level.rms_db:6.1f} dB | Peak: {level.peak_db:6.1f} dB{clip}"
     
     def get_compact_status(self, level: AudioLevel) -> str:
         """Get a compact status for limited space"""
@@ -10,6 +10,7 @@ import time
 import sys
 import threading
 from audio_meter import AudioMeter
+from personalparakeet.core.vad_engine import VoiceActivityDetector
 
 class LiveAudioMonitor:
     def __init__(self, device_id=7, duration=30):
@@ -21,6 +22,7 @@ class LiveAudioMonitor:
         self.max_level = 0
         self.total_samples = 0
         self.meter = AudioMeter(voice_threshold=0.01)
+        self.vad = VoiceActivityDetector(sample_rate=self.sample_rate, silence_threshold=0.01)
         
     def audio_callback(self, indata, frames, time_info, status):
         """Process audio in real-time"""
@@ -31,8 +33,11 @@ class LiveAudioMonitor:
         self.audio_chunks.append(indata.copy())
         self.total_samples += len(indata)
         
-        # Measure audio levels
-        level = self.meter.measure(indata)
+        # Levels and voice decision from the VAD's single pass, as in the pipeline
+        vad_status = self.vad.process_audio_frame(indata[:, 0])
+        if not len(vad_status['speech_flags']):
+            return  # Shorter than a VAD frame - carried over to the next block
+        level = self.meter.measure_features(vad_status['features'], is_voice=vad_status['is_speech'])
         self.max_level = max(self.max_level, level.peak)
         
         # Get formatted status line
@@ -10,6 +10,7 @@ import time
 import sys
 import json
 from audio_meter import AudioMeter
+from personalparakeet.core.vad_engine import VoiceActivityDetector
 
 
 class LiveAudioMonitorGUI:
@@ -18,6 +19,7 @@ class LiveAudioMonitorGUI:
         self.duration = duration
         self.sample_rate = 16000
         self.meter = AudioMeter(voice_threshold=0.01)
+        self.vad = VoiceActivityDetector(sample_rate=self.sample_rate, silence_threshold=0.01)
         
     def audio_callback(self, indata, frames, time_info, status):
         """Process audio and output JSON data"""
@@ -25,8 +27,11 @@ class LiveAudioMonitorGUI:
             print(json.dumps({"type": "error", "message": str(status)}))
             return
         
-        # Measure audio levels
-        level = self.meter.measure(indata)
+        # Levels and voice decision from the VAD's single pass, as in the pipeline
+        vad_status = self.vad.process_audio_frame(indata[:, 0])
+        if not len(vad_status['speech_flags']):
+            return  # Shorter than a VAD frame - carried over to the next block
+        level = self.meter.measure_features(vad_status['features'], is_voice=vad_status['is_speech'])
         
         # Output structured data
         data = {
@@ -36,6 +41,7 @@ class LiveAudioMonitorGUI:
             "rms_db": level.rms_db,
             "peak_db": level.peak_db,
             "is_voice": level.is_voice,
+            "clipped": level.clipped,
             "meter": self.meter.get_ascii_meter(level, width=30),
             "sparkline": self.meter.get_sparkline(samples=15),
             "status": "SPEAKING" if level.is_voice else "SILENCE"
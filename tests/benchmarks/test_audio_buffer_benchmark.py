@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: list-based STT buffer vs. preallocated AudioRingBuffer.
+
+Replays the AudioEngine buffering pattern (0.5 s chunks into a 4 s STT window
+plus a quiet-period flush) and extrapolates CPU time and allocation volume to
+one hour of 16 kHz audio.
+
+Run directly for a report:
+    python tests/benchmarks/test_audio_buffer_benchmark.py
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from personalparakeet.core.audio_ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 8000  # 0.5 s, AudioConfig.chunk_size
+WINDOW_SAMPLES = 4 * SAMPLE_RATE
+BENCH_SECONDS = 120  # Audio simulated per run; results are scaled to one hour
+
+
+def _chunks(seconds: int):
+    rng = np.random.default_rng(0)
+    chunk = rng.standard_normal(CHUNK_SAMPLES).astype(np.float32) * 0.1
+    for _ in range(seconds * SAMPLE_RATE // CHUNK_SAMPLES):
+        yield chunk
+
+
+def _run_list_buffer(seconds: int) -> float:
+    """Original AudioEngine pattern: list.extend + np.array + list slice"""
+    buffer = []
+    checksum = 0.0
+    for chunk in _chunks(seconds):
+        buffer.extend(chunk)
+        if len(buffer) >= WINDOW_SAMPLES:
+            window = np.array(buffer[:WINDOW_SAMPLES], dtype=np.float32)
+            buffer = buffer[WINDOW_SAMPLES:]
+            checksum += float(np.max(np.abs(window)))
+    if buffer:
+        window = np.array(buffer, dtype=np.float32)
+        buffer.clear()
+        checksum += float(np.max(np.abs(window)))
+    return checksum
+
+
+def _run_ring_buffer(seconds: int) -> float:
+    """AudioRingBuffer pattern: write + zero-copy read"""
+    ring = AudioRingBuffer(2 * WINDOW_SAMPLES)
+    checksum = 0.0
+    for chunk in _chunks(seconds):
+        ring.write(chunk)
+        if len(ring) >= WINDOW_SAMPLES:
+            checksum += float(np.max(np.abs(ring.read(WINDOW_SAMPLES))))
+    if len(ring):
+        checksum += float(np.max(np.abs(ring.read())))
+    return checksum
+
+
+def _measure(fn, seconds: int) -> dict:
+    """CPU seconds and peak traced allocation for one run"""
+    start_cpu = time.process_time()
+    fn(seconds)
+    cpu = time.process_time() - start_cpu
+
+    tracemalloc.start()
+    fn(seconds)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    scale = 3600 / seconds
+    return {
+        'cpu_s_per_hour': cpu * scale,
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_benchmark(seconds: int = BENCH_SECONDS) -> dict:
+    """Compare both buffers and return per-hour figures"""
+    samples_per_hour = 3600 * SAMPLE_RATE
+    results = {
+        'list': _measure(_run_list_buffer, seconds),
+        'ring': _measure(_run_ring_buffer, seconds),
+    }
+    # list.extend boxes every sample into a 24-byte float plus an 8-byte slot,
+    # and each window slice copies the remaining pointers again
+    results['list']['boxed_floats_per_hour'] = samples_per_hour
+    results['ring']['boxed_floats_per_hour'] = 0
+    results['cpu_saved_s_per_hour'] = (
+        results['list']['cpu_s_per_hour'] - results['ring']['cpu_s_per_hour']
+    )
+    return results
+
+
+@pytest.mark.benchmark
+def test_ring_buffer_beats_list_buffer():
+    """Ring buffer should use less CPU and far less peak memory than the list."""
+    results = run_benchmark(seconds=60)
+    assert results['ring']['cpu_s_per_hour'] < results['list']['cpu_s_per_hour']
+    assert results['ring']['peak_mb'] < results['list']['peak_mb']
+
+
+def _print_report(results: dict):
+    print(f"{'buffer':<8}{'CPU s/hour':>14}{'peak MB':>12}{'boxed floats/hour':>22}")
+    for name in ('list', 'ring'):
+        r = results[name]
+        print(f"{name:<8}{r['cpu_s_per_hour']:>14.2f}{r['peak_mb']:>12.2f}"
+              f"{r['boxed_floats_per_hour']:>22,}")
+    print(f"CPU saved per hour of audio: {results['cpu_saved_s_per_hour']:.2f}s")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cache-aware incremental streaming vs re-decoding each partial.
+
+Streaming segmentation asks for a hypothesis every `stt_partial_interval`
+while an utterance is spoken. Re-decoding runs the encoder over the whole
+utterance so far each time, so a partial costs more the longer the speaker
+goes on; a cache-aware stream only encodes the audio since the last partial.
+Both modes run over one long speech-like utterance (the `commands.wav`
+pattern from tests/fixtures/generate_audio_samples.py) and report the
+per-partial latency early and late in it, plus the total encoder time.
+
+By default the graph is a stand-in cache-aware encoder (causal conv, MLP and
+a left-context average fed through the cache inputs, random weights). Point
+PARAKEET_ONNX_MODEL at a cache-aware CTC export (manifest with a "streaming"
+section beside it) to measure a real model.
+
+Run directly for a report:
+    python tests/benchmarks/test_incremental_streaming_benchmark.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from personalparakeet.config import V3Config
+from personalparakeet.core.stt_factory import STTFactory
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+from onnx import TensorProto, helper, numpy_helper  # noqa: E402
+
+SAMPLE_RATE = 16000
+UTTERANCE_SECONDS = 12.0
+PARTIAL_INTERVAL = 0.3  # Default stt_partial_interval
+WINDOW_SECONDS = 2.0    # Partials averaged at the start and the end of the utterance
+N_MELS = 80
+HIDDEN = 256
+LAYERS = 4
+CONV_KERNEL = 9
+LEFT_CONTEXT = 70  # Encoder frames of attention-like left context, as in NeMo's [70, x] configs
+CHUNK_FRAMES = 16
+VOCABULARY = [f"▁w{i}" for i in range(63)]  # Blank is the last id
+
+_FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "generate_audio_samples.py"
+
+
+def _utterance() -> np.ndarray:
+    spec = importlib.util.spec_from_file_location("generate_audio_samples", _FIXTURES)
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    np.random.seed(0)
+    audio = generator.generate_speech_like_audio(UTTERANCE_SECONDS)[:int(UTTERANCE_SECONDS * SAMPLE_RATE)]
+    return (audio / np.max(np.abs(audio)) * 0.3).astype(np.float32)
+
+
+def _export_stand_in(path: Path):
+    """Cache-aware encoder + CTC head with NeMo's streaming export signature"""
+    rng = np.random.default_rng(0)
+    vocab_out = len(VOCABULARY) + 1
+
+    def const(name, value):
+        initializers.append(numpy_helper.from_array(np.asarray(value), name))
+
+    initializers = []
+    const("time_kernel", np.full((N_MELS, 1, CONV_KERNEL), 1 / CONV_KERNEL, np.float32))
+    const("context_kernel", np.full((HIDDEN, 1, LEFT_CONTEXT + 1), 1 / (LEFT_CONTEXT + 1), np.float32))
+    const("time_start", np.array([1 - CONV_KERNEL], np.int64))
+    const("context_start", np.array([-LEFT_CONTEXT], np.int64))
+    const("end", np.array([1 << 30], np.int64))
+    const("axis", np.array([2], np.int64))
+    const("context_max", np.array([LEFT_CONTEXT], np.int64))
+    nodes = [
+        helper.make_node("Concat", ["cache_last_time", "audio_signal"], ["timed"], axis=2),
+        helper.make_node("Conv", ["timed", "time_kernel"], ["smoothed"], group=N_MELS),
+        helper.make_node("Slice", ["timed", "time_start", "end", "axis"], ["cache_last_time_next"]),
+        helper.make_node("Transpose", ["smoothed"], ["h0"], perm=[0, 2, 1]),
+    ]
+    sizes = [N_MELS] + [HIDDEN] * LAYERS
+    for layer, (fan_in, fan_out) in enumerate(zip(sizes[:-1], sizes[1:])):
+        const(f"W{layer}", (rng.standard_normal((fan_in, fan_out)) * np.sqrt(2.0 / fan_in)).astype(np.float32))
+        const(f"b{layer}", np.zeros(fan_out, dtype=np.float32))
+        nodes += [helper.make_node("MatMul", [f"h{layer}", f"W{layer}"], [f"m{layer}"]),
+                  helper.make_node("Add", [f"m{layer}", f"b{layer}"], [f"a{layer}"]),
+                  helper.make_node("Relu", [f"a{layer}"], [f"h{layer + 1}"])]
+    const("W_out", (rng.standard_normal((HIDDEN, vocab_out)) * np.sqrt(1.0 / HIDDEN)).astype(np.float32))
+    nodes += [
+        helper.make_node("Transpose", [f"h{LAYERS}"], ["hidden"], perm=[0, 2, 1]),
+        helper.make_node("Concat", ["cache_last_channel", "hidden"], ["attended"], axis=2),
+        helper.make_node("Conv", ["attended", "context_kernel"], ["context"], group=HIDDEN),
+        helper.make_node("Slice", ["attended", "context_start", "end", "axis"], ["cache_last_channel_next"]),
+        helper.make_node("Add", ["hidden", "context"], ["encoded"]),
+        helper.make_node("Transpose", ["encoded"], ["frames"], perm=[0, 2, 1]),
+        helper.make_node("MatMul", ["frames", "W_out"], ["logits"]),
+        helper.make_node("LogSoftmax", ["logits"], ["logprobs"], axis=-1),
+        helper.make_node("Identity", ["length"], ["encoded_lengths"]),
+        helper.make_node("Add", ["cache_last_channel_len", "length"], ["seen"]),
+        helper.make_node("Min", ["seen", "context_max"], ["cache_last_channel_next_len"]),
+    ]
+    graph = helper.make_graph(
+        nodes, "stand_in_cache_aware_encoder",
+        [helper.make_tensor_value_info("audio_signal", TensorProto.FLOAT, ["B", N_MELS, "T"]),
+         helper.make_tensor_value_info("length", TensorProto.INT64, ["B"]),
+         helper.make_tensor_value_info("cache_last_channel", TensorProto.FLOAT, ["B", HIDDEN, LEFT_CONTEXT]),
+         helper.make_tensor_value_info("cache_last_time", TensorProto.FLOAT, ["B", N_MELS, CONV_KERNEL - 1]),
+         helper.make_tensor_value_info("cache_last_channel_len", TensorProto.INT64, ["B"])],
+        [helper.make_tensor_value_info("logprobs", TensorProto.FLOAT, ["B", "T", vocab_out]),
+         helper.make_tensor_value_info("encoded_lengths", TensorProto.INT64, ["B"]),
+         helper.make_tensor_value_info("cache_last_channel_next", TensorProto.FLOAT, ["B", HIDDEN, LEFT_CONTEXT]),
+         helper.make_tensor_value_info("cache_last_time_next", TensorProto.FLOAT, ["B", N_MELS, CONV_KERNEL - 1]),
+         helper.make_tensor_value_info("cache_last_channel_next_len", TensorProto.INT64, ["B"])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    path.with_suffix(".json").write_text(json.dumps({
+        "vocabulary": VOCABULARY,
+        "blank_id": len(VOCABULARY),
+        "features": {"n_mels": N_MELS, "normalize": "NA"},
+        "streaming": {"chunk_frames": CHUNK_FRAMES, "pre_encode_cache_frames": 0},
+    }), encoding="utf-8")
+
+
+def _partials(processor, audio: np.ndarray, incremental: bool):
+    """Seconds spent per partial over the utterance, and the final hypothesis"""
+    hop = int(PARTIAL_INTERVAL * SAMPLE_RATE)
+    stream = processor.create_stream()
+    latencies, text = [], None
+    for end in range(hop, len(audio) + 1, hop):
+        start = time.perf_counter()
+        if incremental:
+            text = processor.transcribe_stream(stream, audio[end - hop:end], is_final=end + hop > len(audio))
+        else:
+            text = processor.transcribe(audio[:end])
+        latencies.append(time.perf_counter() - start)
+    return latencies, text
+
+
+def run_benchmark() -> dict:
+    """Per-partial latency early vs late in the utterance, for both modes"""
+    audio = _utterance()
+    with tempfile.TemporaryDirectory() as tmp:
+        if os.environ.get("PARAKEET_ONNX_MODEL"):
+            model_path = Path(os.environ["PARAKEET_ONNX_MODEL"]).expanduser()
+        else:
+            model_path = Path(tmp) / "stand_in.onnx"
+            _export_stand_in(model_path)
+        config = V3Config()
+        config.audio.stt_runtime = "onnx"
+        config.audio.stt_onnx_model_path = str(model_path)
+        config.audio.stt_warmup = False
+        processor = STTFactory.create_stt_processor(config)
+        asyncio.run(processor.initialize())
+        processor.transcribe(audio[:SAMPLE_RATE])  # Untimed warm-up
+
+        window = int(WINDOW_SECONDS / PARTIAL_INTERVAL)
+        results = {}
+        for mode, incremental in (('re_decode', False), ('incremental', True)):
+            latencies, text = _partials(processor, audio, incremental)
+            results[mode] = {
+                'early_ms': float(np.median(latencies[:window])) * 1000,
+                'late_ms': float(np.median(latencies[-window - 1:-1])) * 1000,  # Final flush excluded
+                'total_s': sum(latencies),
+                'text': text or "",
+            }
+            results[mode]['growth'] = results[mode]['late_ms'] / results[mode]['early_ms']
+        return results
+
+
+@pytest.mark.benchmark
+def test_incremental_partials_cost_the_same_all_utterance_long():
+    """Cached streaming should keep per-partial cost flat while re-decoding grows with length."""
+    results = run_benchmark()
+    assert results['incremental']['text'] == results['re_decode']['text']
+    assert results['incremental']['growth'] < 2.0
+    assert results['re_decode']['growth'] > 3.0
+    assert results['incremental']['total_s'] < results['re_decode']['total_s'] / 5
+
+
+def _print_report(results: dict):
+    print(f"{'mode':<13}{'early ms':>10}{'late ms':>10}{'growth':>8}{'total s':>9}")
+    for mode, row in results.items():
+        print(f"{mode:<13}{row['early_ms']:>10.2f}{row['late_ms']:>10.2f}"
+              f"{row['growth']:>7.1f}x{row['total_s']:>9.2f}")
+    print(f"Final transcripts identical: {results['incremental']['text'] == results['re_decode']['text']}")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
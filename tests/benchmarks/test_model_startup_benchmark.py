@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: STT model startup time and peak RSS with and without the artifact cache.
+
+Each measurement runs in a fresh Python process, so peak RSS
+(`ru_maxrss`) and the page cache state of one mode don't leak into the
+next. Modes:
+
+    direct      - stt_artifact_cache off: restore_from/from_pretrained unpacks
+                  the .nemo tarball and unpickles every weight
+    cache_cold  - first start with the cache: unpacks and converts once
+    cache_warm  - later starts: config from the entry, weights memory-mapped
+
+The library imports (torch, NeMo) are timed separately from the model load,
+since they are the same in every mode. Warm-up is disabled so only loading
+is measured. Needs NeMo; set PARAKEET_BENCH_DEVICE=cuda to load onto the GPU.
+
+Run directly for a report:
+    python tests/benchmarks/test_model_startup_benchmark.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+MODES = ('direct', 'cache_cold', 'cache_warm')
+
+pytestmark = pytest.mark.skipif(importlib.util.find_spec("nemo") is None,
+                                reason="NeMo is needed to load the STT model")
+
+
+def _child(mode: str, cache_dir: str):
+    """Load the model once in this process and print the measurements as JSON"""
+    start = time.perf_counter()
+    from personalparakeet.config import V3Config
+    from personalparakeet.core.stt_processor import STTProcessor
+    import_seconds = time.perf_counter() - start
+
+    config = V3Config()
+    config.audio.stt_device = os.environ.get("PARAKEET_BENCH_DEVICE", "cpu")
+    config.audio.stt_warmup = False
+    config.audio.stt_artifact_cache = mode != 'direct'
+    config.audio.model_cache_dir = cache_dir
+    processor = STTProcessor(config)
+
+    start = time.perf_counter()
+    asyncio.run(processor.initialize())
+    load_seconds = time.perf_counter() - start
+    print(json.dumps({
+        'import_s': import_seconds,
+        'load_s': load_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    }))
+
+
+def _measure(mode: str, cache_dir: str) -> dict:
+    result = subprocess.run([sys.executable, __file__, "--child", mode, cache_dir],
+                            capture_output=True, text=True, check=True, env=os.environ.copy())
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark() -> dict:
+    """Startup and peak RSS per mode, sharing one model_cache_dir (HF downloads included)"""
+    cache_dir = os.environ.get("PARAKEET_BENCH_CACHE_DIR") or tempfile.mkdtemp(prefix="parakeet-bench-")
+    _measure('direct', cache_dir)  # Download once and prime the page cache for every mode
+    return {mode: _measure(mode, cache_dir) for mode in MODES}
+
+
+@pytest.mark.benchmark
+def test_warm_artifact_cache_starts_faster_with_less_memory():
+    """The warm cache should beat unpacking the tarball on both load time and peak RSS."""
+    results = run_benchmark()
+    assert results['cache_warm']['load_s'] < results['direct']['load_s']
+    assert results['cache_warm']['peak_rss_mb'] < results['direct']['peak_rss_mb']
+
+
+def _print_report(results: dict):
+    print(f"{'mode':<12}{'imports s':>11}{'load s':>9}{'peak RSS MB':>13}")
+    for mode, row in results.items():
+        print(f"{mode:<12}{row['import_s']:>11.2f}{row['load_s']:>9.2f}{row['peak_rss_mb']:>13.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+    else:
+        _print_report(run_benchmark())
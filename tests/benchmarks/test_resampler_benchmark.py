@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-chunk resample_poly / FFT resample vs. streaming AudioResampler.
+
+Feeds 0.5 s capture chunks through the previous AudioResampler behaviour
+(independent resample_poly per chunk for 44.1 kHz, FFT resample otherwise)
+and through the streaming polyphase resampler, reporting throughput as a
+multiple of realtime and the edge error each one adds at chunk boundaries.
+
+A second table compares the resampler qualities (filter length) for the
+common capture rates: throughput, alias rejection and construction time with
+a cold vs. warm filter bank cache.
+
+Run directly for a report:
+    python tests/benchmarks/test_resampler_benchmark.py
+"""
+
+import time
+from typing import Tuple
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from personalparakeet.core.audio_resampler import (
+    QUALITY_ZERO_CROSSINGS,
+    AudioResampler,
+    ResamplerConfig,
+    get_filter_bank,
+)
+
+OUTPUT_RATE = 16000
+CHUNK_SECONDS = 0.5
+BENCH_SECONDS = 60
+INPUT_RATES = (44100, 48000, 22050)
+QUALITY_RATES = (48000, 44100, 32000)
+
+
+def _legacy_resample_chunk(chunk: np.ndarray, input_rate: int) -> np.ndarray:
+    """AudioResampler.resample_chunk before streaming: no state between chunks"""
+    if input_rate == 44100:
+        h = signal.firwin(256, OUTPUT_RATE / input_rate, window='hamming')
+        return signal.resample_poly(chunk, 160, 441, window=h).astype(np.float32)
+    return signal.resample(chunk, int(len(chunk) * OUTPUT_RATE / input_rate)).astype(np.float32)
+
+
+def _signal(input_rate: int, seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * input_rate)) / input_rate
+    # 437 Hz is not periodic in a 0.5 s chunk, so chunk edges show up as errors
+    return (0.5 * np.sin(2 * np.pi * 437 * t)).astype(np.float32)
+
+
+def _chunks(audio: np.ndarray, input_rate: int):
+    size = int(CHUNK_SECONDS * input_rate)
+    return [audio[i:i + size] for i in range(0, len(audio), size)]
+
+
+def _run_legacy(audio: np.ndarray, input_rate: int) -> np.ndarray:
+    return np.concatenate([_legacy_resample_chunk(c, input_rate) for c in _chunks(audio, input_rate)])
+
+
+def _run_streaming(audio: np.ndarray, input_rate: int) -> np.ndarray:
+    resampler = AudioResampler(ResamplerConfig(input_rate, OUTPUT_RATE))
+    parts = [resampler.resample_chunk(c) for c in _chunks(audio, input_rate)]
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+def _boundary_error(output: np.ndarray, input_rate: int) -> float:
+    """Worst deviation from a clean 437 Hz tone, skipping the stream edges"""
+    t = np.arange(len(output)) / OUTPUT_RATE
+    reference = 0.5 * np.sin(2 * np.pi * 437 * t)
+    edge = OUTPUT_RATE // 10
+    return float(np.max(np.abs(output - reference)[edge:-edge]))
+
+
+def run_benchmark(seconds: int = BENCH_SECONDS) -> dict:
+    """Throughput (x realtime) and boundary error per input rate"""
+    results = {}
+    for input_rate in INPUT_RATES:
+        audio = _signal(input_rate, seconds)
+        row = {}
+        for name, fn in (('legacy', _run_legacy), ('streaming', _run_streaming)):
+            start = time.perf_counter()
+            output = fn(audio, input_rate)
+            elapsed = time.perf_counter() - start
+            row[name] = {
+                'x_realtime': seconds / elapsed,
+                'max_error': _boundary_error(output, input_rate),
+            }
+        results[input_rate] = row
+    return results
+
+
+def _alias_rejection_db(input_rate: int, quality: str) -> float:
+    """Level of a 10 kHz tone (above the 8 kHz output Nyquist) after resampling"""
+    t = np.arange(input_rate) / input_rate
+    tone = (0.5 * np.sin(2 * np.pi * 10000 * t)).astype(np.float32)
+    resampler = AudioResampler(ResamplerConfig(input_rate, OUTPUT_RATE, quality=quality))
+    output = resampler.resample_chunk(tone)[OUTPUT_RATE // 10:]
+    rms_in = np.sqrt(np.mean(tone ** 2))
+    rms_out = np.sqrt(np.mean(output.astype(np.float64) ** 2)) + 1e-12
+    return float(20 * np.log10(rms_in / rms_out))
+
+
+def _construction_ms(input_rate: int, quality: str) -> Tuple[float, float]:
+    """Resampler construction time with a cold and a warm filter bank cache"""
+    get_filter_bank.cache_clear()
+    start = time.perf_counter()
+    AudioResampler(ResamplerConfig(input_rate, OUTPUT_RATE, quality=quality))
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    AudioResampler(ResamplerConfig(input_rate, OUTPUT_RATE, quality=quality))
+    warm = time.perf_counter() - start
+    return cold * 1000, warm * 1000
+
+
+def run_quality_table(seconds: int = 20) -> dict:
+    """Throughput, alias rejection and construction cost per (input rate, quality)"""
+    results = {}
+    for input_rate in QUALITY_RATES:
+        audio = _signal(input_rate, seconds)
+        chunks = _chunks(audio, input_rate)
+        for quality in QUALITY_ZERO_CROSSINGS:
+            resampler = AudioResampler(ResamplerConfig(input_rate, OUTPUT_RATE, quality=quality))
+            start = time.perf_counter()
+            for chunk in chunks:
+                resampler.resample_chunk(chunk)
+            elapsed = time.perf_counter() - start
+            cold_ms, warm_ms = _construction_ms(input_rate, quality)
+            results[(input_rate, quality)] = {
+                'taps_per_phase': resampler.taps_per_phase,
+                'x_realtime': seconds / elapsed,
+                'alias_rejection_db': _alias_rejection_db(input_rate, quality),
+                'cold_construct_ms': cold_ms,
+                'warm_construct_ms': warm_ms,
+            }
+    return results
+
+
+@pytest.mark.benchmark
+def test_quality_levels_trade_speed_for_alias_rejection():
+    """Faster qualities must be quicker; higher ones must reject aliases better."""
+    table = run_quality_table(seconds=5)
+    for input_rate in QUALITY_RATES:
+        fast, high = table[(input_rate, 'fast')], table[(input_rate, 'high')]
+        assert fast['x_realtime'] > high['x_realtime'], input_rate
+        assert high['alias_rejection_db'] > fast['alias_rejection_db'] > 20, input_rate
+        assert high['warm_construct_ms'] < high['cold_construct_ms'], input_rate
+
+
+@pytest.mark.benchmark
+def test_streaming_resampler_removes_chunk_edge_artifacts():
+    """Streaming output should stay clean at chunk boundaries and well above realtime."""
+    results = run_benchmark(seconds=10)
+    for input_rate, row in results.items():
+        assert row['streaming']['max_error'] < 0.01, input_rate
+        assert row['streaming']['max_error'] < row['legacy']['max_error'], input_rate
+        assert row['streaming']['x_realtime'] > 20, input_rate
+
+
+def _print_quality_table(table: dict):
+    print(f"{'input Hz':<10}{'quality':<10}{'taps/phase':>11}{'x RT':>8}{'alias dB':>10}"
+          f"{'cold ms':>9}{'warm ms':>9}")
+    for (input_rate, quality), row in table.items():
+        print(f"{input_rate:<10}{quality:<10}{row['taps_per_phase']:>11}{row['x_realtime']:>8.0f}"
+              f"{row['alias_rejection_db']:>10.1f}{row['cold_construct_ms']:>9.2f}"
+              f"{row['warm_construct_ms']:>9.3f}")
+
+
+def _print_report(results: dict):
+    print(f"{'input Hz':<10}{'legacy x RT':>14}{'stream x RT':>14}{'legacy err':>13}{'stream err':>13}")
+    for input_rate, row in results.items():
+        print(f"{input_rate:<10}{row['legacy']['x_realtime']:>14.0f}{row['streaming']['x_realtime']:>14.0f}"
+              f"{row['legacy']['max_error']:>13.4f}{row['streaming']['max_error']:>13.6f}")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
+    print()
+    _print_quality_table(run_quality_table())
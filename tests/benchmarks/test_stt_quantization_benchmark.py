@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark: int8 dynamic quantization vs fp32 for CPU STT inference.
+
+Runs the ONNX CPU runtime twice over the same speech-like segments (the
+`commands.wav` pattern from tests/fixtures/generate_audio_samples.py), once
+on the fp32 graph and once with `stt_cpu_quantization = "int8"`, and reports
+per-segment latency, realtime factor, model size, startup time with and
+without the conversion cache, and the word error rate of the int8
+transcripts measured against the fp32 ones.
+
+By default the graph is a stand-in Conformer-sized MLP encoder with a CTC
+head (random weights), which shows the runtime cost but not real accuracy.
+Point PARAKEET_ONNX_MODEL at an exported CTC model (manifest beside it) to
+measure the real tradeoff.
+
+Run directly for a report:
+    python tests/benchmarks/test_stt_quantization_benchmark.py
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from personalparakeet.config import V3Config
+from personalparakeet.core.stt_factory import STTFactory
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+from onnx import TensorProto, helper, numpy_helper  # noqa: E402
+
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 4.0
+SEGMENTS = 8
+N_MELS = 80
+HIDDEN = 512
+LAYERS = 6
+VOCABULARY = [f"▁w{i}" for i in range(63)]  # Blank is the last id
+
+_FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "generate_audio_samples.py"
+
+
+def _fixture_generator():
+    spec = importlib.util.spec_from_file_location("generate_audio_samples", _FIXTURES)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _segments():
+    """Speech-like segments at dictation level"""
+    generator = _fixture_generator()
+    np.random.seed(0)
+    num_samples = int(SEGMENT_SECONDS * SAMPLE_RATE)
+    segments = []
+    for _ in range(SEGMENTS):
+        audio = generator.generate_speech_like_audio(SEGMENT_SECONDS)[:num_samples]
+        segments.append((audio / np.max(np.abs(audio)) * 0.3).astype(np.float32))
+    return segments
+
+
+def _export_stand_in(path: Path):
+    """Frame-wise MLP encoder + CTC head with the NeMo export signature"""
+    rng = np.random.default_rng(0)
+    initializers, nodes = [], [helper.make_node("Transpose", ["audio_signal"], ["h0"], perm=[0, 2, 1])]
+    sizes = [N_MELS] + [HIDDEN] * LAYERS + [len(VOCABULARY) + 1]
+    for layer, (fan_in, fan_out) in enumerate(zip(sizes[:-1], sizes[1:])):
+        weight = (rng.standard_normal((fan_in, fan_out)) * np.sqrt(2.0 / fan_in)).astype(np.float32)
+        initializers += [numpy_helper.from_array(weight, f"W{layer}"),
+                         numpy_helper.from_array(np.zeros(fan_out, dtype=np.float32), f"b{layer}")]
+        nodes += [helper.make_node("MatMul", [f"h{layer}", f"W{layer}"], [f"m{layer}"]),
+                  helper.make_node("Add", [f"m{layer}", f"b{layer}"], [f"a{layer}"])]
+        if layer < LAYERS:
+            nodes.append(helper.make_node("Relu", [f"a{layer}"], [f"h{layer + 1}"]))
+    nodes += [helper.make_node("LogSoftmax", [f"a{LAYERS}"], ["logprobs"], axis=-1),
+              helper.make_node("Identity", ["length"], ["encoded_lengths"])]
+    graph = helper.make_graph(
+        nodes, "stand_in_encoder",
+        [helper.make_tensor_value_info("audio_signal", TensorProto.FLOAT, ["B", N_MELS, "T"]),
+         helper.make_tensor_value_info("length", TensorProto.INT64, ["B"])],
+        [helper.make_tensor_value_info("logprobs", TensorProto.FLOAT, ["B", "T", len(VOCABULARY) + 1]),
+         helper.make_tensor_value_info("encoded_lengths", TensorProto.INT64, ["B"])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    path.with_suffix(".json").write_text(json.dumps({
+        "vocabulary": VOCABULARY,
+        "blank_id": len(VOCABULARY),
+        "features": {"n_mels": N_MELS},
+    }), encoding="utf-8")
+
+
+def _word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance over the reference length"""
+    ref, hyp = reference.split(), hypothesis.split()
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            previous, distances[j] = distances[j], min(distances[j] + 1, distances[j - 1] + 1,
+                                                       previous + (ref_word != hyp_word))
+    return distances[-1] / max(len(ref), 1)
+
+
+def _start(model_path: Path, cache_dir: Path, quantization: str):
+    """Initialized processor and its startup time"""
+    config = V3Config()
+    config.audio.stt_runtime = "onnx"
+    config.audio.stt_onnx_model_path = str(model_path)
+    config.audio.stt_cpu_quantization = quantization
+    config.audio.model_cache_dir = str(cache_dir)
+    config.audio.stt_warmup = False
+    processor = STTFactory.create_stt_processor(config)
+    start = time.perf_counter()
+    asyncio.run(processor.initialize())
+    return processor, time.perf_counter() - start
+
+
+def _measure(processor, segments, runs: int = 3):
+    """Transcripts and best-of-runs mean latency per segment"""
+    processor.transcribe(segments[0])  # Untimed warm-up
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        texts = [processor.transcribe(segment) or "" for segment in segments]
+        best = min(best, (time.perf_counter() - start) / len(segments))
+    return texts, best
+
+
+def _model_bytes(model_path: Path) -> int:
+    """Graph plus its external data file, if any"""
+    return sum(f.stat().st_size for f in model_path.parent.glob(model_path.name + "*"))
+
+
+def run_benchmark() -> dict:
+    """Latency, size, startup and agreement for fp32 and int8"""
+    segments = _segments()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmpdir = Path(tmp)
+        if os.environ.get("PARAKEET_ONNX_MODEL"):
+            model_path = Path(os.environ["PARAKEET_ONNX_MODEL"]).expanduser()
+        else:
+            model_path = tmpdir / "stand_in.onnx"
+            _export_stand_in(model_path)
+        cache_dir = tmpdir / "cache"
+
+        fp32, fp32_startup = _start(model_path, cache_dir, "none")
+        reference, fp32_latency = _measure(fp32, segments)
+
+        _, convert_startup = _start(model_path, cache_dir, "int8")
+        int8, cached_startup = _start(model_path, cache_dir, "int8")
+        texts, int8_latency = _measure(int8, segments)
+        int8_path = next((cache_dir / "quantized").glob("*/model.onnx"))
+
+        wer = [_word_error_rate(ref, hyp) for ref, hyp in zip(reference, texts)]
+        return {
+            'fp32': {'ms_per_segment': fp32_latency * 1000, 'x_realtime': SEGMENT_SECONDS / fp32_latency,
+                     'model_mb': _model_bytes(model_path) / 1e6, 'startup_s': fp32_startup},
+            'int8': {'ms_per_segment': int8_latency * 1000, 'x_realtime': SEGMENT_SECONDS / int8_latency,
+                     'model_mb': _model_bytes(int8_path) / 1e6, 'startup_s': cached_startup,
+                     'first_startup_s': convert_startup},
+            'speedup': fp32_latency / int8_latency,
+            'wer_vs_fp32': float(np.mean(wer)),
+            'exact_transcripts': sum(ref == hyp for ref, hyp in zip(reference, texts)) / len(texts),
+        }
+
+
+@pytest.mark.benchmark
+def test_int8_shrinks_model_and_tracks_fp32():
+    """int8 should cut the weights ~4x, cache the conversion and stay close to fp32 output."""
+    results = run_benchmark()
+    assert results['int8']['model_mb'] < 0.35 * results['fp32']['model_mb']
+    assert results['int8']['startup_s'] < results['int8']['first_startup_s']
+    assert results['int8']['ms_per_segment'] < 1.5 * results['fp32']['ms_per_segment']
+    assert results['wer_vs_fp32'] < 0.25
+
+
+def _print_report(results: dict):
+    print(f"{'mode':<6}{'ms/segment':>12}{'x RT':>8}{'model MB':>10}{'startup s':>11}")
+    for mode in ('fp32', 'int8'):
+        row = results[mode]
+        print(f"{mode:<6}{row['ms_per_segment']:>12.1f}{row['x_realtime']:>8.0f}"
+              f"{row['model_mb']:>10.1f}{row['startup_s']:>11.2f}")
+    print(f"int8 first startup (conversion): {results['int8']['first_startup_s']:.2f}s")
+    print(f"int8 speedup: {results['speedup']:.2f}x, WER vs fp32: {results['wer_vs_fp32']:.1%}, "
+          f"identical transcripts: {results['exact_transcripts']:.0%}")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
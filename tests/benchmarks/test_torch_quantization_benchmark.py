@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark: int8 dynamic quantization vs fp32 for the PyTorch STT encoder.
+
+The PyTorch counterpart of test_stt_quantization_benchmark.py. Runs the same
+speech-like segments (the `commands.wav` pattern from
+tests/fixtures/generate_audio_samples.py) through an fp32 model and through
+the same model after quantize_torch_encoder, and reports per-segment latency,
+realtime factor, encoder size, startup time with and without the conversion
+cache, and the word error rate of the int8 transcripts measured against the
+fp32 ones.
+
+The model is a stand-in with NeMo's layout - a Conformer-sized MLP
+`.encoder` and a CTC head as `.decoder` (random weights) - which shows the
+runtime cost but not real accuracy.
+
+Run directly for a report:
+    python tests/benchmarks/test_torch_quantization_benchmark.py
+"""
+
+import importlib.util
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from personalparakeet.core.onnx_stt_processor import LogMelFeaturizer
+from personalparakeet.core.quantization import quantize_torch_encoder
+
+torch = pytest.importorskip("torch")
+
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 4.0
+SEGMENTS = 8
+N_MELS = 80
+HIDDEN = 512
+LAYERS = 6
+VOCABULARY = [f"▁w{i}" for i in range(63)]  # Blank is the last id
+SOURCE = "stand-in/mlp-ctc"
+
+_FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "generate_audio_samples.py"
+
+
+def _segments():
+    """Speech-like segments at dictation level"""
+    spec = importlib.util.spec_from_file_location("generate_audio_samples", _FIXTURES)
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    np.random.seed(0)
+    num_samples = int(SEGMENT_SECONDS * SAMPLE_RATE)
+    segments = []
+    for _ in range(SEGMENTS):
+        audio = generator.generate_speech_like_audio(SEGMENT_SECONDS)[:num_samples]
+        segments.append((audio / np.max(np.abs(audio)) * 0.3).astype(np.float32))
+    return segments
+
+
+def _stand_in_model():
+    """Frame-wise MLP encoder + CTC head (same weights on every call)"""
+    torch.manual_seed(0)
+    layers = []
+    for fan_in in [N_MELS] + [HIDDEN] * (LAYERS - 1):
+        layers += [torch.nn.Linear(fan_in, HIDDEN), torch.nn.ReLU()]
+    model = torch.nn.Module()
+    model.encoder = torch.nn.Sequential(*layers)
+    model.decoder = torch.nn.Linear(HIDDEN, len(VOCABULARY) + 1)
+    return model.eval()
+
+
+def _transcribe(model, features: np.ndarray) -> str:
+    """Greedy CTC decode of (n_mels, frames) features"""
+    with torch.inference_mode():
+        logits = model.decoder(model.encoder(torch.from_numpy(features.T.copy())))
+    words, previous = [], None
+    for token in logits.argmax(dim=-1).tolist():
+        if token != previous and token != len(VOCABULARY):
+            words.append(VOCABULARY[token].lstrip("▁"))
+        previous = token
+    return " ".join(words)
+
+
+def _word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance over the reference length"""
+    ref, hyp = reference.split(), hypothesis.split()
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            previous, distances[j] = distances[j], min(distances[j] + 1, distances[j - 1] + 1,
+                                                       previous + (ref_word != hyp_word))
+    return distances[-1] / max(len(ref), 1)
+
+
+def _quantized(cache_dir: Path):
+    """A fresh stand-in with an int8 encoder, and the time quantize_torch_encoder took"""
+    model = _stand_in_model()
+    start = time.perf_counter()
+    quantize_torch_encoder(model, SOURCE, cache_dir)
+    return model, time.perf_counter() - start
+
+
+def _measure(model, features, runs: int = 3):
+    """Transcripts and best-of-runs mean latency per segment"""
+    _transcribe(model, features[0])  # Untimed warm-up
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        texts = [_transcribe(model, f) for f in features]
+        best = min(best, (time.perf_counter() - start) / len(features))
+    return texts, best
+
+
+def run_benchmark() -> dict:
+    """Latency, size, startup and agreement for fp32 and int8"""
+    featurizer = LogMelFeaturizer(n_mels=N_MELS)
+    features = [featurizer(segment) for segment in _segments()]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp) / "quantized"
+        fp32 = _stand_in_model()
+        reference, fp32_latency = _measure(fp32, features)
+        fp32_mb = sum(p.numel() * p.element_size() for p in fp32.encoder.parameters()) / 1e6
+
+        _, convert_startup = _quantized(cache_dir)
+        int8, cached_startup = _quantized(cache_dir)
+        texts, int8_latency = _measure(int8, features)
+        int8_mb = sum(f.stat().st_size for f in cache_dir.glob("*.pt")) / 1e6
+
+    wer = [_word_error_rate(ref, hyp) for ref, hyp in zip(reference, texts)]
+    return {
+        'fp32': {'ms_per_segment': fp32_latency * 1000, 'x_realtime': SEGMENT_SECONDS / fp32_latency,
+                 'encoder_mb': fp32_mb},
+        'int8': {'ms_per_segment': int8_latency * 1000, 'x_realtime': SEGMENT_SECONDS / int8_latency,
+                 'encoder_mb': int8_mb, 'startup_s': cached_startup, 'first_startup_s': convert_startup},
+        'speedup': fp32_latency / int8_latency,
+        'wer_vs_fp32': float(np.mean(wer)),
+        'exact_transcripts': sum(ref == hyp for ref, hyp in zip(reference, texts)) / len(texts),
+    }
+
+
+@pytest.mark.benchmark
+def test_int8_encoder_shrinks_and_tracks_fp32():
+    """int8 should cut the encoder ~4x, load from the cache faster than it converts and stay close to fp32."""
+    results = run_benchmark()
+    assert results['int8']['encoder_mb'] < 0.35 * results['fp32']['encoder_mb']
+    assert results['int8']['startup_s'] < results['int8']['first_startup_s']
+    assert results['int8']['ms_per_segment'] < 1.5 * results['fp32']['ms_per_segment']
+    assert results['wer_vs_fp32'] < 0.25
+
+
+def _print_report(results: dict):
+    print(f"{'mode':<6}{'ms/segment':>12}{'x RT':>8}{'encoder MB':>12}")
+    for mode in ('fp32', 'int8'):
+        row = results[mode]
+        print(f"{mode:<6}{row['ms_per_segment']:>12.1f}{row['x_realtime']:>8.0f}{row['encoder_mb']:>12.1f}")
+    print(f"int8 startup: {results['int8']['first_startup_s']:.2f}s converting, "
+          f"{results['int8']['startup_s']:.2f}s from the cache")
+    print(f"int8 speedup: {results['speedup']:.2f}x, WER vs fp32: {results['wer_vs_fp32']:.1%}, "
+          f"identical transcripts: {results['exact_transcripts']:.0%}")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fixed-threshold energy VAD vs. AdaptiveVoiceActivityDetector.
+
+Builds the `commands.wav` fixture pattern (speech-like bursts separated by
+pauses, from tests/fixtures/generate_audio_samples.py) at a normal and a
+quiet talker level and mixes it with room noise: a faint hiss, fan rumble
+and keyboard clicks. Each detector is fed 0.5 s chunks and scored per frame
+against the known burst positions, ignoring a short collar after each burst
+where holding speech (hangover) is intended. CPU cost is reported as a
+multiple of realtime.
+
+Run directly for a report:
+    python tests/benchmarks/test_vad_benchmark.py
+"""
+
+import importlib.util
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from personalparakeet.config import VADConfig
+from personalparakeet.core.vad_engine import create_vad
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 8000  # 0.5 s, AudioConfig.chunk_size
+BURST_SECONDS = 1.0
+PAUSE_SECONDS = 1.0
+BURSTS = 8
+COLLAR_SECONDS = 0.3  # VADConfig.hangover_duration
+TALKER_LEVELS = {'normal': 0.3, 'quiet': 0.006}
+NOISES = ('hiss', 'fan', 'keyboard')
+DETECTORS = ('energy', 'adaptive')
+
+_FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "generate_audio_samples.py"
+
+
+def _fixture_generator():
+    spec = importlib.util.spec_from_file_location("generate_audio_samples", _FIXTURES)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _speech_track(level: float):
+    """Bursts in the commands.wav pattern, normalized to `level` peak, plus ground truth"""
+    generator = _fixture_generator()
+    np.random.seed(0)
+    burst_samples = int(BURST_SECONDS * SAMPLE_RATE)
+    pause_samples = int(PAUSE_SECONDS * SAMPLE_RATE)
+    audio, truth = [np.zeros(pause_samples)], [np.zeros(pause_samples, dtype=bool)]
+    for _ in range(BURSTS):
+        burst = generator.generate_speech_like_audio(BURST_SECONDS)[:burst_samples]
+        audio += [burst / np.max(np.abs(burst)) * level, np.zeros(pause_samples)]
+        truth += [np.ones(burst_samples, dtype=bool), np.zeros(pause_samples, dtype=bool)]
+    return np.concatenate(audio), np.concatenate(truth)
+
+
+def _noise(kind: str, num_samples: int) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    hiss = rng.standard_normal(num_samples) * 0.0005
+    if kind == 'hiss':
+        return hiss
+    if kind == 'fan':
+        # Broadband rumble below 100 Hz, loud enough to trip a 0.01 RMS threshold
+        rumble = signal.sosfilt(signal.butter(4, 100, fs=SAMPLE_RATE, output='sos'),
+                                rng.standard_normal(num_samples))
+        return hiss + rumble / np.sqrt(np.mean(rumble ** 2)) * 0.02
+    # Keyboard: 5 ms decaying broadband clicks, ~8 keystrokes per second
+    clicks = np.zeros(num_samples)
+    click_len = int(0.005 * SAMPLE_RATE)
+    decay = np.exp(-np.arange(click_len) / (click_len / 4))
+    for start in rng.integers(0, num_samples - click_len, size=int(8 * num_samples / SAMPLE_RATE)):
+        clicks[start:start + click_len] += rng.standard_normal(click_len) * decay * 0.15
+    return hiss + clicks
+
+
+def _scenario(level_name: str, noise: str):
+    speech, truth = _speech_track(TALKER_LEVELS[level_name])
+    return (speech + _noise(noise, len(speech))).astype(np.float32), truth
+
+
+def _run_detector(mode: str, audio: np.ndarray):
+    """Per-frame flags for a 0.5 s chunked stream and the time spent classifying"""
+    vad = create_vad(VADConfig(mode=mode), SAMPLE_RATE)
+    flags = []
+    start = time.perf_counter()
+    for i in range(0, len(audio), CHUNK_SAMPLES):
+        flags.append(vad.process_audio_frame(audio[i:i + CHUNK_SAMPLES])['speech_flags'])
+    elapsed = time.perf_counter() - start
+    return np.concatenate(flags), vad.frame_size, elapsed
+
+
+def _score(flags: np.ndarray, frame_size: int, truth: np.ndarray) -> dict:
+    """Frame accuracy against the majority label of each frame's samples, outside the collars"""
+    frames = truth[:len(flags) * frame_size].reshape(len(flags), frame_size)
+    labels = frames.mean(axis=1) >= 0.5
+    collar = int(round(COLLAR_SECONDS * SAMPLE_RATE / frame_size))
+    scored = np.ones(len(labels), dtype=bool)
+    for end in np.flatnonzero(labels[:-1] & ~labels[1:]) + 1:
+        scored[end:end + collar] = False
+    flags, labels = flags[scored], labels[scored]
+    return {
+        'accuracy': float(np.mean(flags == labels)),
+        'false_alarm': float(np.mean(flags[~labels])) if np.any(~labels) else 0.0,
+        'miss': float(np.mean(~flags[labels])) if np.any(labels) else 0.0,
+    }
+
+
+def run_benchmark() -> dict:
+    """Accuracy, false alarm / miss rate and throughput per (talker, noise, detector)"""
+    results = {}
+    for level_name in TALKER_LEVELS:
+        for noise in NOISES:
+            audio, truth = _scenario(level_name, noise)
+            seconds = len(audio) / SAMPLE_RATE
+            for mode in DETECTORS:
+                flags, frame_size, elapsed = _run_detector(mode, audio)
+                row = _score(flags, frame_size, truth)
+                row['x_realtime'] = seconds / elapsed
+                results[(level_name, noise, mode)] = row
+    return results
+
+
+@pytest.mark.benchmark
+def test_adaptive_vad_rejects_room_noise_and_keeps_quiet_talkers():
+    """Adaptive VAD should beat the fixed threshold where it fails, and stay cheap."""
+    results = run_benchmark()
+    for noise in ('fan', 'keyboard'):
+        energy, adaptive = results[('normal', noise, 'energy')], results[('normal', noise, 'adaptive')]
+        assert adaptive['false_alarm'] < energy['false_alarm'], noise
+        assert adaptive['false_alarm'] < 0.1, noise
+    for noise in NOISES:
+        energy, adaptive = results[('quiet', noise, 'energy')], results[('quiet', noise, 'adaptive')]
+        assert adaptive['accuracy'] >= energy['accuracy'], noise
+    assert results[('quiet', 'hiss', 'adaptive')]['miss'] < 0.1
+    for key, row in results.items():
+        if key[2] == 'adaptive':
+            assert row['accuracy'] > 0.85, key
+            assert row['x_realtime'] > 100, key
+
+
+def _print_report(results: dict):
+    print(f"{'talker':<8}{'noise':<10}{'detector':<10}{'accuracy':>10}{'false alarm':>13}"
+          f"{'miss':>8}{'x RT':>8}")
+    for (level_name, noise, mode), row in results.items():
+        print(f"{level_name:<8}{noise:<10}{mode:<10}{row['accuracy']:>10.3f}{row['false_alarm']:>13.3f}"
+              f"{row['miss']:>8.3f}{row['x_realtime']:>8.0f}")
+
+
+if __name__ == "__main__":
+    _print_report(run_benchmark())
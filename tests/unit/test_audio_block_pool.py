@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AudioBlockPool module.
+"""
+
+import threading
+import unittest
+
+import numpy as np
+
+from personalparakeet.core.audio_block_pool import AudioBlockPool
+
+
+class TestAudioBlockPool(unittest.TestCase):
+    """Test suite for the AudioBlockPool class."""
+
+    def setUp(self):
+        """Create a small pool so tests can fill it."""
+        self.pool = AudioBlockPool(num_blocks=3, block_size=4, poll_interval=0.001)
+
+    def test_blocks_are_delivered_in_order(self):
+        """Test FIFO delivery of written blocks."""
+        self.pool.write(np.array([1, 2, 3, 4], dtype=np.float32))
+        self.pool.write(np.array([5, 6], dtype=np.float32))
+
+        block = self.pool.get(timeout=0.1)
+        np.testing.assert_array_equal(block, [1, 2, 3, 4])
+        self.pool.release()
+
+        block = self.pool.get(timeout=0.1)
+        np.testing.assert_array_equal(block, [5, 6])
+        self.pool.release()
+        self.assertEqual(self.pool.qsize(), 0)
+
+    def test_get_returns_view_into_preallocated_slot(self):
+        """Test that the consumer reads the slot in place."""
+        self.pool.write(np.ones(4, dtype=np.float32))
+        block = self.pool.get(timeout=0.1)
+        self.assertTrue(np.shares_memory(block, self.pool._blocks))
+
+    def test_overflow_is_counted_not_raised(self):
+        """Test that a full pool drops the new block and counts it."""
+        for _ in range(3):
+            self.assertTrue(self.pool.write(np.zeros(4, dtype=np.float32)))
+        self.assertFalse(self.pool.write(np.zeros(4, dtype=np.float32)))
+        self.assertEqual(self.pool.overflow_count, 1)
+        self.assertFalse(self.pool.has_space())
+
+    def test_released_slots_are_recycled(self):
+        """Test that slots become writable again after release."""
+        for _ in range(3):
+            self.pool.write(np.zeros(4, dtype=np.float32))
+        self.pool.get(timeout=0.1)
+        self.pool.release()
+        self.assertTrue(self.pool.write(np.full(4, 7, dtype=np.float32)))
+        self.assertEqual(self.pool.overflow_count, 0)
+
+    def test_oversized_block_is_truncated(self):
+        """Test that blocks longer than the slot keep their head."""
+        self.pool.write(np.arange(6, dtype=np.float32))
+        np.testing.assert_array_equal(self.pool.get(timeout=0.1), [0, 1, 2, 3])
+        self.assertEqual(self.pool.truncated_count, 1)
+
+    def test_get_times_out_when_empty(self):
+        """Test that get returns None when nothing arrives."""
+        self.assertIsNone(self.pool.get(timeout=0.01))
+
+    def test_producer_and_consumer_threads(self):
+        """Test lossless transfer between a producer and a consumer thread."""
+        pool = AudioBlockPool(num_blocks=8, block_size=2, poll_interval=0.0005)
+        received = []
+
+        def consume():
+            while len(received) < 200:
+                block = pool.get(timeout=1.0)
+                if block is None:
+                    break
+                received.append(float(block[0]))
+                pool.release()
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        value = 0
+        while value < 200:
+            if pool.write(np.array([value, value], dtype=np.float32)):
+                value += 1
+        consumer.join(timeout=5.0)
+
+        self.assertEqual(received, [float(i) for i in range(200)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming audio conditioning chain.
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.audio_conditioner import AudioConditioner, ConditionerConfig
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds, level, frequency=440.0):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def _rms(audio):
+    return float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+
+
+class TestAudioConditioner(unittest.TestCase):
+    """Test suite for DC removal, high-pass, AGC and limiter."""
+
+    def test_removes_dc_offset_and_rumble(self):
+        """Test a mic DC offset and 30 Hz rumble are removed while speech-band audio passes."""
+        conditioner = AudioConditioner(ConditionerConfig())
+        audio = 0.2 + _tone(2.0, 0.1, frequency=30.0)
+        out = conditioner.process(audio)[SAMPLE_RATE:]  # After the filters settle
+        self.assertLess(abs(float(np.mean(out))), 1e-3)
+        self.assertLess(_rms(out), 0.2 * _rms(audio[SAMPLE_RATE:] - 0.2))
+
+        voice = _tone(1.0, 0.1)
+        self.assertAlmostEqual(_rms(conditioner.process(voice)[4000:]), _rms(voice), delta=0.005)
+
+    def test_output_does_not_depend_on_chunking(self):
+        """Test filter, AGC and limiter state carry across chunk boundaries."""
+        config = ConditionerConfig(agc=True, limiter_threshold=0.3)
+        rng = np.random.default_rng(0)
+        audio = (_tone(1.5, 0.5) * rng.uniform(0, 1, 24000)).astype(np.float32)
+
+        whole = AudioConditioner(config).process(audio)
+        chunked = AudioConditioner(config)
+        parts = [chunked.process(chunk) for chunk in np.array_split(audio, [7, 3001, 3002, 12345])]
+        np.testing.assert_allclose(np.concatenate(parts), whole, atol=1e-6)
+
+    def test_agc_raises_quiet_speech_slowly_and_holds_on_silence(self):
+        """Test the AGC gain moves at its rate limit and ignores quiet blocks."""
+        conditioner = AudioConditioner(ConditionerConfig(agc=True, agc_target_rms=0.1))
+        conditioner.process(_tone(1.0, 0.0028))  # Below agc_min_level: no boost
+        self.assertEqual(conditioner.agc_gain_db, 0.0)
+
+        conditioner.process(_tone(1.0, 0.035))  # RMS ~0.025, ~12 dB under target
+        self.assertAlmostEqual(conditioner.agc_gain_db, 6.0, places=1)  # 6 dB/s
+        conditioner.process(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        self.assertAlmostEqual(conditioner.agc_gain_db, 6.0, places=1)
+        conditioner.process(_tone(2.0, 0.035))
+        self.assertAlmostEqual(_rms(conditioner.process(_tone(0.5, 0.035))), 0.1, delta=0.005)
+
+    def test_limiter_caps_peaks_and_releases(self):
+        """Test peaks never exceed the ceiling and the gain recovers afterwards."""
+        conditioner = AudioConditioner(ConditionerConfig(dc_block=False, highpass_cutoff=0))
+        loud = conditioner.process(_tone(0.5, 1.5))
+        self.assertLessEqual(float(np.max(np.abs(loud))), 0.9 + 1e-6)
+        self.assertGreater(conditioner.get_metrics()['max_gain_reduction_db'], 4.0)
+
+        quiet = conditioner.process(_tone(0.5, 0.2))
+        self.assertEqual(conditioner.limiter_gain_db, 0.0)
+        np.testing.assert_allclose(quiet[-100:], _tone(0.5, 0.2)[-100:], atol=1e-6)
+
+
+class TestEngineConditioning(unittest.TestCase):
+    """Test suite for the conditioning stage inside AudioEngine."""
+
+    def _vad_flags(self, conditioning, audio):
+        config = V3Config()
+        config.audio.use_mock_stt = True
+        config.audio.capture_sample_rate = SAMPLE_RATE
+        config.audio.audio_conditioning = conditioning
+        engine = AudioEngine(config)
+        asyncio.run(engine.initialize())
+        flags = []
+        engine.on_vad_status = lambda status: flags.extend(status['speech_flags'])
+        for i in range(0, len(audio), 8000):
+            engine._prepare_chunk(audio[i:i + 8000])
+        return np.array(flags)
+
+    def test_desk_rumble_does_not_trigger_speech(self):
+        """Test DC offset plus rumble that trips the fixed VAD is silenced by conditioning."""
+        audio = (0.02 + _tone(3.0, 0.03, frequency=30.0)).astype(np.float32)
+        self.assertTrue(self._vad_flags(False, audio).all())
+        self.assertFalse(self._vad_flags(True, audio)[25:].any())  # After the filters settle
+
+    def test_clipped_input_is_reported_through_the_limiter(self):
+        """Test the frame history counts input clipping the limiter removed from the audio."""
+        config = V3Config()
+        config.audio.use_mock_stt = True
+        config.audio.capture_sample_rate = SAMPLE_RATE
+        engine = AudioEngine(config)
+        asyncio.run(engine.initialize())
+        audio = np.clip(_tone(1.0, 1.5), -1.0, 1.0).astype(np.float32)  # Overdriven microphone
+        engine._prepare_chunk(audio)
+        self.assertGreater(int(engine.frame_history.clipped.peek().sum()), 0)
+        self.assertLess(float(engine.frame_history.peaks.peek().max()), 0.999)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for shared per-frame audio features.
+"""
+
+import unittest
+
+import numpy as np
+
+from personalparakeet.core.audio_features import AudioFeatures, FrameHistory
+from personalparakeet.core.stt_segmentation import AudioSegment, merge_segments
+
+
+class TestAudioFeatures(unittest.TestCase):
+    """Test suite for one-pass RMS, peak and clipping measurement."""
+
+    def setUp(self):
+        self.audio = np.random.default_rng(0).uniform(-0.5, 0.5, 95).astype(np.float32)
+        self.audio[42] = 1.0
+
+    def test_matches_direct_measurement(self):
+        """Test per-frame and whole-chunk values equal a direct pass over the audio."""
+        features = AudioFeatures.from_audio(self.audio, 10)
+        self.assertEqual(features.num_frames, 10)  # Last frame holds 5 samples
+        np.testing.assert_allclose(features.frame_energies[0], np.sqrt(np.mean(self.audio[:10] ** 2)), rtol=1e-6)
+        self.assertAlmostEqual(features.peak, 1.0)
+        self.assertEqual(features.clipped_samples, 1)
+        self.assertEqual(features.frame_clipped[4], 1)
+
+        whole = AudioFeatures.from_frames(self.audio[:90].reshape(9, 10))
+        self.assertAlmostEqual(whole.rms, float(np.sqrt(np.mean(self.audio[:90] ** 2))), places=6)
+
+    def test_slice_and_concatenate_round_trip(self):
+        """Test features split and rejoined describe the same frames."""
+        features = AudioFeatures.from_audio(self.audio, 10)
+        joined = AudioFeatures.concatenate([features.slice(0, 4), features.slice(4, 10)])
+        np.testing.assert_array_equal(joined.frame_peaks, features.frame_peaks)
+        self.assertEqual(joined.frame_size, 10)
+
+
+class TestFrameHistory(unittest.TestCase):
+    """Test suite for sample-clock lookups of recorded frames."""
+
+    def setUp(self):
+        self.history = FrameHistory(sample_rate=100, frame_size=10, history_duration=1.0)
+
+    def _record(self, levels):
+        frames = np.repeat(np.asarray(levels, dtype=np.float32)[:, None], 10, axis=1)
+        self.history.record(np.asarray(levels) > 0, AudioFeatures.from_frames(frames))
+
+    def test_lookup_covers_partial_frames(self):
+        """Test a sample range maps to every frame it touches."""
+        self._record([0.0, 0.2, 0.4, 0.0])
+        flags, features = self.history.lookup(15, 25)
+        np.testing.assert_array_equal(flags, [True, True])
+        np.testing.assert_allclose(features.frame_peaks, [0.2, 0.4])
+        self.assertIsNone(self.history.lookup(30, 50))  # Not recorded yet
+
+    def test_lookup_outside_history_is_none(self):
+        """Test frames that fell out of the ring are not reported."""
+        self._record([0.1] * 15)
+        self.assertIsNone(self.history.lookup(0, 20))
+        self.assertIsNotNone(self.history.lookup(50, 150))
+
+    def test_lookup_copies_features(self):
+        """Test features stay valid after the ring is overwritten."""
+        self._record([0.3] * 5)
+        _, features = self.history.lookup(0, 50)
+        self._record([0.9] * 10)
+        np.testing.assert_allclose(features.frame_peaks, [0.3] * 5)
+
+    def test_merged_segments_concatenate_features(self):
+        """Test merged segments keep their features when every part has them."""
+        self._record([0.2, 0.6])
+        parts = []
+        for i, start in enumerate((0, 10)):
+            segment = AudioSegment(i, start, np.zeros(10, dtype=np.float32), 100)
+            segment.features = self.history.lookup(start, start + 10)[1]
+            parts.append(segment)
+        merged = merge_segments(parts)
+        self.assertAlmostEqual(merged.features.peak, 0.6, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming polyphase AudioResampler.
+"""
+
+import unittest
+
+import numpy as np
+from scipy import signal
+
+from personalparakeet.core.audio_resampler import AudioResampler, ResamplerConfig, get_filter_bank
+
+
+def _resample_in_pieces(resampler, audio, sizes):
+    parts = []
+    offset = 0
+    for size in sizes:
+        parts.append(resampler.resample_chunk(audio[offset:offset + size]))
+        offset += size
+    parts.append(resampler.resample_chunk(audio[offset:]))
+    parts.append(resampler.flush())
+    return np.concatenate(parts)
+
+
+class TestAudioResampler(unittest.TestCase):
+    """Test suite for continuity and ratio handling."""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_output_is_bit_exact_across_chunkings(self):
+        """Test one block and many odd-sized blocks give identical samples."""
+        audio = self.rng.standard_normal(44100).astype(np.float32)
+        resampler = AudioResampler(ResamplerConfig(44100, 16000))
+        whole = _resample_in_pieces(resampler, audio, [])
+
+        resampler.reset()
+        sizes = self.rng.integers(1, 5000, size=20)
+        pieces = _resample_in_pieces(resampler, audio, sizes)
+        np.testing.assert_array_equal(whole, pieces)
+        self.assertEqual(len(whole), 16000)
+
+    def test_matches_resample_poly_for_any_rational_ratio(self):
+        """Test streaming output equals one-shot polyphase resampling."""
+        for input_rate, output_rate in ((48000, 16000), (22050, 16000), (8000, 16000), (32000, 16000)):
+            audio = self.rng.standard_normal(input_rate // 2).astype(np.float32)
+            resampler = AudioResampler(ResamplerConfig(input_rate, output_rate, quality="balanced"))
+            streamed = _resample_in_pieces(resampler, audio, [1000, 333, 4096])
+            reference = signal.resample_poly(audio.astype(np.float64), resampler.up, resampler.down,
+                                             window=resampler.filter)
+            self.assertEqual(len(streamed), len(reference))
+            np.testing.assert_allclose(streamed, reference, atol=1e-5)
+
+    def test_reset_starts_a_new_stream(self):
+        """Test reset() drops carried history and phase."""
+        audio = self.rng.standard_normal(4800).astype(np.float32)
+        resampler = AudioResampler(ResamplerConfig(48000, 16000))
+        first = np.concatenate([resampler.resample_chunk(audio), resampler.flush()])
+        resampler.resample_chunk(self.rng.standard_normal(1234).astype(np.float32))
+        resampler.reset()
+        second = np.concatenate([resampler.resample_chunk(audio), resampler.flush()])
+        np.testing.assert_array_equal(first, second)
+
+    def test_filter_banks_are_shared_per_ratio_and_quality(self):
+        """Test resamplers with the same ratio reuse one read-only bank."""
+        first = AudioResampler(ResamplerConfig(48000, 16000, quality="fast"))
+        second = AudioResampler(ResamplerConfig(96000, 32000, quality="fast"))
+        other = AudioResampler(ResamplerConfig(48000, 16000, quality="high"))
+        self.assertIs(first.filter_bank, second.filter_bank)
+        self.assertIsNot(first.filter_bank, other.filter_bank)
+        self.assertIs(first.filter_bank, get_filter_bank(1, 3, "fast"))
+        self.assertFalse(first.phases.flags.writeable)
+
+    def test_same_rate_passes_audio_through(self):
+        """Test equal rates return the input unchanged."""
+        audio = self.rng.standard_normal(1000).astype(np.float32)
+        resampler = AudioResampler(ResamplerConfig(16000, 16000))
+        np.testing.assert_array_equal(resampler.resample_chunk(audio), audio)
+
+
+if __name__ == '__main__':
+    unittest.main()
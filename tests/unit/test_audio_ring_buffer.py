@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the AudioRingBuffer module.
+"""
+
+import unittest
+
+import numpy as np
+
+from personalparakeet.core.audio_ring_buffer import AudioRingBuffer
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """Test suite for the AudioRingBuffer class."""
+
+    def setUp(self):
+        """Create a small ring so tests exercise wrap-around."""
+        self.ring = AudioRingBuffer(10)
+
+    def test_write_and_read_in_order(self):
+        """Test that samples come back in FIFO order."""
+        self.ring.write(np.arange(4, dtype=np.float32))
+        self.ring.write(np.arange(4, 7, dtype=np.float32))
+        self.assertEqual(len(self.ring), 7)
+        np.testing.assert_array_equal(self.ring.read(5), np.arange(5, dtype=np.float32))
+        self.assertEqual(len(self.ring), 2)
+
+    def test_wrapped_read_is_zero_copy_view(self):
+        """Test that a window spanning the wrap point is still a contiguous view."""
+        self.ring.write(np.arange(8, dtype=np.float32))
+        self.ring.consume(6)
+        self.ring.write(np.arange(8, 14, dtype=np.float32))  # Wraps past the end
+
+        view = self.ring.peek()
+        np.testing.assert_array_equal(view, np.arange(6, 14, dtype=np.float32))
+        self.assertFalse(view.flags.owndata)
+        self.assertTrue(np.shares_memory(view, self.ring._storage))
+
+    def test_overflow_drops_oldest_samples(self):
+        """Test that writing past capacity keeps the newest audio and counts the drop."""
+        self.ring.write(np.arange(8, dtype=np.float32))
+        dropped = self.ring.write(np.arange(8, 12, dtype=np.float32))
+        self.assertEqual(dropped, 2)
+        self.assertEqual(self.ring.overflow_samples, 2)
+        np.testing.assert_array_equal(self.ring.peek(), np.arange(2, 12, dtype=np.float32))
+
+    def test_oversized_write_keeps_newest_capacity(self):
+        """Test that a single write larger than the ring keeps only its tail."""
+        self.ring.write(np.arange(25, dtype=np.float32))
+        np.testing.assert_array_equal(self.ring.peek(), np.arange(15, 25, dtype=np.float32))
+        self.assertEqual(self.ring.start_index, 15)
+
+    def test_latest_returns_newest_samples(self):
+        """Test the tail view used for overlapping windows."""
+        self.ring.write(np.arange(9, dtype=np.float32))
+        self.ring.consume(5)
+        self.ring.write(np.arange(9, 13, dtype=np.float32))
+        np.testing.assert_array_equal(self.ring.latest(3), np.array([10, 11, 12], dtype=np.float32))
+
+    def test_clear_keeps_absolute_counters(self):
+        """Test that clear empties the ring without rewinding sample indices."""
+        self.ring.write(np.ones(6, dtype=np.float32))
+        self.ring.clear()
+        self.assertEqual(len(self.ring), 0)
+        self.assertEqual(self.ring.start_index, 6)
+        self.assertEqual(self.ring.total_consumed, 6)
+
+    def test_invalid_capacity_raises_error(self):
+        """Test that a non-positive capacity raises a ValueError."""
+        with self.assertRaises(ValueError):
+            AudioRingBuffer(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
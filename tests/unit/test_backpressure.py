@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the STT backpressure policy.
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.backpressure import BackpressureController, BackpressureLevel
+from personalparakeet.core.stt_segmentation import AudioSegment, merge_segments
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBackpressureController(unittest.TestCase):
+    """Test suite for level escalation and recovery."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.controller = BackpressureController(min_dwell=1.0, clock=self.clock)
+
+    def _run(self, seconds, rtf, backlog=0.0):
+        """Consume `seconds` of audio in 0.1 s chunks with the given STT load."""
+        for _ in range(int(seconds * 10)):
+            self.controller.record_stt(0.1 * rtf)
+            self.controller.update(0.1, backlog)
+            self.clock.now += 0.1
+
+    def test_escalates_one_step_per_dwell_when_behind(self):
+        """Test slow STT walks up the levels one at a time."""
+        self._run(1.5, rtf=2.0)
+        self.assertEqual(self.controller.level, BackpressureLevel.DROP_SILENCE)
+        self._run(5.0, rtf=2.0)
+        self.assertEqual(self.controller.level, BackpressureLevel.DEGRADE_QUALITY)
+        self.assertEqual(self.controller.escalations, 3)
+        self.assertGreater(self.controller.get_metrics()['rtf'], 1.0)
+
+    def test_full_capture_pool_escalates_even_with_fast_stt(self):
+        """Test backlog alone counts as being behind."""
+        self._run(1.5, rtf=0.1, backlog=0.8)
+        self.assertTrue(self.controller.drop_silence)
+
+    def test_recovers_only_when_load_is_low(self):
+        """Test levels step back down once RTF and backlog are low."""
+        self._run(4.0, rtf=2.0)
+        self.assertTrue(self.controller.merge_segments)
+        self._run(3.0, rtf=0.7)  # Between thresholds: hold
+        self.assertTrue(self.controller.merge_segments)
+        self._run(10.0, rtf=0.1)
+        self.assertEqual(self.controller.level, BackpressureLevel.NORMAL)
+        self.assertGreater(self.controller.recoveries, 0)
+
+    def test_merge_segments_covers_overlap_once(self):
+        """Test overlapping windows are merged without repeating audio."""
+        audio = np.arange(300, dtype=np.float32)
+        first = AudioSegment(0, 0, audio[0:200], 100)
+        second = AudioSegment(1, 100, audio[100:300], 100, is_final=True)
+        merged = merge_segments([first, second])
+        np.testing.assert_array_equal(merged.audio, audio)
+        self.assertEqual(merged.segment_id, 0)
+        self.assertTrue(merged.is_final)
+
+
+class TestEngineBackpressure(unittest.TestCase):
+    """Test suite for load shedding inside AudioEngine."""
+
+    def setUp(self):
+        self.config = V3Config()
+        self.config.audio.use_mock_stt = True
+        self.config.audio.capture_sample_rate = 16000
+        self.config.vad.frame_duration = 0.02  # 1 s chunks hold whole VAD frames
+        self.config.audio.audio_conditioning = False  # Filter tails would bleed into the silent chunks
+        self.engine = AudioEngine(self.config)
+        self.engine.set_clarity_enabled(False)
+        asyncio.run(self.engine.initialize())
+        self.engine.backpressure = BackpressureController(min_dwell=0.0)
+        self.segments = []
+        self.engine.on_segment_transcribed = lambda segment, text: self.segments.append(segment)
+
+    def _escalate_to(self, level):
+        while self.engine.backpressure.level < level:
+            self.engine._update_backpressure(0.1)  # Capture pool reported full: always behind
+        self.assertEqual(self.engine.backpressure.level, level)
+
+    def _feed(self, pattern):
+        """Feed 1 s chunks: True = tone, False = silence."""
+        t = np.arange(16000) / 16000
+        tone = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        silence = np.zeros(16000, dtype=np.float32)
+        for is_tone in pattern:
+            self.engine.process_audio_chunk(tone if is_tone else silence)
+
+    def test_silence_is_dropped_but_speech_is_not(self):
+        """Test silent chunks skip the fixed-window buffer and end the segment."""
+        self.engine.block_pool.qsize = lambda: self.engine.block_pool.num_blocks
+        self._escalate_to(BackpressureLevel.DROP_SILENCE)
+        self._feed([True, True, False, False, True])
+        self.engine.flush_segments()
+
+        metrics = self.engine.get_backpressure_metrics()
+        self.assertEqual(metrics['silent_chunks_dropped'], 2)
+        self.assertAlmostEqual(metrics['silent_seconds_dropped'], 2.0)
+        self.assertEqual(sum(s.duration for s in self.segments), 3.0)
+        # Dropped silence still advances the stream clock
+        self.assertEqual(self.segments[-1].start_time, 4.0)
+
+    def test_short_speech_tail_survives_dropped_silence(self):
+        """Test a tail shorter than the fixed window's flush minimum is emitted, not dropped."""
+        self.engine.block_pool.qsize = lambda: self.engine.block_pool.num_blocks
+        self._escalate_to(BackpressureLevel.DROP_SILENCE)
+        t = np.arange(6400) / 16000
+        self._feed([True] * 4)
+        self.engine.process_audio_chunk((0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32))
+        self._feed([False])
+
+        # One 4 s window, then the 0.4 s tail when the silence ends the segment
+        self.assertEqual([s.duration for s in self.segments], [4.0, 0.4])
+        self.assertTrue(self.segments[-1].is_final)
+        self.assertEqual(len(self.engine.segmenter), 0)
+
+    def test_segments_are_merged_into_one_call(self):
+        """Test completed segments are batched and flushed with all their audio."""
+        self.engine.block_pool.qsize = lambda: self.engine.block_pool.num_blocks
+        self._escalate_to(BackpressureLevel.MERGE_SEGMENTS)
+        calls_before = self.engine.total_stt_calls
+        self._feed([True] * 12)
+        self.engine.flush_segments()
+
+        metrics = self.engine.get_backpressure_metrics()
+        # Three 4 s windows: two fill the 8 s batch, the last one is flushed alone
+        self.assertEqual(self.engine.total_stt_calls - calls_before, 2)
+        self.assertEqual(metrics['segments_merged'], 2)
+        self.assertEqual(metrics['merged_batches'], 1)
+        self.assertEqual(sum(s.duration for s in self.segments), 12.0)
+
+    def test_degraded_level_switches_stt_profile(self):
+        """Test the fast profile is used at the top level and restored on stop."""
+        self.engine.block_pool.qsize = lambda: self.engine.block_pool.num_blocks
+        self._escalate_to(BackpressureLevel.DEGRADE_QUALITY)
+        self.assertEqual(self.engine.stt_processor.quality_profile, "fast")
+
+        self.engine.is_listening = True
+        asyncio.run(self.engine.stop())
+        self.assertEqual(self.engine.stt_processor.quality_profile, "accurate")
+        self.assertEqual(self.engine.backpressure.level, BackpressureLevel.NORMAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,12 +8,44 @@ import json
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
-from personalparakeet.config import V3Config
+from personalparakeet.config import AudioConfig, V3Config
+
+
+def _load(data):
+    """V3Config read from a config.json holding `data`"""
+    with patch("pathlib.Path.exists", return_value=True), \
+            patch("builtins.open", mock_open(read_data=json.dumps(data))):
+        return V3Config()
 
 
 class TestConfig(unittest.TestCase):
     """Test suite for the V3Config class."""
 
+    AUDIO_KEYS = {
+        'stt_speech_gate': False,
+        'stt_min_speech_ratio': 0.25,
+        'stt_trim_padding': 0.3,
+        'audio_conditioning': False,
+        'condition_dc_block': False,
+        'condition_highpass_cutoff': 120.0,
+        'condition_agc': True,
+        'condition_agc_target_rms': 0.08,
+        'condition_agc_max_gain_db': 12.0,
+        'condition_limiter_threshold': 0.8,
+        'noise_suppression': True,
+        'noise_suppression_oversubtraction': 2.0,
+        'noise_suppression_floor_db': -20.0,
+        'stt_max_batch_size': 1,
+        'stt_max_batch_wait': 0.05,
+        'stt_warmup': False,
+        'stt_warmup_runs': 3,
+        'stt_cpu_quantization': "int8",
+        'stt_background_load': False,
+        'stt_startup_buffer_duration': 30.0,
+        'stt_artifact_cache': False,
+        'stt_incremental_streaming': False,
+    }  # Non-default audio values, each read back from config.json
+
     def test_default_config_loading(self):
         """Test that a default configuration is loaded when no file exists."""
         with patch("pathlib.Path.exists") as mock_exists:
@@ -38,6 +70,33 @@ class TestConfig(unittest.TestCase):
             self.assertEqual(config.audio.sample_rate, 8000)
             self.assertFalse(config.thought_linking.enabled)
 
+    def test_stt_runtime_keys_are_loaded(self):
+        """Test the ONNX runtime can be selected and tuned from config.json."""
+        config = _load({"audio": {"stt_runtime": "onnx", "stt_onnx_model_path": "~/models/parakeet.onnx",
+                                  "stt_cpu_threads": 4, "stt_cpu_inter_op_threads": 2}})
+        self.assertEqual(config.audio.stt_runtime, "onnx")
+        self.assertEqual(config.audio.stt_onnx_model_path, "~/models/parakeet.onnx")
+        self.assertEqual(config.audio.stt_cpu_threads, 4)
+        self.assertEqual(config.audio.stt_cpu_inter_op_threads, 2)
+
+    def test_adaptive_vad_keys_are_loaded(self):
+        """Test the adaptive detector and its tuning can be chosen from config.json."""
+        tuning = {"snr_threshold_db": 12.0, "noise_rise_db_per_s": 1.5, "min_energy": 0.002,
+                  "min_band_ratio": 0.5, "max_zero_crossing_rate": 0.3, "attack_duration": 0.09,
+                  "hangover_duration": 0.45}
+        config = _load({"vad": {"mode": "adaptive", **tuning}})
+        self.assertEqual(config.vad.mode, "adaptive")
+        for key, value in tuning.items():
+            self.assertEqual(getattr(config.vad, key), value, key)
+
+    def test_audio_pipeline_keys_are_loaded(self):
+        """Test every tunable audio key round-trips through config.json."""
+        defaults = AudioConfig()
+        config = _load({"audio": self.AUDIO_KEYS})
+        for key, value in self.AUDIO_KEYS.items():
+            self.assertNotEqual(getattr(defaults, key), value, key)
+            self.assertEqual(getattr(config.audio, key), value, key)
+
     def test_config_saving_to_file(self):
         """Test that the configuration is correctly saved to a JSON file."""
         config = V3Config()
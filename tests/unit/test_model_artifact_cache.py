@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the local model artifact cache.
+"""
+
+import importlib.util
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+from personalparakeet.core.model_artifact_cache import (CONFIG_FILE, SAFETENSORS_FILE, ModelArtifactCache,
+                                                        load_weights, model_fingerprint)
+
+HAVE_TORCH = all(importlib.util.find_spec(m) is not None for m in ("torch", "safetensors"))
+
+CONFIG = {
+    'target': "nemo.collections.asr.models.EncDecRNNTBPEModel",
+    'tokenizer': {'dir': "/train/tokenizer", 'type': "bpe", 'model_path': "nemo:1a2b_tokenizer.model",
+                  'vocab_path': "nemo:3c4d_vocab.txt"},
+    'train_ds': {'manifest_filepath': "/data/train.json"},
+    'validation_ds': {'manifest_filepath': "/data/dev.json"},
+    'encoder': {'d_model': 4},
+}
+
+
+def _write_nemo(path: Path, weights: bytes = b"not used", config=CONFIG):
+    """A .nemo-shaped tarball (NeMo packs members under ./)"""
+    with tarfile.open(path, "w") as tar:
+        members = {'./1a2b_tokenizer.model': b"spm", './3c4d_vocab.txt': b"a\nb\n",
+                   './model_weights.ckpt': weights}
+        if config is not None:
+            members['./' + CONFIG_FILE] = yaml.safe_dump(config).encode()
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+class TestModelArtifactCache(unittest.TestCase):
+    """Test suite for cache keys, extraction and config rewriting."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.nemo_path = self.root / "parakeet.nemo"
+        self.cache = ModelArtifactCache(self.root / "cache")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fingerprint_follows_content(self):
+        """Test the cache key changes with the checkpoint bytes, not its name or mtime."""
+        _write_nemo(self.nemo_path, weights=b"v1")
+        first = model_fingerprint(self.nemo_path)
+        copy = self.root / "copy.nemo"
+        copy.write_bytes(self.nemo_path.read_bytes())
+        self.assertEqual(model_fingerprint(copy), first)
+
+        _write_nemo(self.nemo_path, weights=b"v2")
+        self.assertNotEqual(model_fingerprint(self.nemo_path), first)
+
+    def test_extract_resolves_packed_artifacts(self):
+        """Test nemo: references point at extracted files and dataset sections are dropped."""
+        _write_nemo(self.nemo_path)
+        dest = self.root / "entry"
+        dest.mkdir()
+        self.cache._extract(self.nemo_path, dest)
+
+        config = yaml.safe_load((dest / CONFIG_FILE).read_text())
+        tokenizer = Path(config['tokenizer']['model_path'])
+        self.assertEqual(tokenizer, dest / "artifacts" / "1a2b_tokenizer.model")
+        self.assertEqual(tokenizer.read_bytes(), b"spm")
+        self.assertEqual(config['tokenizer']['dir'], "/train/tokenizer")  # Plain paths untouched
+        self.assertIsNone(config['train_ds'])
+        self.assertIsNone(config['validation_ds'])
+        self.assertEqual(config['encoder'], {'d_model': 4})
+        self.assertTrue((dest / "model_weights.ckpt").exists())
+
+    def test_failed_build_leaves_no_entry(self):
+        """Test a tarball that isn't a NeMo checkpoint is rejected without caching anything."""
+        _write_nemo(self.nemo_path, config=None)
+        with self.assertRaises(ValueError):
+            self.cache.prepare(self.nemo_path)
+        self.assertIsNone(self.cache.lookup(self.nemo_path))
+        self.assertEqual(list((self.root / "cache").iterdir()), [])
+
+    @unittest.skipUnless(HAVE_TORCH, "torch and safetensors are needed to convert weights")
+    def test_weights_round_trip_through_safetensors(self):
+        """Test the state dict (with tied tensors) comes back memory-mapped and unchanged."""
+        import torch
+
+        weight = torch.arange(12, dtype=torch.float32).reshape(3, 4)
+        state = {'encoder.weight': weight, 'decoder.weight': weight, 'bias': torch.ones(3)}
+        buffer = io.BytesIO()
+        torch.save({'state_dict': state}, buffer)
+        _write_nemo(self.nemo_path, weights=buffer.getvalue())
+
+        entry = self.cache.prepare(self.nemo_path)
+        self.assertEqual(self.cache.prepare(self.nemo_path), entry)
+        self.assertFalse((entry / "model_weights.ckpt").exists())
+        manifest = json.loads((entry / "manifest.json").read_text())
+        self.assertEqual(manifest['fingerprint'], model_fingerprint(self.nemo_path))
+
+        loaded = load_weights(entry / SAFETENSORS_FILE)
+        self.assertEqual(set(loaded), set(state))
+        for key, tensor in state.items():
+            self.assertTrue(torch.equal(loaded[key], tensor), key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the streaming spectral noise suppressor.
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.noise_suppressor import SpectralNoiseSuppressor
+
+SAMPLE_RATE = 16000
+FRAME = 480
+
+
+def _tone(num_frames, level, frequency=440.0, start_frame=0):
+    t = (np.arange(num_frames * FRAME) + start_frame * FRAME) / SAMPLE_RATE
+    return level * np.sin(2 * np.pi * frequency * t)
+
+
+def _rms(audio):
+    return float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+
+
+class TestSpectralNoiseSuppressor(unittest.TestCase):
+    """Test suite for noise learning, suppression and stream alignment."""
+
+    def setUp(self):
+        self.suppressor = SpectralNoiseSuppressor(SAMPLE_RATE, FRAME)
+        self.rng = np.random.default_rng(0)
+
+    def _run(self, audio, flags, splits):
+        """Feed frames in chunks of `splits` frames, return the joined output"""
+        out_audio, out_flags = [], []
+        start = 0
+        for count in splits:
+            audio_part, flag_part = self.suppressor.process(
+                audio[start * FRAME:(start + count) * FRAME], flags[start:start + count])
+            out_audio.append(audio_part)
+            out_flags.append(flag_part)
+            start += count
+        return np.concatenate(out_audio), np.concatenate(out_flags)
+
+    def test_passes_audio_through_before_noise_is_heard(self):
+        """Test speech-only input is reconstructed exactly, one frame late, on the same clock."""
+        audio = _tone(20, 0.3)
+        flags = np.ones(20, dtype=bool)
+        flags[7] = False  # A lone silent frame is never a silent block
+        out, out_flags = self._run(audio, flags, [1, 6, 13])
+
+        self.assertEqual(len(out), 19 * FRAME)  # Last frame held
+        np.testing.assert_allclose(out, audio[:19 * FRAME], atol=1e-6)
+        np.testing.assert_array_equal(out_flags, flags[:19])
+        self.assertIsNone(self.suppressor.noise_power)
+
+    def test_attenuates_steady_noise_and_keeps_speech(self):
+        """Test learned hiss is pushed down while a tone above it survives."""
+        noise = self.rng.standard_normal(60 * FRAME) * 0.01
+        audio = noise.copy()
+        audio[30 * FRAME:] += _tone(30, 0.1, start_frame=30)
+        flags = np.arange(60) >= 30
+        out, _ = self._run(audio, flags, [10] * 6)
+
+        noise_out = out[10 * FRAME:29 * FRAME]
+        self.assertLess(_rms(noise_out), 0.5 * _rms(noise[10 * FRAME:29 * FRAME]))
+        speech_out = out[35 * FRAME:59 * FRAME]
+        speech_in = _tone(24, 0.1, start_frame=35)
+        self.assertLess(_rms(speech_out - speech_in), 0.5 * _rms(noise[35 * FRAME:59 * FRAME]))
+        self.assertGreater(self.suppressor.get_metrics()['noise_frames'], 20)
+
+    def test_reset_starts_a_new_stream(self):
+        """Test reset() drops held audio and the noise estimate."""
+        self.suppressor.process(self.rng.standard_normal(5 * FRAME) * 0.01, np.zeros(5, dtype=bool))
+        self.suppressor.reset()
+        out, flags = self.suppressor.process(_tone(3, 0.2), np.ones(3, dtype=bool))
+        np.testing.assert_allclose(out, _tone(2, 0.2), atol=1e-6)
+        self.assertIsNone(self.suppressor.noise_power)
+
+
+class TestEngineNoiseSuppression(unittest.TestCase):
+    """Test suite for the suppressor stage inside AudioEngine."""
+
+    def test_segments_stay_on_the_vad_clock(self):
+        """Test the held frame doesn't shift segment positions or lose speech."""
+        config = V3Config()
+        config.audio.use_mock_stt = True
+        config.audio.capture_sample_rate = SAMPLE_RATE
+        config.audio.audio_conditioning = False
+        config.audio.noise_suppression = True
+        config.audio.stt_segmentation_mode = "vad"
+        engine = AudioEngine(config)
+        engine.set_clarity_enabled(False)
+        asyncio.run(engine.initialize())
+        segments = []
+        engine.on_segment_transcribed = lambda segment, text: segments.append(segment)
+
+        rng = np.random.default_rng(1)
+        audio = rng.standard_normal(4 * SAMPLE_RATE) * 0.002
+        audio[SAMPLE_RATE:2 * SAMPLE_RATE] += 0.3 * np.sin(2 * np.pi * 220 * np.arange(SAMPLE_RATE) / SAMPLE_RATE)
+        for i in range(0, len(audio), 8000):
+            engine.process_audio_chunk(audio[i:i + 8000].astype(np.float32))
+        engine.flush_segments()
+
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(segments[0].start_time, 1.0 - config.audio.stt_trim_padding, delta=0.03)
+        self.assertGreater(engine.get_noise_suppressor_metrics()['noise_frames'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the offline file transcription CLI.
+"""
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+from scipy.io import wavfile
+
+from personalparakeet.offline_transcribe import main, open_audio_blocks
+
+
+def _write_wav(path: Path, sample_rate: int = 44100):
+    """1 s tone, 1 s silence, 1.5 s tone as 16-bit PCM."""
+    t = np.arange(int(1.5 * sample_rate)) / sample_rate
+    tone = 0.5 * np.sin(2 * np.pi * 220 * t)
+    audio = np.concatenate([tone[:sample_rate], np.zeros(sample_rate), tone])
+    wavfile.write(str(path), sample_rate, (audio * 32767).astype(np.int16))
+
+
+class TestOfflineTranscribe(unittest.TestCase):
+    """Test suite for the offline transcription entry point."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.wav_path = Path(self.tmpdir.name) / "sample.wav"
+        _write_wav(self.wav_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_audio_is_read_in_blocks(self):
+        """Test chunked reading returns mono float32 blocks covering the file."""
+        sample_rate, blocks = open_audio_blocks(self.wav_path, block_duration=0.5)
+        blocks = list(blocks)
+        self.assertEqual(sample_rate, 44100)
+        self.assertEqual(blocks[0].dtype, np.float32)
+        self.assertEqual(len(blocks[0]), 22050)
+        self.assertEqual(sum(len(b) for b in blocks), int(3.5 * 44100))
+        self.assertLessEqual(float(np.max(np.abs(blocks[0]))), 1.0)
+
+    def test_jsonl_output_has_segment_timestamps(self):
+        """Test that each speech region becomes one timestamped JSON line."""
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exit_code = main([str(self.wav_path), "--mock", "--format", "jsonl", "--quiet"])
+        self.assertEqual(exit_code, 0)
+
+        segments = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(len(segments), 2)
+        self.assertLess(segments[0]["end"], segments[1]["start"])
+        self.assertAlmostEqual(segments[1]["end"], 3.5, delta=0.3)
+        self.assertTrue(all(s["text"] for s in segments))
+
+    def test_missing_file_is_reported(self):
+        """Test that a missing input file returns a non-zero exit code."""
+        self.assertEqual(main([str(Path(self.tmpdir.name) / "nope.wav"), "--mock"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
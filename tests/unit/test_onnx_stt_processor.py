@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the ONNX Runtime STT processor, on a tiny stand-in model.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.stt_factory import STTFactory
+
+try:
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    import onnxruntime  # noqa: F401
+    HAVE_ONNX = True
+except ImportError:
+    HAVE_ONNX = False
+
+if HAVE_ONNX:
+    from personalparakeet.core.onnx_stt_processor import OnnxSTTProcessor, mel_filterbank
+
+SAMPLE_RATE = 16000
+N_MELS = 16
+CHUNK_FRAMES = 8
+TIME_CONTEXT = 3     # Frames of the causal smoothing conv (cache_last_time keeps 2)
+CHANNEL_CONTEXT = 6  # Frames of left context averaged into each frame (cache_last_channel)
+
+
+def _export_stand_in(path: Path):
+    """
+    CTC graph with the NeMo export signature: low-mel energy reads as "▁hello",
+    high-mel energy as "▁world", anything else as blank.
+    """
+    half = N_MELS // 2
+    weights = np.zeros((N_MELS, 3), dtype=np.float32)
+    weights[:half, 0] = weights[half:, 1] = 1 / half
+    weights[half:, 0] = weights[:half, 1] = -1 / half
+    bias = np.array([0, 0, 4], dtype=np.float32)
+    nodes = [
+        helper.make_node("Transpose", ["audio_signal"], ["frames"], perm=[0, 2, 1]),
+        helper.make_node("MatMul", ["frames", "W"], ["projected"]),
+        helper.make_node("Add", ["projected", "b"], ["logits"]),
+        helper.make_node("LogSoftmax", ["logits"], ["logprobs"], axis=-1),
+        helper.make_node("Identity", ["length"], ["encoded_lengths"]),
+    ]
+    graph = helper.make_graph(
+        nodes, "stand_in_ctc",
+        [helper.make_tensor_value_info("audio_signal", TensorProto.FLOAT, ["B", N_MELS, "T"]),
+         helper.make_tensor_value_info("length", TensorProto.INT64, ["B"])],
+        [helper.make_tensor_value_info("logprobs", TensorProto.FLOAT, ["B", "T", 3]),
+         helper.make_tensor_value_info("encoded_lengths", TensorProto.INT64, ["B"])],
+        [numpy_helper.from_array(weights, "W"), numpy_helper.from_array(bias, "b")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    path.with_suffix(".json").write_text(json.dumps({
+        "vocabulary": ["▁hello", "▁world"],
+        "blank_id": 2,
+        "features": {"n_mels": N_MELS, "normalize": "NA"},
+    }), encoding="utf-8")
+
+
+def _export_streaming_stand_in(path: Path):
+    """
+    Cache-aware variant of the stand-in, with NeMo's streaming export signature
+
+    A causal smoothing conv over the features and an average over the last
+    CHANNEL_CONTEXT frames stand in for the convolution and attention layers;
+    their left context only comes in through the cache inputs, and the graph
+    returns the next caches after the log-probabilities and lengths.
+    """
+    half = N_MELS // 2
+    weights = np.zeros((N_MELS, 3), dtype=np.float32)
+    weights[:half, 0] = weights[half:, 1] = 1 / half
+    weights[half:, 0] = weights[:half, 1] = -1 / half
+    initializers = [
+        numpy_helper.from_array(weights, "W"),
+        numpy_helper.from_array(np.array([0, 0, 4], dtype=np.float32), "b"),
+        numpy_helper.from_array(np.full((N_MELS, 1, TIME_CONTEXT), 1 / TIME_CONTEXT, np.float32), "time_kernel"),
+        numpy_helper.from_array(np.full((N_MELS, 1, CHANNEL_CONTEXT + 1), 1 / (CHANNEL_CONTEXT + 1), np.float32),
+                                "channel_kernel"),
+        numpy_helper.from_array(np.array([1 - TIME_CONTEXT], np.int64), "time_start"),
+        numpy_helper.from_array(np.array([-CHANNEL_CONTEXT], np.int64), "channel_start"),
+        numpy_helper.from_array(np.array([1 << 30], np.int64), "end"),
+        numpy_helper.from_array(np.array([2], np.int64), "time_axis"),
+        numpy_helper.from_array(np.array([CHANNEL_CONTEXT], np.int64), "channel_max"),
+    ]
+    nodes = [
+        helper.make_node("Concat", ["cache_last_time", "audio_signal"], ["timed"], axis=2),
+        helper.make_node("Conv", ["timed", "time_kernel"], ["hidden"], group=N_MELS),
+        helper.make_node("Slice", ["timed", "time_start", "end", "time_axis"], ["cache_last_time_next"]),
+        helper.make_node("Concat", ["cache_last_channel", "hidden"], ["attended"], axis=2),
+        helper.make_node("Conv", ["attended", "channel_kernel"], ["context"], group=N_MELS),
+        helper.make_node("Slice", ["attended", "channel_start", "end", "time_axis"], ["cache_last_channel_next"]),
+        helper.make_node("Add", ["hidden", "context"], ["encoded"]),
+        helper.make_node("Transpose", ["encoded"], ["frames"], perm=[0, 2, 1]),
+        helper.make_node("MatMul", ["frames", "W"], ["projected"]),
+        helper.make_node("Add", ["projected", "b"], ["logits"]),
+        helper.make_node("LogSoftmax", ["logits"], ["logprobs"], axis=-1),
+        helper.make_node("Identity", ["length"], ["encoded_lengths"]),
+        helper.make_node("Add", ["cache_last_channel_len", "length"], ["seen"]),
+        helper.make_node("Min", ["seen", "channel_max"], ["cache_last_channel_next_len"]),
+    ]
+    graph = helper.make_graph(
+        nodes, "stand_in_cache_aware_ctc",
+        [helper.make_tensor_value_info("audio_signal", TensorProto.FLOAT, ["B", N_MELS, "T"]),
+         helper.make_tensor_value_info("length", TensorProto.INT64, ["B"]),
+         helper.make_tensor_value_info("cache_last_channel", TensorProto.FLOAT, ["B", N_MELS, CHANNEL_CONTEXT]),
+         helper.make_tensor_value_info("cache_last_time", TensorProto.FLOAT, ["B", N_MELS, TIME_CONTEXT - 1]),
+         helper.make_tensor_value_info("cache_last_channel_len", TensorProto.INT64, ["B"])],
+        [helper.make_tensor_value_info("logprobs", TensorProto.FLOAT, ["B", "T", 3]),
+         helper.make_tensor_value_info("encoded_lengths", TensorProto.INT64, ["B"]),
+         helper.make_tensor_value_info("cache_last_channel_next", TensorProto.FLOAT,
+                                       ["B", N_MELS, CHANNEL_CONTEXT]),
+         helper.make_tensor_value_info("cache_last_time_next", TensorProto.FLOAT, ["B", N_MELS, TIME_CONTEXT - 1]),
+         helper.make_tensor_value_info("cache_last_channel_next_len", TensorProto.INT64, ["B"])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    path.with_suffix(".json").write_text(json.dumps({
+        "vocabulary": ["▁hello", "▁world"],
+        "blank_id": 2,
+        "features": {"n_mels": N_MELS, "normalize": "NA"},
+        "streaming": {"chunk_frames": CHUNK_FRAMES, "pre_encode_cache_frames": 0},
+    }), encoding="utf-8")
+
+
+def _tone(seconds, frequency, level=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (level * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+@unittest.skipUnless(HAVE_ONNX, "onnx and onnxruntime are needed for the stand-in model")
+class TestOnnxSTTProcessor(unittest.TestCase):
+    """Test suite for the CPU runtime's transcribe() contract."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        model_path = Path(cls.tmpdir.name) / "stand_in.onnx"
+        _export_stand_in(model_path)
+
+        cls.config = V3Config()
+        cls.config.audio.stt_runtime = "onnx"
+        cls.config.audio.stt_onnx_model_path = str(model_path)
+        cls.config.audio.stt_cpu_threads = 2
+        cls.processor = STTFactory.create_stt_processor(cls.config)
+        asyncio.run(cls.processor.initialize())
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run(cls.processor.cleanup())
+        cls.tmpdir.cleanup()
+
+    def test_factory_selects_onnx_runtime(self):
+        """Test stt_runtime='onnx' builds the ONNX processor with the configured threads."""
+        self.assertIsInstance(self.processor, OnnxSTTProcessor)
+        self.assertEqual(self.processor.model.get_session_options().intra_op_num_threads, 2)
+        self.assertTrue(self.processor.warmup_timings)
+
+    def test_missing_model_path_is_reported(self):
+        """Test stt_runtime='onnx' without stt_onnx_model_path fails with a clear error."""
+        config = V3Config()
+        config.audio.stt_runtime = "onnx"
+        config.audio.stt_onnx_model_path = None
+        with self.assertRaisesRegex(ValueError, "stt_onnx_model_path"):
+            asyncio.run(STTFactory.create_stt_processor(config).initialize())
+
+    def test_transcribe_decodes_ctc_output(self):
+        """Test greedy CTC decoding collapses repeats and maps word pieces to words."""
+        audio = np.concatenate([_tone(0.5, 300), np.zeros(3200, dtype=np.float32), _tone(0.5, 5000)])
+        self.assertEqual(self.processor.transcribe(audio), "hello world")
+        self.assertIsNone(self.processor.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32)))
+
+    def test_batch_returns_results_in_input_order(self):
+        """Test padded batches decode each segment to its own length."""
+        texts = self.processor.transcribe_batch([_tone(1.0, 5000), np.zeros(800, dtype=np.float32),
+                                                 _tone(0.3, 300)])
+        self.assertEqual(texts, ["world", None, "hello"])
+
+    def test_mel_filterbank_is_slaney_normalized(self):
+        """Test each triangle has unit area on the Hz axis, like librosa's default."""
+        bank = mel_filterbank(SAMPLE_RATE, 4096, 40)
+        bin_hz = SAMPLE_RATE / 4096
+        np.testing.assert_allclose(bank[1:-1].sum(axis=1) * bin_hz, 1.0, rtol=0.05)
+
+
+@unittest.skipUnless(HAVE_ONNX, "onnx and onnxruntime are needed for the stand-in model")
+class TestOnnxInt8Quantization(unittest.TestCase):
+    """Test suite for stt_cpu_quantization on the ONNX runtime."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.model_path = self.root / "stand_in.onnx"
+        _export_stand_in(self.model_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _processor(self):
+        config = V3Config()
+        config.audio.stt_runtime = "onnx"
+        config.audio.stt_onnx_model_path = str(self.model_path)
+        config.audio.stt_cpu_quantization = "int8"
+        config.audio.model_cache_dir = str(self.root / "cache")
+        config.audio.stt_warmup = False
+        processor = STTFactory.create_stt_processor(config)
+        asyncio.run(processor.initialize())
+        return processor
+
+    def test_int8_model_is_converted_once_and_cached(self):
+        """Test the first start converts and caches, later starts reuse the cached graph."""
+        processor = self._processor()
+        self.assertEqual(processor.quantization, "int8")
+        cached = list((self.root / "cache" / "quantized").glob("*/model.onnx"))
+        self.assertEqual(len(cached), 1)
+        ops = {node.op_type for node in onnx.load(str(cached[0])).graph.node}
+        self.assertIn("MatMulInteger", ops)
+
+        modified = cached[0].stat().st_mtime_ns
+        audio = np.concatenate([_tone(0.5, 300), np.zeros(3200, dtype=np.float32), _tone(0.5, 5000)])
+        self.assertEqual(self._processor().transcribe(audio), "hello world")
+        self.assertEqual(cached[0].stat().st_mtime_ns, modified)
+
+    def test_new_export_gets_a_new_cache_entry(self):
+        """Test replacing the fp32 model invalidates its int8 copy."""
+        self._processor()
+        _export_stand_in(self.model_path)
+        os.utime(self.model_path, ns=(0, 0))
+        self._processor()
+        self.assertEqual(len(list((self.root / "cache" / "quantized").iterdir())), 2)
+
+
+@unittest.skipUnless(HAVE_ONNX, "onnx and onnxruntime are needed for the stand-in model")
+class TestOnnxCacheAwareStreaming(unittest.TestCase):
+    """Test suite for incremental decoding on a cache-aware export."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        model_path = Path(cls.tmpdir.name) / "streaming_stand_in.onnx"
+        _export_streaming_stand_in(model_path)
+
+        cls.config = V3Config()
+        cls.config.audio.stt_runtime = "onnx"
+        cls.config.audio.stt_onnx_model_path = str(model_path)
+        cls.processor = STTFactory.create_stt_processor(cls.config)
+        asyncio.run(cls.processor.initialize())
+        cls.audio = np.concatenate([_tone(0.5, 300), np.zeros(3200, dtype=np.float32), _tone(0.5, 5000)])
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run(cls.processor.cleanup())
+        cls.tmpdir.cleanup()
+
+    def _stream(self, audio, hop=1600):
+        stream = self.processor.create_stream()
+        hypotheses = [self.processor.transcribe_stream(stream, audio[start:start + hop])
+                      for start in range(0, len(audio), hop)]
+        hypotheses.append(self.processor.transcribe_stream(stream, audio[:0], is_final=True))
+        return stream, hypotheses
+
+    def test_hypothesis_grows_into_the_offline_transcript(self):
+        """Test partial hypotheses only extend and the final one matches whole-segment decoding."""
+        self.assertTrue(self.processor.supports_streaming)
+        stream, hypotheses = self._stream(self.audio)
+        self.assertIn("hello", hypotheses)
+        self.assertEqual(hypotheses[-1], "hello world")
+        self.assertEqual(self.processor.transcribe(self.audio), "hello world")
+        seen = [h for h in hypotheses if h]
+        for earlier, later in zip(seen, seen[1:]):
+            self.assertTrue(later.startswith(earlier))
+        self.assertTrue(stream.is_finished)
+        self.assertIsNone(self.processor.transcribe_stream(stream, self.audio))
+
+    def test_caches_carry_the_left_context(self):
+        """Test encoding in small chunks ends in the same state as encoding everything at once."""
+        chunked, _ = self._stream(self.audio, hop=777)
+        whole = self.processor.create_stream()
+        whole.chunk_frames = (10 ** 6, 10 ** 6)
+        self.processor.transcribe_stream(whole, self.audio, is_final=True)
+
+        self.assertEqual(whole.steps, 1)
+        self.assertGreater(chunked.steps, 10)
+        self.assertEqual(chunked.text, whole.text)
+        for name, value in whole.caches.items():
+            np.testing.assert_allclose(chunked.caches[name], value, rtol=1e-4, atol=1e-4, err_msg=name)
+
+    def test_each_step_encodes_a_fixed_chunk(self):
+        """Test per-step work stays constant and no feature frame is encoded twice."""
+        audio = np.tile(self.audio, 3)
+        stream, _ = self._stream(audio)
+        frames = self.processor.featurizer.num_frames(len(audio))
+        self.assertEqual(stream.frames_encoded, frames)
+        self.assertEqual(stream.steps, -(-frames // CHUNK_FRAMES))
+        self.assertEqual(set(list(stream.step_frames)[:-1]), {CHUNK_FRAMES})
+
+
+@unittest.skipUnless(HAVE_ONNX, "onnx and onnxruntime are needed for the stand-in model")
+class TestIncrementalStreamingEngine(unittest.TestCase):
+    """Test suite for streaming segmentation on a cache-aware model."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        model_path = Path(self.tmpdir.name) / "streaming_stand_in.onnx"
+        _export_streaming_stand_in(model_path)
+
+        config = V3Config()
+        config.audio.stt_runtime = "onnx"
+        config.audio.stt_onnx_model_path = str(model_path)
+        config.audio.stt_warmup = False
+        config.audio.capture_sample_rate = SAMPLE_RATE
+        config.audio.audio_conditioning = False
+        config.audio.stt_segmentation_mode = "streaming"
+        self.config = config
+
+    def _dictate(self):
+        engine = AudioEngine(self.config)
+        engine.set_clarity_enabled(False)
+        partials, committed = [], []
+        engine.on_partial_transcription = partials.append
+        engine.on_segment_transcribed = lambda segment, text: committed.append(text)
+        asyncio.run(engine.initialize())
+
+        audio = np.concatenate([_tone(2.0, 300), np.zeros(SAMPLE_RATE, dtype=np.float32)])
+        for start in range(0, len(audio), 1600):
+            engine.process_audio_chunk(audio[start:start + 1600])
+        return engine, partials, committed
+
+    def test_partials_only_encode_new_audio(self):
+        """Test each utterance is encoded once, not re-decoded from its onset on every partial."""
+        engine, partials, committed = self._dictate()
+        metrics = engine.get_streaming_metrics()
+        self.assertTrue(metrics['incremental'])
+        self.assertEqual(metrics['streams_opened'], 1)
+        self.assertEqual(metrics['open_streams'], 0)
+        self.assertLess(metrics['seconds_encoded'], 3.0)
+        self.assertLess(metrics['encoded_ratio'], 0.5)
+        self.assertTrue(any(not p.is_final and p.text == "hello" for p in partials))
+        self.assertEqual(" ".join(committed), "hello")
+
+    def test_disabled_falls_back_to_re_decoding(self):
+        """Test stt_incremental_streaming=False decodes each partial whole, with the same result."""
+        self.config.audio.stt_incremental_streaming = False
+        engine, _, committed = self._dictate()
+        self.assertFalse(engine.get_streaming_metrics()['incremental'])
+        self.assertEqual(engine.get_streaming_metrics()['streams_opened'], 0)
+        self.assertEqual(" ".join(committed), "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
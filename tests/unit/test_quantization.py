@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Unit tests for int8 quantization of the PyTorch STT encoder.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import torch
+    HAVE_TORCH = True
+except ImportError:
+    HAVE_TORCH = False
+
+from personalparakeet.core.quantization import quantize_torch_encoder
+
+SOURCE = "stand-in/tiny-encoder"
+
+
+def _tiny_model():
+    """fp32 model with an `.encoder`, like the NeMo ones (same weights on every call)"""
+    torch.manual_seed(0)
+    model = torch.nn.Module()
+    model.encoder = torch.nn.Sequential(
+        torch.nn.Linear(16, 32), torch.nn.ReLU(),
+        torch.nn.Sequential(torch.nn.Linear(32, 32), torch.nn.ReLU()),
+        torch.nn.Linear(32, 8, bias=False),
+    )
+    return model
+
+
+@unittest.skipUnless(HAVE_TORCH, "torch is needed for the PyTorch encoder")
+class TestQuantizeTorchEncoder(unittest.TestCase):
+    """Test suite for quantize_torch_encoder and its conversion cache."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name) / "quantized"
+        self.inputs = torch.randn(4, 16, generator=torch.Generator().manual_seed(1))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _quantize(self):
+        """(model, came from cache, number of quantize_dynamic calls)"""
+        model = _tiny_model()
+        with patch("torch.ao.quantization.quantize_dynamic",
+                   wraps=torch.ao.quantization.quantize_dynamic) as converter:
+            cached = quantize_torch_encoder(model, SOURCE, self.cache_dir)
+        return model, cached, converter.call_count
+
+    def test_cache_hit_skips_the_conversion(self):
+        """Test the second start loads cached weights without calling quantize_dynamic."""
+        converted, cached, calls = self._quantize()
+        self.assertFalse(cached)
+        self.assertEqual(calls, 1)
+
+        loaded, cached, calls = self._quantize()
+        self.assertTrue(cached)
+        self.assertEqual(calls, 0)
+        with torch.no_grad():
+            torch.testing.assert_close(loaded.encoder(self.inputs), converted.encoder(self.inputs))
+
+    def test_every_linear_is_int8_after_a_cache_hit(self):
+        """Test the cached encoder has the same quantized layers as a converted one."""
+        self._quantize()
+        loaded, _, _ = self._quantize()
+        linears = [m for m in loaded.encoder.modules() if isinstance(m, torch.nn.Linear)]
+        quantized = [m for m in loaded.encoder.modules()
+                     if isinstance(m, torch.ao.nn.quantized.dynamic.Linear)]
+        self.assertEqual(linears, [])
+        self.assertEqual(len(quantized), 3)
+
+    def test_unreadable_cache_falls_back_to_conversion(self):
+        """Test a corrupt entry is replaced by a fresh conversion of the fp32 weights."""
+        converted, _, _ = self._quantize()
+        for entry in self.cache_dir.glob("*.pt"):
+            entry.write_bytes(b"not a state dict")
+
+        recovered, cached, calls = self._quantize()
+        self.assertFalse(cached)
+        self.assertEqual(calls, 1)
+        with torch.no_grad():
+            torch.testing.assert_close(recovered.encoder(self.inputs), converted.encoder(self.inputs))
+
+        _, cached, calls = self._quantize()
+        self.assertTrue(cached)
+        self.assertEqual(calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the startup backlog and staged (background) model loading.
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.mock_stt_processor import MockSTTProcessor
+from personalparakeet.core.segment_backlog import SegmentBacklog
+from personalparakeet.core.stt_segmentation import AudioSegment
+
+SAMPLE_RATE = 16000
+
+
+def _segment(segment_id, seconds, is_partial=False):
+    audio = np.ones(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    return AudioSegment(segment_id, segment_id * SAMPLE_RATE, audio, SAMPLE_RATE, is_partial=is_partial)
+
+
+class TestSegmentBacklog(unittest.TestCase):
+    """Test suite for the bounded segment ring."""
+
+    def test_keeps_order_and_copies_audio(self):
+        """Test segments leave in arrival order and no longer alias the segmenter ring."""
+        backlog = SegmentBacklog(max_duration=10.0)
+        ring = np.ones(SAMPLE_RATE, dtype=np.float32)
+        backlog.push(AudioSegment(0, 0, ring[:8000], SAMPLE_RATE))
+        backlog.push(_segment(1, 1.0))
+        ring[:] = 0
+
+        first, second = backlog.pop(), backlog.pop()
+        self.assertEqual((first.segment_id, second.segment_id), (0, 1))
+        self.assertEqual(float(first.audio.sum()), 8000.0)
+        self.assertIsNone(backlog.pop())
+        self.assertEqual(backlog.duration, 0.0)
+
+    def test_drops_oldest_speech_over_budget(self):
+        """Test the ring holds at most max_duration seconds and counts what it drops."""
+        backlog = SegmentBacklog(max_duration=3.0)
+        for segment_id in range(5):
+            backlog.push(_segment(segment_id, 1.0))
+
+        self.assertEqual(len(backlog), 3)
+        self.assertEqual(backlog.pop().segment_id, 2)
+        metrics = backlog.get_metrics()
+        self.assertEqual(metrics['segments_dropped'], 2)
+        self.assertAlmostEqual(metrics['seconds_dropped'], 2.0)
+        self.assertAlmostEqual(metrics['peak_seconds'], 3.0)
+
+    def test_newer_segment_replaces_waiting_partial(self):
+        """Test a streaming partial is dropped once a later segment of the audio arrives."""
+        backlog = SegmentBacklog()
+        backlog.push(_segment(0, 0.5, is_partial=True))
+        backlog.push(_segment(1, 1.0, is_partial=True))
+        backlog.push(_segment(2, 1.5))
+
+        self.assertEqual(len(backlog), 1)
+        self.assertAlmostEqual(backlog.duration, 1.5)
+        self.assertEqual(backlog.get_metrics()['stale_partials_dropped'], 2)
+
+
+class TestStagedStartup(unittest.TestCase):
+    """Test suite for capturing while the STT model loads in the background."""
+
+    def setUp(self):
+        self.model_released = threading.Event()
+        released = self.model_released
+
+        class SlowLoadingProcessor(MockSTTProcessor):
+            async def initialize(self):
+                await asyncio.to_thread(released.wait, 5.0)
+                await super().initialize()
+
+        self.config = V3Config()
+        self.config.audio.use_mock_stt = True
+        self.config.audio.capture_sample_rate = SAMPLE_RATE
+        self.config.audio.audio_conditioning = False
+        self.config.audio.stt_segmentation_mode = "vad"
+        self.engine = AudioEngine(self.config)
+        self.engine.set_clarity_enabled(False)
+        self.segments = []
+        self.engine.on_segment_transcribed = lambda segment, text: self.segments.append((segment.segment_id, text))
+
+        patcher = patch("personalparakeet.audio_engine.STTFactory.create_stt_processor",
+                        side_effect=SlowLoadingProcessor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.model_released.set)
+
+    def _speak(self, seconds_of_speech):
+        """One utterance followed by enough silence to end it"""
+        t = np.arange(int(seconds_of_speech * SAMPLE_RATE)) / SAMPLE_RATE
+        audio = np.concatenate([0.3 * np.sin(2 * np.pi * 220 * t), np.zeros(SAMPLE_RATE)]).astype(np.float32)
+        for i in range(0, len(audio), 8000):
+            self.engine.process_audio_chunk(audio[i:i + 8000])
+
+    def test_speech_during_model_load_is_transcribed_once_ready(self):
+        """Test first words are held while loading and come out, in order, when the model is up."""
+        async def run():
+            await self.engine.initialize(background_stt=True)
+            self.assertTrue(self.engine.stt_loading)
+            self._speak(1.0)
+            self._speak(1.0)
+            held = self.engine.get_startup_metrics()
+
+            self.model_released.set()
+            self.assertTrue(await self.engine.wait_for_stt(timeout=5.0))
+            self._speak(1.0)
+            return held
+
+        held = asyncio.run(run())
+        self.assertFalse(held['stt_ready'])
+        self.assertEqual(held['segments_waiting'], 2)
+        self.assertEqual([segment_id for segment_id, _ in self.segments], [0, 1, 2])
+        self.assertTrue(all(text for _, text in self.segments))
+
+        metrics = self.engine.get_startup_metrics()
+        self.assertTrue(metrics['stt_ready'])
+        self.assertEqual(metrics['segments_waiting'], 0)
+        self.assertIn('stt_model', metrics['phases'])
+        self.assertGreaterEqual(metrics['phases']['stt_ready_after'], metrics['phases']['stt_model'])
+
+    def test_load_failure_is_reported(self):
+        """Test a model that fails to load surfaces through on_error instead of hanging."""
+        errors = []
+        self.engine.on_error = errors.append
+        self.model_released.set()
+
+        async def run():
+            with patch.object(MockSTTProcessor, "initialize", side_effect=RuntimeError("no GPU")):
+                await self.engine.initialize(background_stt=True)
+                return await self.engine.wait_for_stt(timeout=5.0)
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertFalse(self.engine.stt_loading)
+        self.assertIn("no GPU", errors[0])
+        self.assertEqual(self.engine.get_startup_metrics()['stt_load_error'], "no GPU")
+
+
+if __name__ == '__main__':
+    unittest.main()
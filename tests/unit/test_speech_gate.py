@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pre-STT speech gate.
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.audio_features import AudioFeatures, FrameHistory
+from personalparakeet.core.speech_gate import SpeechGate
+from personalparakeet.core.stt_segmentation import AudioSegment
+
+
+class TestSpeechGate(unittest.TestCase):
+    """Test suite for trimming and skipping with per-frame VAD flags."""
+
+    def setUp(self):
+        """100 Hz stream with 10-sample frames and a 5-sample pad."""
+        self.history = FrameHistory(sample_rate=100, frame_size=10)
+        self.gate = SpeechGate(self.history, pad_duration=0.05, min_speech_ratio=0.2)
+
+    def _record(self, flags):
+        frames = np.where(np.asarray(flags)[:, None], 0.5, 0.0) * np.ones((len(flags), 10), dtype=np.float32)
+        self.history.record(flags, AudioFeatures.from_frames(frames))
+
+    def _segment(self, start, num_samples):
+        audio = np.arange(start, start + num_samples, dtype=np.float32)
+        return AudioSegment(0, start, audio, 100)
+
+    def test_trims_silent_edges_keeping_pad(self):
+        """Test leading and trailing non-speech frames are cut down to the pad."""
+        self._record([False, False, False, True, True, False, False, False, False, False])
+        segment = self.gate.apply(self._segment(0, 100))
+
+        self.assertEqual(segment.start_sample, 25)
+        self.assertEqual(segment.end_sample, 55)
+        np.testing.assert_array_equal(segment.audio, np.arange(25, 55, dtype=np.float32))
+        self.assertAlmostEqual(segment.speech_ratio, 0.2)
+        self.assertTrue(self.gate.passes(segment))
+        self.assertAlmostEqual(self.gate.get_metrics()['seconds_trimmed'], 0.7)
+
+    def test_skips_segments_below_speech_ratio(self):
+        """Test a lone click frame does not get a window transcribed."""
+        self._record([False] * 9 + [True] + [False] * 10)
+        quiet = self.gate.apply(self._segment(0, 100))
+        empty = self.gate.apply(self._segment(100, 100))
+
+        self.assertFalse(self.gate.passes(quiet))
+        self.assertFalse(self.gate.passes(empty))
+        self.assertEqual(quiet.num_samples, 100)  # Skipped segments are not trimmed
+        metrics = self.gate.get_metrics()
+        self.assertEqual(metrics['segments_skipped'], 2)
+        self.assertAlmostEqual(metrics['seconds_saved'], 2.0)
+        self.assertAlmostEqual(metrics['saved_fraction'], 1.0)
+
+    def test_uncovered_segments_pass_untouched(self):
+        """Test audio without recorded flags is never gated."""
+        self._record([False] * 5)
+        segment = self.gate.apply(self._segment(0, 100))
+        self.assertIsNone(segment.speech_ratio)
+        self.assertTrue(self.gate.passes(segment))
+        self.assertEqual(segment.num_samples, 100)
+
+    def test_no_trim_keeps_window_positions(self):
+        """Test overlapping windows are only annotated."""
+        self._record([False, False, True, True, False])
+        segment = self.gate.apply(self._segment(0, 50), trim=False)
+        self.assertEqual((segment.start_sample, segment.num_samples), (0, 50))
+        self.assertAlmostEqual(segment.speech_ratio, 0.4)
+
+
+class TestEngineSpeechGate(unittest.TestCase):
+    """Test suite for the gate inside AudioEngine."""
+
+    def setUp(self):
+        self.config = V3Config()
+        self.config.audio.use_mock_stt = True
+        self.config.audio.capture_sample_rate = 16000
+        self.config.vad.frame_duration = 0.02  # 0.5 s chunks hold whole VAD frames
+        self.config.audio.audio_conditioning = False  # Keep the tone edges exact
+        self.engine = AudioEngine(self.config)
+        self.engine.set_clarity_enabled(False)
+        asyncio.run(self.engine.initialize())
+        self.segments = []
+        self.engine.on_segment_transcribed = lambda segment, text: self.segments.append(segment)
+
+    def _feed(self, audio):
+        for i in range(0, len(audio), 8000):
+            self.engine.process_audio_chunk(audio[i:i + 8000])
+        self.engine.flush_segments()
+
+    def test_fixed_window_is_trimmed_to_the_speech(self):
+        """Test a 4 s window holding 1 s of speech costs about 1 s of STT audio."""
+        t = np.arange(16000) / 16000
+        audio = np.zeros(64000, dtype=np.float32)
+        audio[24000:40000] = 0.5 * np.sin(2 * np.pi * 220 * t)
+        self._feed(audio)
+
+        self.assertEqual(len(self.segments), 1)
+        segment = self.segments[0]
+        self.assertAlmostEqual(segment.start_time, 1.5 - self.config.audio.stt_trim_padding, places=2)
+        self.assertAlmostEqual(segment.duration, 1.0 + 2 * self.config.audio.stt_trim_padding, places=2)
+        self.assertAlmostEqual(self.engine.get_speech_gate_metrics()['seconds_trimmed'], 2.7, places=2)
+
+    def test_silent_window_skips_the_model(self):
+        """Test a window of near silence with one click never reaches STT."""
+        audio = np.zeros(64000, dtype=np.float32)
+        audio[30000:30040] = 0.9  # Click: passes a peak check, fills one VAD frame
+        self._feed(audio)
+
+        self.assertEqual(self.engine.total_stt_calls, 0)
+        metrics = self.engine.get_speech_gate_metrics()
+        self.assertEqual(metrics['segments_skipped'], 1)
+        self.assertAlmostEqual(metrics['seconds_skipped'], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the process-isolated STT backend.
+"""
+
+import asyncio
+import os
+import signal
+import unittest
+
+import numpy as np
+
+from personalparakeet.config import V3Config
+from personalparakeet.core.stt_factory import STTFactory
+from personalparakeet.core.stt_process_backend import ProcessSTTProcessor, SharedAudioSlots
+
+
+class TestSharedAudioSlots(unittest.TestCase):
+    """Test suite for the shared memory slot pool."""
+
+    def test_attached_view_sees_owner_writes(self):
+        """Test a second handle on the block sees the same samples."""
+        owner = SharedAudioSlots(2, 1000)
+        reader = SharedAudioSlots(2, 1000, name=owner.name)
+        try:
+            slot = owner.acquire()
+            owner.slots[slot, :3] = [0.1, 0.2, 0.3]
+            np.testing.assert_allclose(reader.slots[slot, :3], [0.1, 0.2, 0.3], rtol=1e-6)
+            owner.release(slot)
+            self.assertEqual(sorted(owner._free), [0, 1])
+        finally:
+            reader.close()
+            owner.close()
+
+
+class TestProcessSTTProcessor(unittest.TestCase):
+    """Test suite for the supervised child process (mock model)."""
+
+    @classmethod
+    def setUpClass(cls):
+        config = V3Config()
+        config.audio.use_mock_stt = True
+        config.audio.stt_backend = "process"
+        config.audio.stt_process_slot_duration = 2.0
+        config.audio.stt_process_timeout = 10.0
+        cls.processor = STTFactory.create_stt_processor(config)
+        asyncio.run(cls.processor.initialize())
+
+    @classmethod
+    def tearDownClass(cls):
+        asyncio.run(cls.processor.cleanup())
+
+    def setUp(self):
+        self.audio = (0.5 * np.sin(np.arange(16000) / 10)).astype(np.float32)
+
+    def test_factory_returns_process_backend(self):
+        """Test stt_backend='process' selects the proxy."""
+        self.assertIsInstance(self.processor, ProcessSTTProcessor)
+        self.assertNotEqual(self.processor.process.pid, os.getpid())
+        self.assertEqual(self.processor.warmup_timings, [])  # Mock model has nothing to warm up
+
+    def test_transcribe_matches_in_process_contract(self):
+        """Test text for speech and None for silence, like the in-process processor."""
+        self.assertEqual(self.processor.transcribe(self.audio), "This is a test")
+        self.assertIsNone(self.processor.transcribe(np.zeros(16000, dtype=np.float32)))
+
+    def test_oversized_audio_is_split_across_slots(self):
+        """Test audio longer than a slot is still transcribed."""
+        count = self.processor.transcription_count
+        text = self.processor.transcribe(np.tile(self.audio, 3))  # 3 s into 2 s slots
+        self.assertTrue(text)
+        self.assertEqual(self.processor.transcription_count - count, 2)
+
+    def test_batch_is_one_request_in_input_order(self):
+        """Test a batch returns one result per segment, skipping silence and splitting oversized audio."""
+        chunks = [self.audio, np.zeros(16000, dtype=np.float32), self.audio[:4000], np.tile(self.audio, 3)]
+        texts = self.processor.transcribe_batch(chunks)
+        self.assertEqual(texts[:3], ["This is a test", None, "Speech recognition active"])
+        self.assertTrue(texts[3])
+        self.assertEqual(sorted(self.processor.slots._free), list(range(self.processor.num_slots)))
+
+    def test_child_is_restarted_after_crash(self):
+        """Test a killed child is replaced and the request still succeeds."""
+        restarts = self.processor.restart_count
+        os.kill(self.processor.process.pid, signal.SIGKILL)
+        self.assertEqual(self.processor.transcribe(self.audio), "This is a test")
+        self.assertEqual(self.processor.restart_count, restarts + 1)
+        self.assertEqual(self.processor.last_exit_code, -signal.SIGKILL)
+
+    def test_child_error_reply_restarts_child(self):
+        """Test a ("error", message) reply is retried on a new child instead of raising."""
+        restarts = self.processor.restart_count
+        self.processor._conn = _ErrorReplyConnection(self.processor._conn)
+        self.assertEqual(self.processor.transcribe(self.audio), "This is a test")
+        self.assertEqual(self.processor.restart_count, restarts + 1)
+
+
+class _ErrorReplyConnection:
+    """Pipe end whose replies are the child's fatal-error report"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def send(self, message):
+        self._conn.send(message)
+
+    def poll(self, timeout=None):
+        return True
+
+    def recv(self):
+        return ("error", "model crashed")
+
+    def close(self):
+        self._conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
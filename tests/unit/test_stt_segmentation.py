@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the STT segmentation module.
+"""
+
+import unittest
+
+import numpy as np
+
+from personalparakeet.config import AudioConfig
+from personalparakeet.core.stt_segmentation import (
+    FixedWindowSegmenter,
+    HypothesisMerger,
+    SlidingWindowSegmenter,
+    StablePrefixTracker,
+    StreamingSegmenter,
+    VADEndpointSegmenter,
+    create_segmenter,
+    segment_durations,
+)
+
+SAMPLE_RATE = 1000  # Small rate keeps the arrays readable
+
+
+def _fake_transcript(words, start, end):
+    """Words whose span overlaps the window; words cut by an edge come out garbled."""
+    out = []
+    for word, w_start, w_end in words:
+        if w_end <= start or w_start >= end:
+            continue
+        whole = w_start >= start and w_end <= end
+        out.append(word if whole else word[:2] + "-")
+    return " ".join(out)
+
+
+class TestFixedWindowSegmenter(unittest.TestCase):
+    """Test suite for the FixedWindowSegmenter class."""
+
+    def test_emits_back_to_back_windows(self):
+        """Test that segments are contiguous, non-overlapping windows."""
+        segmenter = FixedWindowSegmenter(SAMPLE_RATE, window_duration=1.0)
+        segments = []
+        for i in range(5):
+            segments += segmenter.push(np.full(500, i, dtype=np.float32))
+        self.assertEqual([s.start_sample for s in segments], [0, 1000])
+        self.assertEqual(len(segmenter), 500)
+
+    def test_flush_returns_remainder(self):
+        """Test that leftover audio above the minimum is flushed as a final segment."""
+        segmenter = FixedWindowSegmenter(SAMPLE_RATE, window_duration=1.0)
+        segmenter.push(np.ones(700, dtype=np.float32))
+        segment = segmenter.flush()
+        self.assertTrue(segment.is_final)
+        self.assertEqual(segment.num_samples, 700)
+        self.assertIsNone(segmenter.flush())
+
+    def test_forced_flush_emits_short_tail(self):
+        """Test a tail below the minimum is held back unless the flush is forced."""
+        segmenter = FixedWindowSegmenter(SAMPLE_RATE, window_duration=1.0)
+        segmenter.push(np.ones(300, dtype=np.float32))
+        self.assertIsNone(segmenter.flush())
+        self.assertEqual(segmenter.flush(force=True).num_samples, 300)
+        self.assertIsNone(segmenter.flush(force=True))
+
+
+class TestSlidingWindowSegmenter(unittest.TestCase):
+    """Test suite for the SlidingWindowSegmenter class."""
+
+    def setUp(self):
+        self.segmenter = SlidingWindowSegmenter(
+            SAMPLE_RATE, window_duration=2.0, hop_duration=0.5,
+            left_context=0.25, right_context=0.25,
+        )
+
+    def test_first_window_after_one_hop(self):
+        """Test that the first segment is scheduled after a single hop."""
+        self.assertEqual(self.segmenter.push(np.ones(400, dtype=np.float32)), [])
+        segments = self.segmenter.push(np.ones(100, dtype=np.float32))
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0].end_time, 0.5)
+
+    def test_windows_overlap_and_cap_at_window_length(self):
+        """Test hop spacing and the maximum window length."""
+        segments = self.segmenter.push(np.arange(3000, dtype=np.float32))
+        self.assertEqual([s.end_sample for s in segments], [500, 1000, 1500, 2000, 2500, 3000])
+        self.assertEqual(segments[-1].num_samples, 2000)
+        self.assertEqual(segments[-1].audio[0], 1000)
+        # Earlier segments must survive later writes into the ring
+        self.assertEqual(segments[0].audio[-1], 499)
+
+    def test_boundary_words_are_recovered_once(self):
+        """Test that merged overlapping windows reproduce every word exactly once."""
+        words = [(f"word{i}", 0.37 * i, 0.37 * i + 0.3) for i in range(20)]
+        committed = []
+        for _ in range(16):
+            for segment in self.segmenter.push(np.ones(500, dtype=np.float32)):
+                text = _fake_transcript(words, segment.start_time, segment.end_time)
+                committed += self.segmenter.merge_transcript(segment, text).split()
+
+        final = self.segmenter.flush()
+        text = _fake_transcript(words, final.start_time, final.end_time)
+        committed += self.segmenter.merge_transcript(final, text).split()
+
+        expected = [w for w, _, w_end in words if w_end <= 8.0]
+        self.assertEqual(committed, expected)
+
+
+class TestVADEndpointSegmenter(unittest.TestCase):
+    """Test suite for the VADEndpointSegmenter class."""
+
+    def setUp(self):
+        self.segmenter = VADEndpointSegmenter(
+            SAMPLE_RATE, min_segment_duration=0.3, max_segment_duration=3.0,
+            endpoint_silence=0.5, padding=0.2,
+        )
+
+    def _feed(self, pattern, chunk=100):
+        """Feed 0.1 s chunks; pattern is a string of 's' (speech) / '.' (silence)."""
+        segments = []
+        for i, flag in enumerate(pattern):
+            audio = np.full(chunk, i, dtype=np.float32)
+            segments += self.segmenter.push(audio, flag == "s")
+        return segments
+
+    def test_segment_spans_onset_to_pause(self):
+        """Test that a segment starts one pad before onset and ends one pad after speech."""
+        segments = self._feed("....ssssss.....")
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(segments[0].start_time, 0.2)
+        self.assertAlmostEqual(segments[0].end_time, 1.2)
+
+    def test_silence_is_never_segmented(self):
+        """Test that pure silence produces no segments and no buffered audio."""
+        self.assertEqual(self._feed("." * 50), [])
+        self.assertEqual(len(self.segmenter), 0)
+        self.assertIsNone(self.segmenter.flush())
+
+    def test_short_blip_is_discarded(self):
+        """Test that speech shorter than the minimum is dropped."""
+        self.assertEqual(self._feed("..s......"), [])
+        self.assertEqual(self.segmenter.discarded_segments, 1)
+
+    def test_long_monologue_is_force_split(self):
+        """Test that continuous speech is split at the maximum length without gaps."""
+        segments = self._feed("s" * 70)
+        segments.append(self.segmenter.flush())
+        self.assertEqual([s.duration for s in segments], [3.0, 3.0, 1.0])
+        self.assertEqual(segments[0].end_sample, segments[1].start_sample)
+        self.assertEqual(self.segmenter.forced_splits, 2)
+
+    def test_segments_detach_from_ring(self):
+        """Test that a segment closed mid-push survives later writes."""
+        audio = np.arange(2000, dtype=np.float32)
+        flags = np.array([True] * 6 + [False] * 14)
+        segments = self.segmenter.push(audio, flags)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0].audio[0], 0)
+        self.assertEqual(segments[0].audio[-1], 799)
+
+
+class TestStablePrefixTracker(unittest.TestCase):
+    """Test suite for the StablePrefixTracker class."""
+
+    def test_words_commit_once_two_hypotheses_agree(self):
+        """Test local-agreement commit of the stable prefix."""
+        tracker = StablePrefixTracker()
+        self.assertEqual(tracker.update("i scream"), ([], ["i", "scream"]))
+        self.assertEqual(tracker.update("ice cream is"), ([], ["ice", "cream", "is"]))
+        self.assertEqual(tracker.update("ice cream is cold"), (["ice", "cream", "is"], ["cold"]))
+
+    def test_final_commits_remaining_words(self):
+        """Test that the final hypothesis commits everything after the stable prefix."""
+        tracker = StablePrefixTracker()
+        tracker.update("hello world")
+        tracker.update("hello world again")
+        self.assertEqual(tracker.update("hello world again friend", is_final=True),
+                         (["again", "friend"], []))
+
+
+class TestStreamingSegmenter(unittest.TestCase):
+    """Test suite for the StreamingSegmenter class."""
+
+    def test_partials_then_final_commit(self):
+        """Test interim segments, stable-prefix commit and latency metrics."""
+        segmenter = StreamingSegmenter(
+            SAMPLE_RATE, partial_interval=0.2, min_segment_duration=0.2,
+            max_segment_duration=5.0, endpoint_silence=0.3, padding=0.1,
+        )
+        hypotheses = iter(["the", "the cat", "the cat sat", "the cat sat down"])
+        committed, partials = [], []
+        for flag in "ssssss...":
+            for segment in segmenter.push(np.ones(100, dtype=np.float32), flag == "s"):
+                text = next(hypotheses)
+                committed += segmenter.merge_transcript(segment, text).split()
+                partials.append(segmenter.pop_partial())
+
+        self.assertEqual(committed, ["the", "cat", "sat", "down"])
+        self.assertTrue(all(p.utterance_id == 0 for p in partials))
+        self.assertFalse(partials[0].is_final)
+        self.assertEqual(partials[2].stable_text, "the cat")
+        self.assertEqual(partials[2].unstable_text, "sat")
+        self.assertTrue(partials[-1].is_final)
+        self.assertEqual(partials[-1].text, "the cat sat down")
+
+        stats = segmenter.get_latency_stats()
+        self.assertEqual(len(segmenter.first_partial_latencies), 1)
+        self.assertEqual(len(segmenter.final_commit_latencies), 1)
+        self.assertGreaterEqual(stats['final_commit_last_ms'], 0.0)
+
+
+class TestHypothesisMerger(unittest.TestCase):
+    """Test suite for the HypothesisMerger class."""
+
+    def test_overlap_is_deduplicated(self):
+        """Test that repeated words from the overlap are not emitted twice."""
+        merger = HypothesisMerger(hop_duration=0.5, right_context=0.0)
+        self.assertEqual(merger.merge("the quick brown", 1.5), "the quick brown")
+        self.assertEqual(merger.merge("quick brown fox", 1.5), "fox")
+
+    def test_right_context_words_are_held_until_silence(self):
+        """Test that trailing words wait for the next window or silence."""
+        merger = HypothesisMerger(hop_duration=0.5, right_context=0.5)
+        self.assertEqual(merger.merge("hello there world", 1.5), "hello there")
+        self.assertEqual(merger.merge(None, 1.5), "world")
+
+    def test_final_window_commits_everything(self):
+        """Test that a final window is not held back."""
+        merger = HypothesisMerger(hop_duration=0.5, right_context=0.5)
+        self.assertEqual(merger.merge("one two", 1.0, is_final=True), "one two")
+
+
+class TestCreateSegmenter(unittest.TestCase):
+    """Test suite for the create_segmenter factory."""
+
+    def test_mode_selection(self):
+        """Test that the config key selects the segmenter."""
+        config = AudioConfig()
+        self.assertIsInstance(create_segmenter(config, 16000), FixedWindowSegmenter)
+        config.stt_segmentation_mode = "sliding"
+        self.assertIsInstance(create_segmenter(config, 16000), SlidingWindowSegmenter)
+        config.stt_segmentation_mode = "vad"
+        self.assertIsInstance(create_segmenter(config, 16000), VADEndpointSegmenter)
+        config.stt_segmentation_mode = "streaming"
+        self.assertIsInstance(create_segmenter(config, 16000), StreamingSegmenter)
+
+    def test_segment_durations_cover_each_mode(self):
+        """Test warm-up lengths match what each segmenter produces."""
+        config = AudioConfig()
+        self.assertEqual(segment_durations(config), [4.0])
+        config.stt_segmentation_mode = "sliding"
+        self.assertEqual(segment_durations(config), [config.stt_window_duration])
+        config.stt_segmentation_mode = "vad"
+        self.assertEqual(segment_durations(config), [0.7, config.stt_max_segment_duration])
+        config.stt_segmentation_mode = "streaming"
+        self.assertEqual(segment_durations(config), [config.stt_partial_interval, config.stt_max_segment_duration])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit tests for incremental features and encoder chunking of STT streams.
+"""
+
+import unittest
+
+import numpy as np
+
+from personalparakeet.core.onnx_stt_processor import LogMelFeaturizer
+from personalparakeet.core.stt_stream import StreamingLogMel, STTStream
+
+SAMPLE_RATE = 16000
+
+
+def _speech_like(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+class TestStreamingLogMel(unittest.TestCase):
+    """Test suite for log-mel features computed as audio arrives."""
+
+    def setUp(self):
+        self.featurizer = LogMelFeaturizer(n_mels=32, normalize="NA")
+
+    def test_matches_whole_utterance_features(self):
+        """Test uneven pieces (including empty ones) give the offline frames, bit for bit."""
+        audio = _speech_like(1.234)
+        streaming = StreamingLogMel(self.featurizer)
+        pieces, start = [], 0
+        for size in (1, 0, 77, 160, 1000, 3, 4800, 0):
+            pieces.append(streaming.accept(audio[start:start + size]))
+            start += size
+        pieces.append(streaming.accept(audio[start:]))
+        pieces.append(streaming.finish())
+
+        offline = self.featurizer(audio)
+        streamed = np.concatenate(pieces, axis=1)
+        self.assertEqual(streamed.shape, offline.shape)
+        np.testing.assert_allclose(streamed, offline, rtol=1e-5, atol=1e-4)
+
+    def test_frames_are_emitted_once_their_window_is_complete(self):
+        """Test no frame waits for more audio than its own window needs."""
+        streaming = StreamingLogMel(self.featurizer)
+        hop, half_window = self.featurizer.hop, self.featurizer.n_fft // 2
+        self.assertEqual(streaming.accept(np.zeros(half_window - 1, dtype=np.float32)).shape[1], 0)
+        self.assertEqual(streaming.accept(np.zeros(1, dtype=np.float32)).shape[1], 1)
+        self.assertEqual(streaming.accept(np.zeros(10 * hop, dtype=np.float32)).shape[1], 10)
+
+    def test_rejects_utterance_normalization(self):
+        """Test per-feature normalization, which needs the whole utterance, is refused."""
+        with self.assertRaises(ValueError):
+            StreamingLogMel(LogMelFeaturizer(normalize="per_feature"))
+
+
+class TestSTTStreamChunks(unittest.TestCase):
+    """Test suite for cutting stream features into fixed encoder inputs."""
+
+    def _stream(self, chunk_frames, pre_encode_frames):
+        return STTStream(StreamingLogMel(LogMelFeaturizer(n_mels=8, normalize="NA")),
+                         chunk_frames=chunk_frames, pre_encode_frames=pre_encode_frames)
+
+    def test_every_step_has_the_same_width(self):
+        """Test encoder inputs stay chunk + context wide however long the utterance gets."""
+        stream = self._stream(chunk_frames=[5, 8], pre_encode_frames=[0, 3])
+        audio = _speech_like(2.0)
+        chunks = []
+        for start in range(0, len(audio), 1600):
+            chunks.extend(stream.chunks(audio[start:start + 1600]))
+        chunks.extend(stream.chunks(np.zeros(0, dtype=np.float32), is_final=True))
+
+        widths = [signal.shape[1] for signal, _ in chunks]
+        self.assertEqual(widths[0], 5)
+        self.assertEqual(set(widths[1:-1]), {11})
+        self.assertLessEqual(widths[-1], 11)
+        self.assertEqual(sum(new for _, new in chunks), stream.features.frames)
+
+    def test_context_repeats_the_previous_frames(self):
+        """Test each chunk's pre-encode context is the tail of the frames before it."""
+        stream = self._stream(chunk_frames=4, pre_encode_frames=[2, 2])
+        chunks = list(stream.chunks(_speech_like(0.5), is_final=True))
+        np.testing.assert_array_equal(chunks[0][0][:, :2], 0.0)  # Zeros before the stream start
+        for (previous, _), (current, _) in zip(chunks, chunks[1:]):
+            np.testing.assert_array_equal(current[:, :2], previous[:, -2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the STT worker thread.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from personalparakeet.audio_engine import AudioEngine
+from personalparakeet.config import V3Config
+from personalparakeet.core.audio_sources import SyntheticSource
+from personalparakeet.core.stt_segmentation import AudioSegment
+from personalparakeet.core.stt_worker import STTWorker
+
+
+def _segment(segment_id, is_partial=False):
+    return AudioSegment(segment_id, segment_id * 100, np.ones(100, dtype=np.float32), 100,
+                        is_partial=is_partial, utterance_id=0)
+
+
+class TestSTTWorker(unittest.TestCase):
+    """Test suite for ordering, bounding and stale partial handling."""
+
+    def setUp(self):
+        self.results = []
+
+    def _worker(self, transcribe, max_pending=4):
+        worker = STTWorker(transcribe, lambda segment, text: self.results.append((segment.segment_id, text)),
+                           max_pending=max_pending)
+        worker.start()
+        return worker
+
+    def test_results_arrive_in_submission_order(self):
+        """Test results keep order even when later segments are faster."""
+        def transcribe(segment):
+            time.sleep(0.02 if segment.segment_id % 2 == 0 else 0.0)
+            return f"text {segment.segment_id}"
+
+        worker = self._worker(transcribe)
+        for i in range(10):
+            worker.submit(_segment(i))
+        self.assertTrue(worker.stop())
+        self.assertEqual([r[0] for r in self.results], list(range(10)))
+        self.assertEqual(self.results[3][1], "text 3")
+        self.assertEqual(worker.last_segment_id, 9)
+
+    def test_full_queue_waits_instead_of_dropping(self):
+        """Test a full queue makes submit() wait and nothing is lost."""
+        release = threading.Event()
+
+        def transcribe(segment):
+            release.wait(2.0)
+            return "x"
+
+        worker = self._worker(transcribe, max_pending=2)
+        threading.Timer(0.2, release.set).start()
+        for i in range(5):
+            worker.submit(_segment(i))
+        worker.stop()
+        self.assertEqual(len(self.results), 5)
+        self.assertGreater(worker.blocked_submits, 0)
+
+    def test_stale_partial_is_skipped(self):
+        """Test a partial followed by queued work is not decoded."""
+        release = threading.Event()
+
+        def transcribe(segment):
+            release.wait(2.0)
+            return "x"
+
+        worker = self._worker(transcribe)
+        worker.submit(_segment(0))
+        time.sleep(0.05)  # Worker is now busy with segment 0
+        worker.submit(_segment(1, is_partial=True))
+        worker.submit(_segment(2))
+        release.set()
+        worker.stop()
+        self.assertEqual([r[0] for r in self.results], [0, 2])
+        self.assertEqual(worker.stale_partials_skipped, 1)
+
+    def test_backlog_is_decoded_in_batches(self):
+        """Test queued segments share a model call and still finish in order."""
+        release = threading.Event()
+        batches = []
+
+        def transcribe(segment):
+            release.wait(2.0)
+            batches.append([segment.segment_id])
+            return f"text {segment.segment_id}"
+
+        def transcribe_batch(segments):
+            batches.append([s.segment_id for s in segments])
+            return [f"text {s.segment_id}" for s in segments]
+
+        worker = STTWorker(transcribe, lambda segment, text: self.results.append((segment.segment_id, text)),
+                           max_pending=8, transcribe_batch=transcribe_batch, max_batch_size=3)
+        worker.start()
+        worker.submit(_segment(0))
+        time.sleep(0.05)  # Worker is now busy with segment 0
+        for i in range(1, 6):
+            worker.submit(_segment(i, is_partial=(i == 2)))
+        release.set()
+        worker.stop()
+
+        self.assertEqual(batches, [[0], [1, 3], [4, 5]])
+        self.assertEqual(self.results, [(i, f"text {i}") for i in (0, 1, 3, 4, 5)])
+        self.assertEqual(worker.stale_partials_skipped, 1)
+        self.assertEqual(worker.get_metrics()['largest_batch'], 2)
+
+    def test_submit_copies_ring_views(self):
+        """Test queued audio is independent of the segmenter's buffer."""
+        ring = np.ones(100, dtype=np.float32)
+        segment = AudioSegment(0, 0, ring[:50], 100)
+        worker = STTWorker(lambda s: None, lambda s, t: None)
+        worker.submit(segment)
+        ring[:] = 0
+        self.assertEqual(float(segment.audio.sum()), 50.0)
+
+
+class TestEngineSTTWorker(unittest.TestCase):
+    """Test suite for keeping VAD at chunk cadence during slow inference."""
+
+    def test_slow_stt_does_not_stall_capture(self):
+        """Test chunks keep flowing while the model is busy."""
+        config = V3Config()
+        config.audio.use_mock_stt = True
+        config.audio.stt_segmentation_mode = "vad"
+        config.audio.backpressure_enabled = False
+        source = SyntheticSource(sample_rate=16000, blocksize=8000, duration=6.0, realtime=False)
+        engine = AudioEngine(config, audio_source=source)
+        engine.set_clarity_enabled(False)
+        segment_ids = []
+        engine.on_segment_transcribed = lambda segment, text: segment_ids.append(segment.segment_id)
+
+        async def run():
+            await engine.initialize()
+            transcribe = engine.stt_processor.transcribe
+
+            def slow_transcribe(audio, features=None):
+                time.sleep(0.5)
+                return transcribe(audio, features)
+
+            engine.stt_processor.transcribe = slow_transcribe
+            start = time.monotonic()
+            await engine.start()
+            source.finished.wait(5.0)
+            while engine.total_chunks_processed < 12 and time.monotonic() - start < 5.0:
+                await asyncio.sleep(0.01)
+            capture_seconds = time.monotonic() - start
+            await engine.stop()
+            return capture_seconds
+
+        capture_seconds = asyncio.run(run())
+        # 6 s of audio in 12 chunks is consumed well before two 0.5 s STT calls finish
+        self.assertLess(capture_seconds, 1.0)
+        self.assertEqual(engine.total_chunks_processed, 12)
+        self.assertGreaterEqual(len(segment_ids), 2)
+        self.assertEqual(segment_ids, sorted(segment_ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the VoiceActivityDetector module.
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from personalparakeet.config import VADConfig
+from personalparakeet.core.vad_engine import (
+    AdaptiveVoiceActivityDetector,
+    VoiceActivityDetector,
+    create_vad,
+)
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    """Test suite for frame-accurate, sample-clock VAD."""
+
+    def setUp(self):
+        """100 Hz stream with 10-sample frames keeps the arithmetic readable."""
+        self.vad = VoiceActivityDetector(sample_rate=100, frame_duration=0.1,
+                                         silence_threshold=0.1, pause_threshold=0.5)
+        self.events = []
+        self.vad.on_speech_start = lambda: self.events.append('start')
+        self.vad.on_speech_end = lambda: self.events.append('end')
+        self.vad.on_pause_detected = lambda duration: self.events.append(('pause', duration))
+
+    @staticmethod
+    def _signal(pattern):
+        """One 10-sample frame per entry: True = loud, False = silent."""
+        return np.concatenate([np.full(10, 0.5 if loud else 0.0, dtype=np.float32)
+                               for loud in pattern])
+
+    def test_returns_one_flag_per_frame(self):
+        """Test that a chunk is classified frame by frame."""
+        status = self.vad.process_audio_frame(self._signal([False, True, True, False]))
+        np.testing.assert_array_equal(status['speech_flags'], [False, True, True, False])
+        self.assertEqual(len(status['frame_energies']), 4)
+        self.assertEqual(len(status['frame_audio']), 40)
+        self.assertTrue(status['is_speech'])
+        self.assertAlmostEqual(status['stream_time'], 0.4)
+
+    def test_partial_frame_is_carried_over(self):
+        """Test that frames spanning chunk boundaries are classified whole."""
+        audio = self._signal([True, False, False, True])
+        flags = []
+        for chunk in np.array_split(audio, [7, 19, 23]):
+            status = self.vad.process_audio_frame(chunk)
+            flags.extend(status['speech_flags'])
+        np.testing.assert_array_equal(flags, [True, False, False, True])
+        self.assertEqual(self.vad.samples_processed, 40)
+
+    def test_clipping_is_counted_on_the_input_audio(self):
+        """Test clipped input samples are counted per frame, carried over like the audio."""
+        conditioned = np.full(25, 0.5, dtype=np.float32)
+        raw = conditioned.copy()
+        raw[[3, 14, 22]] = [1.0, -1.0, 1.0]  # Last one is in the carried partial frame
+        status = self.vad.process_audio_frame(conditioned, input_audio=raw)
+        np.testing.assert_array_equal(status['features'].frame_clipped, [1, 1])
+        status = self.vad.process_audio_frame(conditioned[:5], input_audio=conditioned[:5])
+        np.testing.assert_array_equal(status['features'].frame_clipped, [1])
+        self.assertEqual(status['features'].peak, 0.5)  # Levels stay those of the conditioned audio
+
+    def test_pause_is_timed_by_samples_not_wall_clock(self):
+        """Test that pause detection ignores how late chunks are processed."""
+        with mock.patch('time.time', side_effect=AssertionError("wall clock used")):
+            self.vad.process_audio_frame(self._signal([True, True]))
+            for _ in range(7):
+                self.vad.process_audio_frame(self._signal([False]))
+
+        self.assertEqual(self.events, ['start', ('pause', 0.5), 'end'])
+        self.assertFalse(self.vad.is_speaking)
+
+    def test_pause_detected_inside_a_single_chunk(self):
+        """Test that several speech/pause cycles in one chunk each fire callbacks."""
+        pattern = [True] + [False] * 6 + [True] + [False] * 5
+        status = self.vad.process_audio_frame(self._signal(pattern))
+        self.assertEqual(self.events, ['start', ('pause', 0.5), 'end',
+                                       'start', ('pause', 0.5), 'end'])
+        self.assertFalse(status['is_speaking'])
+
+    def test_reset_restarts_the_clock(self):
+        """Test that reset() drops carried audio and state."""
+        self.vad.process_audio_frame(np.full(15, 0.5, dtype=np.float32))
+        self.vad.reset()
+        self.assertEqual(self.vad.samples_processed, 0)
+        self.assertFalse(self.vad.is_speaking)
+        status = self.vad.process_audio_frame(self._signal([False]))
+        np.testing.assert_array_equal(status['speech_flags'], [False])
+
+
+
+class TestAdaptiveVoiceActivityDetector(unittest.TestCase):
+    """Test suite for the noise-floor tracking detector."""
+
+    SAMPLE_RATE = 16000
+
+    def setUp(self):
+        self.vad = AdaptiveVoiceActivityDetector(sample_rate=self.SAMPLE_RATE)
+        self.rng = np.random.default_rng(0)
+
+    def _tone(self, seconds, level, frequency=440.0):
+        t = np.arange(int(seconds * self.SAMPLE_RATE)) / self.SAMPLE_RATE
+        return (level * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+    def _hiss(self, seconds, level=0.0005):
+        return (self.rng.standard_normal(int(seconds * self.SAMPLE_RATE)) * level).astype(np.float32)
+
+    def test_quiet_voiced_audio_over_low_noise_is_speech(self):
+        """Test that audio far below the fixed threshold is found over a quiet room."""
+        self.assertFalse(self.vad.process_audio_frame(self._hiss(1.0))['speech_flags'].any())
+        status = self.vad.process_audio_frame(self._tone(0.5, 0.005) + self._hiss(0.5))
+        self.assertTrue(status['speech_flags'][-10:].all())
+        self.assertLess(self.vad.noise_floor, 0.001)
+
+    def test_low_frequency_rumble_is_not_speech(self):
+        """Test that loud energy below the speech band never counts."""
+        status = self.vad.process_audio_frame(self._tone(1.0, 0.05, frequency=60.0) + self._hiss(1.0))
+        self.assertFalse(status['speech_flags'].any())
+
+    def test_short_clicks_are_ignored(self):
+        """Test that voiced runs shorter than the attack don't start speech."""
+        audio = self._hiss(1.0)
+        click = self._tone(0.03, 0.2)
+        for start in (0.3, 0.6):
+            i = int(start * self.SAMPLE_RATE)
+            audio[i:i + len(click)] += click
+        self.assertFalse(self.vad.process_audio_frame(audio)['speech_flags'].any())
+
+    def test_hangover_holds_speech_across_chunks(self):
+        """Test that speech is held for the hangover after the voiced run ends."""
+        self.vad.process_audio_frame(self._hiss(0.48))  # Whole 30 ms frames
+        self.vad.process_audio_frame(self._tone(0.3, 0.1) + self._hiss(0.3))
+        flags = self.vad.process_audio_frame(self._hiss(0.6))['speech_flags']
+        held = int(np.argmin(flags))
+        self.assertEqual(held, self.vad.hangover_frames)
+        self.assertFalse(flags[held:].any())
+
+    def test_create_vad_selects_mode(self):
+        """Test that VADConfig.mode picks the detector."""
+        self.assertIsInstance(create_vad(VADConfig(mode="adaptive"), 16000), AdaptiveVoiceActivityDetector)
+        detector = create_vad(VADConfig(), 16000)
+        self.assertIs(type(detector), VoiceActivityDetector)
+        self.assertEqual(detector.frame_size, 480)
+
+
+if __name__ == '__main__':
+    unittest.main()